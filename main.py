@@ -5,68 +5,143 @@ Usage:
     python main.py staging          # Steady-state staging only (4 scenarios, Rev2)
     python main.py staging-extended # All 7 scenarios (Rev3) with validation
     python main.py energy           # Energy post-processing only
+    python main.py envelope         # Dense RIKO opening sweep (Kv CSV, 1-5 pumps, warm-started)
     python main.py optimize         # Throttling analysis + VFD comparison
+    python main.py pareto           # Pump count x speed x RIKO opening trade-off front
     python main.py eps              # 24h EPS with pump trips only
+    python main.py eps-tide         # 72h EPS, static vs synthetic tide on SEA
+    python main.py schedule         # Min-energy staging for a 24h intake target, replayed in EPS
+    python main.py eps-cost         # Rank EPS runs by cost under the INP and a time-of-use tariff
+    python main.py eps-energy       # Per-pump EPS energy audit, constant eta vs EFF_35WX curve
+    python main.py eps-vfd          # Design trip EPS, RIKO throttling vs VFD flow setpoint
+    python main.py inp-check        # INP pump curve, heads and GPV Kv vs datasheets (no EPANET)
+    python main.py reliability      # Monte Carlo pump-trip study (random schedules)
+    python main.py contingency      # N-k pump outages x RIKO openings (Rev3)
+    python main.py surrogate        # NumPy surrogate solver cross-checked against EPANET
+    python main.py sensitivity      # H_PLANT / H_SEA / roughness / Kv tornado (Rev3)
     python main.py report           # Generate Markdown report
     python main.py report path      # Generate report to custom path
     python main.py quarto           # Render Quarto PDF report
+
+Options:
+    --jobs N                        # Solve staging / Monte Carlo / sensitivity on N processes
+    --startup-profile [CMD]         # Import-time breakdown of CMD's startup vs budget (default all)
 """
 
 from __future__ import annotations
 
+import importlib
 import subprocess
 import sys
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from rosarito.constants import INP_FILE, INP_FILE_REV3, REFERENCE_POINTS_ALL
-from rosarito.scenarios import (
-    run_staging_scenarios,
-    run_staging_scenarios_extended,
-    run_eps_with_trips,
-)
-from rosarito.energy import compute_all_scenario_energies, compute_throttle_loss
-from rosarito.optimization import compute_vfd_comparison
-from rosarito.validation import validate_all_scenarios, validate_all_extended
-from rosarito.reporting import (
-    print_staging_table,
-    print_validation_report,
-    print_energy_table,
-    print_eps_summary,
-    print_throttling_analysis,
-    print_vfd_comparison,
+from rosarito.constants import (
+    ETA_DUTY_PCT,
+    INP_FILE,
+    INP_FILE_REV3,
+    Q_RATED_LPS,
+    REFERENCE_POINTS_ALL,
 )
-from rosarito.report import generate_report
+
+if TYPE_CHECKING:
+    from rosarito.pipeline import AnalysisPipeline
+
+# Handlers import what they need when they run, so a command only pays for
+# its own modules — and EPyT is only loaded once a model is. The rosarito
+# modules each command imports, i.e. its startup cost (--startup-profile):
+COMMAND_IMPORTS: dict[str, tuple[str, ...]] = {
+    "all": ("rosarito.pipeline", "rosarito.reporting"),
+    "staging": ("rosarito.pipeline", "rosarito.reporting"),
+    "staging-extended": ("rosarito.scenarios", "rosarito.validation", "rosarito.reporting"),
+    "energy": ("rosarito.pipeline", "rosarito.reporting"),
+    "envelope": ("rosarito.scenarios", "rosarito.reporting"),
+    "optimize": ("rosarito.energy", "rosarito.optimization", "rosarito.reporting"),
+    "pareto": ("rosarito.energy", "rosarito.optimization", "rosarito.reporting"),
+    "eps": ("rosarito.pipeline", "rosarito.reporting"),
+    "eps-tide": (
+        "rosarito.boundary", "rosarito.energy", "rosarito.eps_utils", "rosarito.scenarios",
+        "rosarito.reporting",
+    ),
+    "schedule": ("rosarito.scheduling", "rosarito.reporting"),
+    "eps-cost": (
+        "rosarito.scenarios", "rosarito.scheduling", "rosarito.tariff", "rosarito.reporting",
+    ),
+    "eps-energy": ("rosarito.energy", "rosarito.scenarios", "rosarito.reporting"),
+    "eps-vfd": ("rosarito.energy", "rosarito.scenarios", "rosarito.vfd", "rosarito.reporting"),
+    "inp-check": ("rosarito.validation", "rosarito.reporting"),
+    "reliability": ("rosarito.reliability", "rosarito.reporting"),
+    "contingency": ("rosarito.contingency", "rosarito.reporting"),
+    "surrogate": ("rosarito.surrogate", "rosarito.valve", "rosarito.reporting"),
+    "sensitivity": ("rosarito.sensitivity", "rosarito.reporting"),
+    "report": ("rosarito.pipeline", "rosarito.report"),
+    "quarto": (),
+}
+
+# Wall time from interpreter start to a command's first line of work (s)
+STARTUP_BUDGET_S = 0.5
+STARTUP_BUDGETS: dict[str, float] = {name: STARTUP_BUDGET_S for name in COMMAND_IMPORTS}
 
 
-def run_staging() -> None:
+def import_command(name: str) -> None:
+    """Import everything command *name* needs (its whole startup cost)."""
+    for module in COMMAND_IMPORTS[name]:
+        importlib.import_module(module)
+
+
+def run_staging(workers: int = 1, pipeline: AnalysisPipeline | None = None) -> None:
     """Run steady-state staging scenarios with validation."""
-    print(f"\nLoading model: {INP_FILE}")
-    results = run_staging_scenarios()
-    print_staging_table(results)
+    from rosarito.pipeline import AnalysisPipeline
+    from rosarito.reporting import print_staging_table, print_validation_report
 
-    validations = validate_all_scenarios(results)
-    print_validation_report(validations)
+    pipeline = pipeline or AnalysisPipeline(jobs=workers)
+    print(f"\nLoading model: {pipeline.inp_path}")
+    print_staging_table(pipeline.get("staging"))
+    print_validation_report(pipeline.get("validation"))
 
 
-def run_energy() -> None:
+def run_energy(workers: int = 1, pipeline: AnalysisPipeline | None = None) -> None:
     """Run energy post-processing based on staging results."""
-    print(f"\nLoading model: {INP_FILE}")
-    results = run_staging_scenarios()
+    from rosarito.pipeline import AnalysisPipeline
+    from rosarito.reporting import print_energy_table
 
-    print_energy_table(compute_all_scenario_energies(results))
+    pipeline = pipeline or AnalysisPipeline(jobs=workers)
+    print(f"\nLoading model: {pipeline.inp_path}")
+    print_energy_table(pipeline.get("energy"))
 
 
-def run_staging_extended() -> None:
+def run_staging_extended(workers: int = 1) -> None:
     """Run all 7 extended staging scenarios (Rev3) with validation."""
+    from rosarito.reporting import print_staging_table, print_validation_report
+    from rosarito.scenarios import run_staging_scenarios_extended
+    from rosarito.validation import validate_all_extended
+
     print(f"\nLoading model: {INP_FILE_REV3}")
-    results = run_staging_scenarios_extended()
+    results = run_staging_scenarios_extended(workers=workers)
     print_staging_table(results)
 
     validations = validate_all_extended(results)
     print_validation_report(validations)
 
 
+def run_envelope() -> None:
+    """Sweep every 2% RIKO opening of the Kv CSV for 1-5 pumps (Rev3)."""
+    from rosarito.reporting import print_envelope_table, print_warm_start_summary
+    from rosarito.scenarios import compare_warm_start
+
+    print(f"\nLoading model: {INP_FILE_REV3}")
+    report = compare_warm_start()
+    print_envelope_table(report.points)
+    print_warm_start_summary(report)
+
+
 def run_optimize() -> None:
     """Run throttling analysis and VFD comparison."""
+    from rosarito.energy import compute_throttle_loss, load_pump_efficiency
+    from rosarito.optimization import compute_vfd_comparison
+    from rosarito.reporting import print_throttling_analysis, print_vfd_comparison
+
     # Throttling analysis from reference operating points
     throttle_results = [
         compute_throttle_loss(ref.q_total_lps, ref.dh_riko_m)
@@ -75,28 +150,182 @@ def run_optimize() -> None:
     phi_labels = [ref.phi_pct for ref in REFERENCE_POINTS_ALL]
     print_throttling_analysis(throttle_results, phi_labels=phi_labels)
 
-    # VFD comparison for each reference point
-    vfd_results = [compute_vfd_comparison(ref) for ref in REFERENCE_POINTS_ALL]
+    # VFD comparison for each reference point (exact speed, EFF_35WX efficiency)
+    efficiency = load_pump_efficiency(INP_FILE_REV3)["PUMP_1"]
+    vfd_results = [
+        compute_vfd_comparison(ref, efficiency=efficiency) for ref in REFERENCE_POINTS_ALL
+    ]
     print_vfd_comparison(vfd_results)
 
 
-def run_eps() -> None:
+def run_pareto() -> None:
+    """Trade-off front of shaft power, flow and RIKO control margin (EFF_35WX)."""
+    from rosarito.energy import load_pump_efficiency
+    from rosarito.optimization import search_vfd_valve_grid
+    from rosarito.reporting import print_pareto_front
+
+    efficiency = load_pump_efficiency(INP_FILE_REV3)["PUMP_1"]
+    result = search_vfd_valve_grid(efficiency=efficiency)
+    print_pareto_front(result, range(1250, 4751, 250))
+
+
+def run_eps(pipeline: AnalysisPipeline | None = None) -> None:
     """Run 24h EPS with scheduled pump trips."""
+    from rosarito.pipeline import AnalysisPipeline
+    from rosarito.reporting import print_eps_summary
+
+    pipeline = pipeline or AnalysisPipeline()
+    print(f"\nLoading model: {pipeline.inp_path}")
+    print_eps_summary(pipeline.get("eps"))
+
+
+def run_eps_tide(duration_h: float = 72.0) -> None:
+    """Compare EPS under the static sea level and a synthetic harmonic tide."""
+    from rosarito.boundary import BoundaryConditions, tidal_pattern
+    from rosarito.energy import EPSEnergyAccumulator
+    from rosarito.eps_utils import EPSStatistics, feed_eps
+    from rosarito.reporting import print_boundary_comparison
+    from rosarito.scenarios import stream_eps
+
+    print(f"\nLoading model: {INP_FILE}")
+    tide = BoundaryConditions(sea=tidal_pattern(duration_h, timestep_s=900))
+    runs = {}
+    for label, boundary in (("static", None), ("harmonic tide", tide)):
+        stats, energy = EPSStatistics(), EPSEnergyAccumulator()
+        feed_eps(stream_eps(duration_h=duration_h, boundary=boundary), stats, energy)
+        runs[label] = (stats, energy.result())
+    print_boundary_comparison(runs)
+
+
+# Example hourly intake target (l/s): reduced production overnight
+EXAMPLE_TARGET_LPS = [3000] * 6 + [4500] * 10 + [3600] * 4 + [2000] * 4
+
+# VFD EPS flow setpoint: four duty pumps at rated flow
+VFD_SETPOINT_LPS = 4 * Q_RATED_LPS
+
+
+def run_schedule() -> None:
+    """Schedule staging for EXAMPLE_TARGET_LPS and replay it in EPS (Rev3)."""
+    from rosarito.reporting import print_eps_summary, print_schedule
+    from rosarito.scheduling import replay_schedule, schedule_staging
+
+    print(f"\nLoading model: {INP_FILE_REV3}")
+    schedule = schedule_staging(EXAMPLE_TARGET_LPS)
+    print_schedule(schedule)
+    print_eps_summary(replay_schedule(schedule))
+
+
+def run_eps_cost() -> None:
+    """Cost the design trip EPS and the example staging schedule under two tariffs."""
+    from rosarito.reporting import print_cost_ranking
+    from rosarito.scenarios import run_eps_with_trips
+    from rosarito.scheduling import replay_schedule, schedule_staging
+    from rosarito.tariff import EXAMPLE_TOU_TARIFF, rank_by_cost, tariff_from_inp
+
+    print(f"\nLoading model: {INP_FILE}")
+    runs = {
+        "design trips (Rev2)": run_eps_with_trips(),
+        "staging schedule (Rev3)": replay_schedule(schedule_staging(EXAMPLE_TARGET_LPS)),
+    }
+    print_cost_ranking("INP [ENERGY] flat price", rank_by_cost(runs, tariff_from_inp()))
+    print_cost_ranking("example time-of-use tariff", rank_by_cost(runs, EXAMPLE_TOU_TARIFF))
+
+
+def run_eps_energy() -> None:
+    """Integrate the design trip EPS at constant efficiency and on EFF_35WX."""
+    from rosarito.energy import integrate_eps_energy, load_pump_efficiency
+    from rosarito.reporting import print_energy_audit
+    from rosarito.scenarios import run_eps_with_trips
+
     print(f"\nLoading model: {INP_FILE}")
     eps = run_eps_with_trips()
-    print_eps_summary(eps)
+    print_energy_audit({
+        f"constant eta {ETA_DUTY_PCT:g}%": integrate_eps_energy(eps),
+        "EFF_35WX curve": integrate_eps_energy(eps, efficiency=load_pump_efficiency()),
+    })
+
+
+def run_eps_vfd() -> None:
+    """Design trip EPS throttled by the RIKO vs VFD tracking the 4-pump flow."""
+    from rosarito.energy import integrate_eps_energy, load_pump_efficiency
+    from rosarito.reporting import print_vfd_eps_comparison
+    from rosarito.scenarios import run_eps_with_trips
+    from rosarito.vfd import FlowSetpointController, run_vfd_eps, summarize_eps
+
+    print(f"\nLoading model: {INP_FILE}")
+    efficiency = load_pump_efficiency()
+    throttled = run_eps_with_trips()
+    vfd = run_vfd_eps(FlowSetpointController(VFD_SETPOINT_LPS))
+    print_vfd_eps_comparison([
+        summarize_eps(
+            "RIKO throttling", throttled, integrate_eps_energy(throttled, efficiency=efficiency),
+        ),
+        summarize_eps(
+            f"VFD, setpoint {VFD_SETPOINT_LPS:,.0f} l/s", vfd.eps,
+            vfd.energy(efficiency=efficiency), vfd.speed_ratio,
+        ),
+    ])
+
+
+def run_inp_check() -> None:
+    """Check every model revision's input data with the native INP parser."""
+    from rosarito.reporting import print_inp_checks
+    from rosarito.validation import validate_inp_inputs
+
+    inp_dir = INP_FILE.parent
+    print_inp_checks({
+        path.name: validate_inp_inputs(path) for path in sorted(inp_dir.glob("*.inp"))
+    })
+
 
+def run_reliability(workers: int = 1, n_runs: int = 500) -> None:
+    """Monte Carlo pump-trip study on the Rev2 model."""
+    from rosarito.reliability import run_monte_carlo
+    from rosarito.reporting import print_monte_carlo_summary
+
+    print(f"\nLoading model: {INP_FILE}")
+    print_monte_carlo_summary(run_monte_carlo(n_runs, workers=workers, seed=0))
+
+
+def run_contingency() -> None:
+    """Enumerate every pump outage combination at every RIKO opening (Rev3)."""
+    from rosarito.contingency import run_contingencies, summarize_contingencies
+    from rosarito.reporting import print_contingency_table
+
+    print(f"\nLoading model: {INP_FILE_REV3}")
+    print_contingency_table(summarize_contingencies(run_contingencies()))
+
+
+def run_surrogate() -> None:
+    """Cross-check the NumPy surrogate against EPANET on the Kv grid × 1–5 pumps."""
+    from rosarito.reporting import print_surrogate_check
+    from rosarito.surrogate import cross_check
+    from rosarito.valve import load_riko_kv
+
+    print(f"\nLoading model: {INP_FILE_REV3}")
+    _, kv = load_riko_kv()
+    print_surrogate_check(cross_check([[1], [2], [3], [4], [5]], kv))
 
-def run_report() -> None:
+
+def run_sensitivity_study(workers: int = 1) -> None:
+    """One-at-a-time sensitivity of every staging scenario (Rev3)."""
+    from rosarito.reporting import print_tornado_table
+    from rosarito.sensitivity import run_sensitivity
+
+    print(f"\nLoading model: {INP_FILE_REV3}")
+    print_tornado_table(run_sensitivity(workers=workers))
+
+
+def run_report(output_path: str | None = None, workers: int = 1) -> None:
     """Generate Markdown report with all analyses."""
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
-    generate_report(output_path)
+    from rosarito.pipeline import AnalysisPipeline
+    from rosarito.report import generate_report
+
+    generate_report(output_path, pipeline=AnalysisPipeline(jobs=workers))
 
 
 def run_quarto() -> None:
     """Render the Quarto PDF report."""
-    from pathlib import Path
-
     qmd = Path(__file__).resolve().parent / "reports" / "report.qmd"
     if not qmd.exists():
         print(f"Error: {qmd} not found", file=sys.stderr)
@@ -113,19 +342,76 @@ def run_quarto() -> None:
     print(f"Report written to: {qmd.with_suffix('.pdf')}")
 
 
+def run_startup_profile(names: list[str]) -> None:
+    """Profile each command's startup in a fresh interpreter; exit 1 if over budget."""
+    from rosarito.reporting import print_startup_profiles
+    from rosarito.startup import profile_startup
+
+    root = Path(__file__).resolve().parent
+    profiles = [
+        profile_startup(f"import main; main.import_command({name!r})", label=name, cwd=root)
+        for name in names
+    ]
+    print_startup_profiles(profiles, STARTUP_BUDGETS)
+    if any(p.wall_s > STARTUP_BUDGETS[p.label] for p in profiles):
+        sys.exit(1)
+
+
+def _parse_jobs(argv: list[str]) -> tuple[list[str], int]:
+    """Strip ``--jobs N`` / ``--jobs=N`` from *argv*; return (rest, N)."""
+    rest: list[str] = []
+    jobs = 1
+    it = iter(argv)
+    for arg in it:
+        if arg == "--jobs":
+            value = next(it, None)
+        elif arg.startswith("--jobs="):
+            value = arg.split("=", 1)[1]
+        else:
+            rest.append(arg)
+            continue
+        if value is None or not value.isdigit() or int(value) < 1:
+            print("Error: --jobs expects a positive integer", file=sys.stderr)
+            sys.exit(1)
+        jobs = int(value)
+    return rest, jobs
+
+
 def main() -> None:
+    args, jobs = _parse_jobs(sys.argv[1:])
+    if "--startup-profile" in args:
+        args = [a for a in args if a != "--startup-profile"]
+        names = [a.lower() for a in args[:1]] or list(COMMAND_IMPORTS)
+        if names[0] not in COMMAND_IMPORTS:
+            print(f"Unknown command: {names[0]}")
+            sys.exit(1)
+        run_startup_profile(names)
+        return
+
     commands = {
-        "staging": run_staging,
-        "staging-extended": run_staging_extended,
-        "energy": run_energy,
+        "staging": partial(run_staging, workers=jobs),
+        "staging-extended": partial(run_staging_extended, workers=jobs),
+        "energy": partial(run_energy, workers=jobs),
+        "envelope": run_envelope,
         "optimize": run_optimize,
+        "pareto": run_pareto,
         "eps": run_eps,
-        "report": run_report,
+        "eps-tide": run_eps_tide,
+        "schedule": run_schedule,
+        "eps-cost": run_eps_cost,
+        "eps-energy": run_eps_energy,
+        "eps-vfd": run_eps_vfd,
+        "inp-check": run_inp_check,
+        "reliability": partial(run_reliability, workers=jobs),
+        "contingency": run_contingency,
+        "surrogate": run_surrogate,
+        "sensitivity": partial(run_sensitivity_study, workers=jobs),
+        "report": partial(run_report, args[1] if len(args) > 1 else None, workers=jobs),
         "quarto": run_quarto,
     }
 
-    if len(sys.argv) > 1:
-        cmd = sys.argv[1].lower()
+    if args:
+        cmd = args[0].lower()
         if cmd in commands:
             try:
                 commands[cmd]()
@@ -137,11 +423,16 @@ def main() -> None:
             print(f"Available: {', '.join(commands)} (or no argument for all)")
             sys.exit(1)
     else:
-        # Run all analyses
+        # Run all analyses on one pipeline: staging and EPS are solved once,
+        # side by side, and every table reuses them
+        from rosarito.pipeline import AnalysisPipeline
+
         try:
-            run_staging()
-            run_energy()
-            run_eps()
+            pipeline = AnalysisPipeline(jobs=jobs)
+            pipeline.run()
+            run_staging(pipeline=pipeline)
+            run_energy(pipeline=pipeline)
+            run_eps(pipeline=pipeline)
         except Exception as exc:
             print(f"\nError: {exc}", file=sys.stderr)
             sys.exit(1)
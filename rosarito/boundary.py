@@ -0,0 +1,162 @@
+"""Time-varying reservoir heads for EPS: tide on SEA, forebay level on PLANT.
+
+EPANET drives a reservoir's head as base head × pattern multiplier, held
+constant over each pattern step, and all patterns share one pattern
+timestep. HeadPattern stores absolute heads on such a grid; the EPS code
+turns them into a multiplier pattern (see scenarios.EPSSession).
+
+Patterns come from a CSV (time_h, head_m) resampled onto the grid, or
+from a synthetic harmonic tide built from tidal constituents.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from math import gcd
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import H_SEA
+
+
+@dataclass(frozen=True)
+class HeadPattern:
+    """Absolute reservoir heads (m), one per pattern step.
+
+    EPANET repeats a pattern cyclically, so a pattern shorter than the
+    run wraps around.
+    """
+    heads_m: tuple[float, ...]
+    timestep_s: int = 3600
+
+    def __post_init__(self) -> None:
+        if not self.heads_m:
+            raise ValueError("a head pattern needs at least one value")
+        if self.timestep_s <= 0:
+            raise ValueError(f"timestep_s must be positive, got {self.timestep_s}")
+
+    @classmethod
+    def from_array(cls, heads_m, timestep_s: int = 3600) -> HeadPattern:
+        return cls(tuple(float(h) for h in np.ravel(heads_m)), int(timestep_s))
+
+    @property
+    def duration_s(self) -> int:
+        return len(self.heads_m) * self.timestep_s
+
+    def at(self, time_s) -> np.ndarray:
+        """Head in effect at *time_s*, as EPANET applies it (step-wise)."""
+        i = (np.asarray(time_s) // self.timestep_s).astype(int) % len(self.heads_m)
+        return np.asarray(self.heads_m)[i]
+
+    def resample(self, timestep_s: int) -> HeadPattern:
+        """Same step-wise heads on a finer grid (must divide timestep_s)."""
+        if self.timestep_s % timestep_s:
+            raise ValueError(
+                f"{timestep_s} s does not divide the pattern step {self.timestep_s} s"
+            )
+        repeat = self.timestep_s // timestep_s
+        return HeadPattern(tuple(np.repeat(self.heads_m, repeat).tolist()), timestep_s)
+
+
+@dataclass(frozen=True)
+class BoundaryConditions:
+    """Head patterns for the two reservoirs; None keeps the INP head."""
+    sea: HeadPattern | None = None
+    plant: HeadPattern | None = None
+
+    @property
+    def patterns(self) -> dict[str, HeadPattern]:
+        """{reservoir ID: pattern} on a common pattern timestep."""
+        given = {
+            rid: p for rid, p in (("SEA", self.sea), ("PLANT", self.plant))
+            if p is not None
+        }
+        if not given:
+            return {}
+        step = 0
+        for p in given.values():
+            step = gcd(step, p.timestep_s)
+        return {rid: p.resample(step) for rid, p in given.items()}
+
+
+# ---------------------------------------------------------------------------
+# Pattern sources
+# ---------------------------------------------------------------------------
+
+def load_head_pattern_csv(
+    path: str | Path,
+    timestep_s: int = 3600,
+    time_column: str = "time_h",
+    head_column: str = "head_m",
+) -> HeadPattern:
+    """Read (time, head) samples and resample them onto a pattern grid.
+
+    Heads are interpolated linearly at the start of every pattern step
+    over the span of the file.
+
+    Args:
+        path: CSV with *time_column* in hours and *head_column* in metres.
+        timestep_s: Pattern timestep.
+        time_column: Name of the time column.
+        head_column: Name of the head column.
+    """
+    t_h: list[float] = []
+    h_m: list[float] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            t_h.append(float(row[time_column]))
+            h_m.append(float(row[head_column]))
+    if len(t_h) < 2:
+        raise ValueError(f"{path}: need at least two samples")
+    t = np.asarray(t_h) * 3600.0
+    order = np.argsort(t)
+    t, h = t[order], np.asarray(h_m)[order]
+    grid = np.arange(t[0], t[-1], timestep_s)
+    return HeadPattern.from_array(np.interp(grid, t, h), timestep_s)
+
+
+@dataclass(frozen=True)
+class TidalConstituent:
+    """One harmonic: amplitude × cos(2π·t/period − phase)."""
+    name: str
+    amplitude_m: float
+    period_h: float
+    phase_deg: float = 0.0
+
+
+# Principal constituents, amplitudes typical of the Baja California
+# Pacific coast (mixed, mainly semidiurnal tide, ~2 m spring range)
+DEFAULT_CONSTITUENTS: tuple[TidalConstituent, ...] = (
+    TidalConstituent("M2", 0.50, 12.4206, 0.0),
+    TidalConstituent("S2", 0.20, 12.0000, 30.0),
+    TidalConstituent("K1", 0.34, 23.9345, 200.0),
+    TidalConstituent("O1", 0.21, 25.8193, 190.0),
+)
+
+
+def tidal_pattern(
+    duration_h: float,
+    timestep_s: int = 3600,
+    mean_m: float = H_SEA,
+    constituents: tuple[TidalConstituent, ...] = DEFAULT_CONSTITUENTS,
+    start_h: float = 0.0,
+) -> HeadPattern:
+    """Synthetic harmonic tide covering *duration_h*.
+
+    Each pattern step holds the tide at the middle of the step.
+
+    Args:
+        duration_h: Horizon to cover.
+        timestep_s: Pattern timestep.
+        mean_m: Mean water level.
+        constituents: Harmonics to superpose.
+        start_h: Tide time at the start of the run.
+    """
+    n = max(1, int(np.ceil(duration_h * 3600.0 / timestep_s)))
+    t_h = start_h + (np.arange(n) + 0.5) * timestep_s / 3600.0
+    h = np.full(n, float(mean_m))
+    for c in constituents:
+        h += c.amplitude_m * np.cos(2.0 * np.pi * t_h / c.period_h - np.radians(c.phase_deg))
+    return HeadPattern.from_array(h, timestep_s)
@@ -0,0 +1,170 @@
+"""Content-addressed result cache for steady-state and EPS runs.
+
+Keys hash the INP file bytes together with the scenario inputs, so a
+result is reused only for the exact same model revision and scenario;
+editing an INP changes its digest and silently invalidates old entries.
+
+Two layers:
+  * in-process LRU of pickled results (bounded entry count)
+  * on-disk store under .cache/results (bounded bytes, LRU by mtime)
+
+Environment:
+  ROSARITO_NO_CACHE=1        disable the default cache
+  ROSARITO_CACHE_DIR=path    override the on-disk location
+  ROSARITO_CACHE_MAX_MB=n    on-disk budget (default 256 MB)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from rosarito.constants import CACHE_DIR
+
+# Bump when the pickled result types change shape.
+CACHE_VERSION = 2
+
+DEFAULT_MAX_MB = 256
+DEFAULT_MEMORY_ENTRIES = 512
+
+# (path, mtime_ns, size) → sha256 of the file bytes
+_digest_memo: dict[tuple[str, int, int], str] = {}
+
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 of a file's bytes, memoized on (path, mtime, size)."""
+    st = os.stat(path)
+    memo_key = (str(Path(path).resolve()), st.st_mtime_ns, st.st_size)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+def make_key(kind: str, inp_path: str | Path, *parts: Any) -> str:
+    """Build a cache key from the INP bytes and the scenario inputs.
+
+    *parts* must have a deterministic repr (frozen dataclasses, tuples,
+    strings, numbers); they are hashed, not stored.
+    """
+    material = f"{CACHE_VERSION}|{kind}|{file_digest(inp_path)}|{parts!r}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Bounded two-layer (memory + disk) cache of pickled results."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ):
+        self.directory = Path(directory or CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._disk_bytes: int | None = None  # running total, None = unknown
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for *key*, or None on a miss."""
+        blob = self._memory.get(key)
+        if blob is not None:
+            self._memory.move_to_end(key)
+            return pickle.loads(blob)
+
+        path = self._path(key)
+        try:
+            blob = path.read_bytes()
+            os.utime(path)  # mark as recently used for disk LRU
+        except OSError:
+            return None
+        try:
+            value = pickle.loads(blob)
+        except Exception:
+            path.unlink(missing_ok=True)  # truncated/corrupt entry
+            return None
+        self._remember(key, blob)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store *value* in both layers, then enforce the disk budget."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, blob)
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)  # atomic: readers never see partial files
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        if self._disk_bytes is None:
+            self._evict()
+        else:
+            self._disk_bytes += len(blob)
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry from both layers."""
+        self._memory.clear()
+        for path in self.directory.glob("*/*.pkl"):
+            path.unlink(missing_ok=True)
+        self._disk_bytes = 0
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least-recently-used disk entries until under max_bytes."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.pkl"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+        self._disk_bytes = total
+
+
+_default_cache: ResultCache | None = None
+
+
+def default_cache() -> ResultCache | None:
+    """Process-wide cache configured from the environment (None if disabled)."""
+    global _default_cache
+    if os.environ.get("ROSARITO_NO_CACHE"):
+        return None
+    if _default_cache is None:
+        max_mb = float(os.environ.get("ROSARITO_CACHE_MAX_MB", DEFAULT_MAX_MB))
+        _default_cache = ResultCache(
+            directory=os.environ.get("ROSARITO_CACHE_DIR") or None,
+            max_bytes=int(max_mb * 1024 * 1024),
+        )
+    return _default_cache
@@ -16,6 +16,7 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 INP_FILE = _PROJECT_ROOT / "inp_files" / "ROSARITO_EPANET_Rev2.inp"
 INP_FILE_REV3 = _PROJECT_ROOT / "inp_files" / "ROSARITO_EPANET_Rev3.inp"
 RIKO_CSV = _PROJECT_ROOT / "data" / "riko_cylinder_e_dn1800.csv"
+CACHE_DIR = _PROJECT_ROOT / ".cache" / "results"
 
 # ---------------------------------------------------------------------------
 # Physical constants
@@ -34,6 +35,8 @@ N_DUTY_PUMPS = 4
 Q_RATED_LPS = 1256.0        # l/s per pump
 H_RATED_M = 26.07           # m — effective rated head
 H_SHUTOFF_M = 46.54         # m — shutoff head
+Q_RUNOUT_LPS = 1700.0       # l/s — runout point of PC_35WX (Rev2, curve read)
+H_RUNOUT_M = 14.50          # m — head at runout (Rev2, curve read)
 ETA_BEP_PCT = 89.0          # % — efficiency at BEP
 ETA_DUTY_PCT = 88.0         # % — efficiency at duty point
 Q_BEP_BOWL_LPS = 1237.0     # l/s — BEP bowl flow
@@ -42,11 +45,20 @@ MOTOR_POWER_KW = 447.0      # kW — motor nameplate
 MOTOR_SERVICE_FACTOR = 1.15
 PUMP_SPEED_RPM = 885        # rpm at 60 Hz
 
+# EFF_35WX efficiency curve (Q l/s, eta %) — 13 points read from the curve image (Rev2)
+EFF_35WX_POINTS: tuple[tuple[float, float], ...] = (
+    (400.0, 32.0), (600.0, 52.0), (800.0, 68.0), (845.0, 71.0), (1000.0, 79.0),
+    (1100.0, 84.0), (1200.0, 87.0), (1237.0, 89.0), (1256.0, 88.0), (1400.0, 85.0),
+    (1500.0, 79.0), (1600.0, 70.0), (1700.0, 58.0),
+)
+
 # ---------------------------------------------------------------------------
 # Valve parameters — VAG RIKO DN1800 (Section 3.2)
 # ---------------------------------------------------------------------------
 VAG_QMIN_M3H = 4500.0       # m³/h — minimum operating flow per VAG sizing
 VAG_QMAX_M3H = 18000.0      # m³/h — maximum operating flow per VAG sizing
+RIKO_CONTROL_MIN_PCT = 20.0     # % — Kv roughly linear in travel from here...
+RIKO_CONTROL_MAX_PCT = 100.0    # % — ...to fully open (control range)
 
 
 @dataclass(frozen=True)
@@ -124,6 +136,33 @@ PIPE_DN_MM = {
     "P_DS_4": 1800.0,
 }
 
+# Pipe lengths, D-W roughness and minor-loss coefficients (Rev3 [PIPES];
+# Rev2's single 303 m P_DS equals P_DS_1..4 in series)
+PIPE_LENGTH_M = {
+    "P_INTAKE": 10.0,
+    "P_US": 80.0,
+    "P_DS_1": 75.75,
+    "P_DS_2": 75.75,
+    "P_DS_3": 75.75,
+    "P_DS_4": 75.75,
+}
+PIPE_ROUGHNESS_MM = {
+    "P_INTAKE": 0.10,
+    "P_US": 0.046,
+    "P_DS_1": 0.030,
+    "P_DS_2": 0.030,
+    "P_DS_3": 0.030,
+    "P_DS_4": 0.030,
+}
+PIPE_MINOR_LOSS = {
+    "P_INTAKE": 0.50,
+    "P_US": 0.0,
+    "P_DS_1": 0.0,
+    "P_DS_2": 0.0,
+    "P_DS_3": 0.0,
+    "P_DS_4": 0.0,
+}
+
 # ---------------------------------------------------------------------------
 # Reference operating points — Section 5, hand-calculated (Newton iteration)
 # ---------------------------------------------------------------------------
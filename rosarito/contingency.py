@@ -0,0 +1,172 @@
+"""N-k contingency enumeration for pump outages.
+
+Every combination of unavailable pumps among PUMP_IDS (standby included)
+is crossed with every RIKO opening. For each outage the station runs the
+opening's nominal pump count if enough pumps are left, otherwise all
+remaining pumps, taking duty pumps before the standby.
+
+All five pumps share curve PC_35WX and sit between the same two nodes, so
+the hydraulics depend only on *how many* (identical) pumps run, not which.
+Running sets are grouped by their (curve, from, to) signature, so only
+distinct combinations are solved and each result is broadcast back to
+every specific pump set: 32 outage sets × 7 openings need 35 solves on
+Rev3. Should a revision ever make pumps differ, the signatures differ too
+and those sets are solved individually.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+
+from rosarito.constants import (
+    INP_FILE_REV3,
+    N_TOTAL_PUMPS,
+    PUMP_IDS,
+    RIKO_OPENINGS,
+    RIKO_OPENINGS_ALL,
+    RikoOpening,
+)
+from rosarito.model import SteadyStateResult
+from rosarito.scenarios import StagingSession
+
+
+@dataclass
+class ContingencyCase:
+    """One outage set at one RIKO opening."""
+    outage: tuple[str, ...]             # unavailable pumps
+    opening: RikoOpening
+    running: tuple[str, ...]            # pumps that run in this case
+    result: SteadyStateResult | None    # None when no pump can run
+    q_intact_lps: float                 # same opening, no outage
+
+    @property
+    def level(self) -> int:
+        """k in N-k: number of unavailable pumps."""
+        return len(self.outage)
+
+    @property
+    def shortfall(self) -> int:
+        """Pumps missing relative to the opening's nominal pump count."""
+        return self.opening.n_pumps - len(self.running)
+
+    @property
+    def q_total_lps(self) -> float:
+        return self.result.q_total_lps if self.result is not None else 0.0
+
+    @property
+    def q_deficit_pct(self) -> float:
+        """Flow lost relative to the intact station at the same opening.
+
+        0 when the intact station delivers nothing (static lift at or above
+        shutoff head, e.g. under H_PLANT/H_SEA overrides): there is no flow
+        to lose.
+        """
+        if self.q_intact_lps <= 0.0:
+            return 0.0
+        return 100.0 * (1.0 - self.q_total_lps / self.q_intact_lps)
+
+
+def enumerate_outages(max_outage: int = N_TOTAL_PUMPS) -> list[tuple[str, ...]]:
+    """All unavailable-pump combinations of size 0..max_outage."""
+    if not 0 <= max_outage <= N_TOTAL_PUMPS:
+        raise ValueError(f"max_outage must be 0–{N_TOTAL_PUMPS}, got {max_outage}")
+    return [
+        outage
+        for k in range(max_outage + 1)
+        for outage in combinations(PUMP_IDS, k)
+    ]
+
+
+def running_pumps(outage: tuple[str, ...], n_wanted: int) -> tuple[str, ...]:
+    """First *n_wanted* available pumps in PUMP_IDS order (standby last)."""
+    available = [pid for pid in PUMP_IDS if pid not in outage]
+    return tuple(available[:n_wanted])
+
+
+def run_contingencies(
+    inp_path: str | Path | None = None,
+    max_outage: int = N_TOTAL_PUMPS,
+    openings: list[RikoOpening] | None = None,
+) -> list[ContingencyCase]:
+    """Enumerate pump outages × RIKO openings on one loaded model.
+
+    Args:
+        inp_path: Path to INP file. Defaults to Rev3.
+        max_outage: Largest outage to enumerate (1 = N-1, 2 = N-2, ...).
+                    Defaults to every combination.
+        openings: RIKO openings. Defaults to all GPVs present in the INP.
+
+    Returns:
+        Cases ordered by (outage level, outage set, opening).
+    """
+    outages = enumerate_outages(max_outage)
+    solved: dict[tuple, SteadyStateResult | None] = {}
+
+    with StagingSession(inp_path or INP_FILE_REV3) as session:
+        d = session.d
+        link_idx = session.model.link_indices
+        if openings is None:
+            openings = RIKO_OPENINGS_ALL if "RIKO_40" in link_idx else RIKO_OPENINGS
+
+        # Identical signature ⇒ interchangeable pumps
+        curves = d.getLinkPumpHCurve()
+        signature = {}
+        for pid, curve in zip(PUMP_IDS, curves):
+            start, end = d.getLinkNodesIndex(link_idx[pid])
+            signature[pid] = (int(curve), int(start), int(end))
+
+        def solve(opening: RikoOpening, running: tuple[str, ...]):
+            key = (opening, tuple(sorted(signature[pid] for pid in running)))
+            if key not in solved:
+                solved[key] = (
+                    session.run(opening, list(running)) if running else None
+                )
+            return solved[key]
+
+        intact = {
+            o: solve(o, running_pumps((), o.n_pumps)).q_total_lps for o in openings
+        }
+        cases = []
+        for outage in outages:
+            for opening in openings:
+                running = running_pumps(outage, opening.n_pumps)
+                cases.append(ContingencyCase(
+                    outage=outage,
+                    opening=opening,
+                    running=running,
+                    result=solve(opening, running),
+                    q_intact_lps=intact[opening],
+                ))
+
+    return cases
+
+
+@dataclass
+class ContingencySummary:
+    """Worst case over all outage sets of one level at one opening."""
+    level: int
+    opening: RikoOpening
+    n_sets: int
+    n_running_min: int
+    q_min_lps: float
+    q_deficit_pct_max: float
+
+
+def summarize_contingencies(cases: list[ContingencyCase]) -> list[ContingencySummary]:
+    """Reduce cases to the worst case per (N-k level, opening)."""
+    groups: dict[tuple[int, RikoOpening], list[ContingencyCase]] = {}
+    for c in cases:
+        groups.setdefault((c.level, c.opening), []).append(c)
+    return [
+        ContingencySummary(
+            level=level,
+            opening=opening,
+            n_sets=len(group),
+            n_running_min=min(len(c.running) for c in group),
+            q_min_lps=min(c.q_total_lps for c in group),
+            q_deficit_pct_max=max(c.q_deficit_pct for c in group),
+        )
+        for (level, opening), group in groups.items()
+    ]
@@ -6,15 +6,22 @@ P_hyd = rho × g × Q(m³/s) × H / 1000  [kW]
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
 
 from rosarito.constants import (
     RHO_SEAWATER,
     G,
     MOTOR_POWER_KW,
     ETA_DUTY_PCT,
+    PUMP_IDS,
+    INP_FILE,
 )
-from rosarito.model import SteadyStateResult
+from rosarito.inp import load_inp
+from rosarito.model import EPSResult, EPSStep, SteadyStateResult
 
 
 @dataclass
@@ -95,6 +102,226 @@ def compute_all_scenario_energies(
     ]
 
 
+# ---------------------------------------------------------------------------
+# Pump efficiency curves
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class EfficiencyCurve:
+    """Pump efficiency vs flow, interpolated linearly and clamped at the ends
+    as EPANET does for [ENERGY] Pump ... Efficiency curves."""
+    q_lps: tuple[float, ...]
+    eta_pct: tuple[float, ...]
+
+    def __post_init__(self) -> None:
+        if not self.q_lps or len(self.q_lps) != len(self.eta_pct):
+            raise ValueError("efficiency curve needs matching, non-empty Q and eta points")
+        if any(b <= a for a, b in zip(self.q_lps, self.q_lps[1:])):
+            raise ValueError("efficiency curve flows must be strictly increasing")
+
+    @classmethod
+    def constant(cls, eta_pct: float) -> EfficiencyCurve:
+        return cls((0.0,), (float(eta_pct),))
+
+    def eta_at(self, q_lps) -> np.ndarray:
+        return np.interp(q_lps, self.q_lps, self.eta_pct)
+
+
+def load_pump_efficiency(inp_path: str | Path | None = None) -> dict[str, EfficiencyCurve]:
+    """{pump ID: efficiency curve} from the INP [ENERGY] section.
+
+    Pumps without an Efficiency curve get the Global Efficiency as a
+    constant curve. Read with the native parser (rosarito.inp), so no
+    EPANET project is loaded.
+    """
+    inp = load_inp(inp_path or INP_FILE)
+    global_eta = inp.energy.global_efficiency_pct
+    curves: dict[str, EfficiencyCurve] = {}
+    out = {}
+    for pid in inp.pumps:
+        curve_id = inp.energy.pump_efficiency.get(pid)
+        if curve_id is None:
+            out[pid] = EfficiencyCurve.constant(global_eta)
+            continue
+        if curve_id not in curves:
+            c = inp.curve(curve_id)
+            curves[curve_id] = EfficiencyCurve(tuple(c.x.tolist()), tuple(c.y.tolist()))
+        out[pid] = curves[curve_id]
+    return out
+
+
+def _pump_eta(
+    q_lps: np.ndarray,
+    eta_pct: float,
+    efficiency: Mapping[str, EfficiencyCurve] | None,
+) -> np.ndarray:
+    """Efficiency per PUMP_IDS column of *q_lps* (last axis)."""
+    if efficiency is None:
+        return np.full(q_lps.shape, float(eta_pct))
+    eta = np.empty(q_lps.shape)
+    for j, pid in enumerate(PUMP_IDS):
+        curve = efficiency.get(pid)
+        eta[..., j] = curve.eta_at(q_lps[..., j]) if curve else eta_pct
+    return eta
+
+
+def _hydraulic_kw(q_lps, h_m):
+    return RHO_SEAWATER * G * (q_lps / 1000.0) * h_m / 1000.0
+
+
+# ---------------------------------------------------------------------------
+# EPS energy integration (streaming)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class EPSEnergyResult:
+    """Pump energy integrated over an EPS run."""
+    hours: float
+    energy_kwh: float
+    pump_energy_kwh: dict[str, float]
+    peak_shaft_kw: float
+    pump_run_hours: dict[str, float] = field(default_factory=dict)
+    hydraulic_kwh: float = 0.0
+
+    @property
+    def mean_eta_pct(self) -> float:
+        """Energy-weighted pump efficiency over the run."""
+        return 100.0 * self.hydraulic_kwh / self.energy_kwh if self.energy_kwh else 0.0
+
+
+class EPSEnergyAccumulator:
+    """Integrate pump shaft energy step by step over an EPS stream.
+
+    Each step's power is held constant until the next step time, matching
+    EPANET's own energy accounting. Only the previous step's power is kept,
+    so memory does not grow with the run length.
+
+    With *efficiency* (see load_pump_efficiency), each pump's efficiency
+    is read off its curve at the step's flow instead of using eta_pct.
+    """
+
+    def __init__(
+        self,
+        eta_pct: float = ETA_DUTY_PCT,
+        efficiency: Mapping[str, EfficiencyCurve] | None = None,
+    ):
+        self.eta_pct = eta_pct
+        self.efficiency = efficiency
+        self._pump_kwh = np.zeros(len(PUMP_IDS))
+        self._pump_h = np.zeros(len(PUMP_IDS))
+        self._hyd_kwh = 0.0
+        self._hours = 0.0
+        self._peak_kw = 0.0
+        self._prev: tuple[float, np.ndarray, np.ndarray] | None = None
+
+    def _power_kw(self, step: EPSStep) -> tuple[np.ndarray, np.ndarray]:
+        """(shaft kW, hydraulic kW) per pump at *step*."""
+        h_pump = step.head("J_MANIFOLD") - step.head("J_SUCTION")
+        q = np.array([step.flow(pid) for pid in PUMP_IDS])
+        on = np.array([step.status(pid) != 0 for pid in PUMP_IDS]) & (q > 0.0)
+        p_hyd = np.where(on, _hydraulic_kw(q, h_pump), 0.0)
+        eta = _pump_eta(q, self.eta_pct, self.efficiency)
+        return np.where(on, p_hyd / (eta / 100.0), 0.0), p_hyd
+
+    def update(self, step: EPSStep) -> None:
+        if self._prev is not None:
+            t_prev, kw_prev, hyd_prev = self._prev
+            dt_h = (step.time_s - t_prev) / 3600.0
+            self._hours += dt_h
+            self._pump_kwh += kw_prev * dt_h
+            self._pump_h += (kw_prev > 0.0) * dt_h
+            self._hyd_kwh += float(hyd_prev.sum()) * dt_h
+        power, p_hyd = self._power_kw(step)
+        self._peak_kw = max(self._peak_kw, float(power.sum()))
+        self._prev = (step.time_s, power, p_hyd)
+
+    def result(self) -> EPSEnergyResult:
+        return EPSEnergyResult(
+            hours=self._hours,
+            energy_kwh=float(self._pump_kwh.sum()),
+            pump_energy_kwh=dict(zip(PUMP_IDS, self._pump_kwh.tolist())),
+            peak_shaft_kw=self._peak_kw,
+            pump_run_hours=dict(zip(PUMP_IDS, self._pump_h.tolist())),
+            hydraulic_kwh=self._hyd_kwh,
+        )
+
+
+# ---------------------------------------------------------------------------
+# EPS energy integration (vectorized)
+# ---------------------------------------------------------------------------
+
+def _eps_pump_kw(
+    eps: EPSResult,
+    eta_pct: float,
+    efficiency: Mapping[str, EfficiencyCurve] | None,
+    speed_ratio: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(shaft kW, hydraulic kW), each shaped (n_steps, len(PUMP_IDS)).
+
+    With *speed_ratio* (same shape), efficiency is read at the homologous
+    rated-speed flow q / speed (affinity laws keep efficiency there).
+    """
+    cols = [eps.link_cols[pid] for pid in PUMP_IDS]
+    q = eps.link_flow[:, cols].astype(np.float64)
+    h_pump = (
+        eps.node_head[:, eps.node_cols["J_MANIFOLD"]]
+        - eps.node_head[:, eps.node_cols["J_SUCTION"]]
+    ).astype(np.float64)
+    on = (eps.link_status[:, cols] != 0) & (q > 0.0)
+    p_hyd = np.where(on, _hydraulic_kw(q, h_pump[:, None]), 0.0)
+    q_eta = q
+    if speed_ratio is not None:
+        q_eta = np.divide(q, speed_ratio, out=q.copy(), where=speed_ratio > 0.0)
+    eta = _pump_eta(q_eta, eta_pct, efficiency)
+    return np.where(on, p_hyd / (eta / 100.0), 0.0), p_hyd
+
+
+def eps_pump_power_kw(
+    eps: EPSResult,
+    eta_pct: float = ETA_DUTY_PCT,
+    efficiency: Mapping[str, EfficiencyCurve] | None = None,
+) -> np.ndarray:
+    """Shaft power of every pump at every step, shape (n_steps, len(PUMP_IDS)).
+
+    Vectorized counterpart of EPSEnergyAccumulator's per-step power: a
+    pump draws power when its status is open and its flow is positive.
+    """
+    return _eps_pump_kw(eps, eta_pct, efficiency)[0]
+
+
+def integrate_eps_energy(
+    eps: EPSResult,
+    eta_pct: float = ETA_DUTY_PCT,
+    efficiency: Mapping[str, EfficiencyCurve] | None = None,
+    speed_ratio: np.ndarray | None = None,
+) -> EPSEnergyResult:
+    """Pump shaft energy over a stored EPS run, across all pumps and steps at once.
+
+    Same accounting as EPSEnergyAccumulator (power held until the next
+    step), so trips, standby starts and intermediate control steps are
+    all integrated as simulated.
+
+    Args:
+        eps: EPS results.
+        eta_pct: Constant pump efficiency.
+        efficiency: {pump ID: curve}, e.g. load_pump_efficiency(); pumps
+                    not listed, or all pumps if None, use eta_pct.
+        speed_ratio: Per-step pump speeds of a VFD run, (n_steps, len(PUMP_IDS)).
+    """
+    shaft, hyd = _eps_pump_kw(eps, eta_pct, efficiency, speed_ratio)
+    dt_h = np.diff(np.asarray(eps.time_s, dtype=np.float64)) / 3600.0
+    pump_kwh = dt_h @ shaft[:-1]
+    pump_h = dt_h @ (shaft[:-1] > 0.0)
+    return EPSEnergyResult(
+        hours=float(dt_h.sum()),
+        energy_kwh=float(pump_kwh.sum()),
+        pump_energy_kwh=dict(zip(PUMP_IDS, pump_kwh.tolist())),
+        peak_shaft_kw=float(shaft.sum(axis=1).max()) if len(shaft) else 0.0,
+        pump_run_hours=dict(zip(PUMP_IDS, pump_h.tolist())),
+        hydraulic_kwh=float(dt_h @ hyd[:-1].sum(axis=1)),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Throttle-loss quantification
 # ---------------------------------------------------------------------------
@@ -0,0 +1,205 @@
+"""Chunked, memory-mapped on-disk storage for long EPS runs.
+
+A year at the 5-minute hydraulic step is ~105k steps; instead of holding
+that in RAM, ChunkedEPSWriter consumes a stream_eps() step stream and
+appends fixed-size chunks to one .npy file per quantity. load_eps() maps
+the files back read-only, so an EPSResult over a year-long run costs no
+memory until a slice is actually read.
+
+Directory layout:
+  time_s.npy, link_flow.npy, link_velocity.npy, link_status.npy,
+  node_head.npy   — standard .npy files, one row per step
+  meta.json       — ID → column maps, step count and run key; written
+                    last, so a directory without it is incomplete
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.model import EPSResult, EPSStep
+
+DEFAULT_CHUNK_STEPS = 4096     # rows buffered per quantity before a write
+
+META_FILE = "meta.json"
+_NPY_HEADER_LEN = 128          # fixed, so the shape can be patched in place
+
+
+def _npy_header(dtype: np.dtype, shape: tuple[int, ...]) -> bytes:
+    """Version 1.0 .npy header padded to a fixed length.
+
+    Writing the header up front with a placeholder shape and rewriting it
+    at close only works if both headers are the same size.
+    """
+    text = repr({
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": tuple(shape),
+    })
+    magic = np.lib.format.magic(1, 0)
+    n_pad = _NPY_HEADER_LEN - len(magic) - 2 - len(text) - 1
+    if n_pad < 0:
+        raise ValueError(f"shape {shape} does not fit a {_NPY_HEADER_LEN}-byte header")
+    header = text.encode("latin1") + b" " * n_pad + b"\n"
+    return magic + struct.pack("<H", len(header)) + header
+
+
+class _ColumnFile:
+    """Append-only .npy file with a chunk buffer of fixed row width."""
+
+    def __init__(self, path: Path, dtype, n_cols: int | None, chunk_steps: int):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.n_cols = n_cols            # None → 1-D (one scalar per step)
+        shape = (chunk_steps,) if n_cols is None else (chunk_steps, n_cols)
+        self._buf = np.empty(shape, dtype=self.dtype)
+        self._k = 0
+        self.n_rows = 0
+        self._f = open(path, "wb")
+        self._f.write(_npy_header(self.dtype, self._shape(0)))
+
+    def _shape(self, n: int) -> tuple[int, ...]:
+        return (n,) if self.n_cols is None else (n, self.n_cols)
+
+    def append(self, row) -> None:
+        self._buf[self._k] = row
+        self._k += 1
+        if self._k == len(self._buf):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._k:
+            self._f.write(self._buf[: self._k].tobytes())
+            self.n_rows += self._k
+            self._k = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._f.seek(0)
+        self._f.write(_npy_header(self.dtype, self._shape(self.n_rows)))
+        self._f.close()
+
+
+class ChunkedEPSWriter:
+    """Step consumer that writes an EPS stream to memory-mappable .npy files.
+
+    Use as a context manager (or call close()); meta.json is only written
+    on a clean close, so an interrupted run never looks complete.
+
+    Args:
+        directory: Output directory (created if missing; existing run files
+                   are overwritten).
+        dtype: Storage dtype for flow, velocity and head ("float64"/"float32").
+        chunk_steps: Rows buffered in memory per quantity between writes.
+        key: Optional run key stored in meta.json (see load_eps()).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        dtype: str = "float64",
+        chunk_steps: int = DEFAULT_CHUNK_STEPS,
+        key: str | None = None,
+    ):
+        if chunk_steps < 1:
+            raise ValueError(f"chunk_steps must be >= 1, got {chunk_steps}")
+        self.directory = Path(directory)
+        self.dtype = dtype
+        self.chunk_steps = chunk_steps
+        self.key = key
+        self._files: dict[str, _ColumnFile] = {}
+        self._cols: tuple[dict[str, int], dict[str, int]] | None = None
+
+    def _open(self, step: EPSStep) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / META_FILE).unlink(missing_ok=True)
+        n_links, n_nodes = len(step.link_flow), len(step.node_head)
+        specs = {
+            "time_s": (np.float64, None),
+            "link_flow": (self.dtype, n_links),
+            "link_velocity": (self.dtype, n_links),
+            "link_status": (np.int8, n_links),
+            "node_head": (self.dtype, n_nodes),
+        }
+        for name, (dt, n_cols) in specs.items():
+            self._files[name] = _ColumnFile(
+                self.directory / f"{name}.npy", dt, n_cols, self.chunk_steps,
+            )
+        self._cols = (step.link_cols, step.node_cols)
+
+    def update(self, step: EPSStep) -> None:
+        if not self._files:
+            self._open(step)
+        files = self._files
+        files["time_s"].append(step.time_s)
+        files["link_flow"].append(step.link_flow)
+        files["link_velocity"].append(step.link_velocity)
+        files["link_status"].append(step.link_status)
+        files["node_head"].append(step.node_head)
+
+    def close(self) -> None:
+        if not self._files:
+            raise RuntimeError("no EPS steps were written")
+        for f in self._files.values():
+            f.close()
+        link_cols, node_cols = self._cols
+        meta = {
+            "n_steps": self._files["time_s"].n_rows,
+            "dtype": self.dtype,
+            "key": self.key,
+            "link_cols": link_cols,
+            "node_cols": node_cols,
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, self.directory / META_FILE)
+        self._files = {}
+
+    def _abort(self) -> None:
+        for f in self._files.values():
+            f._f.close()
+        self._files = {}
+
+    def __enter__(self) -> ChunkedEPSWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._abort()
+
+
+def load_eps(directory: str | Path, key: str | None = None) -> EPSResult | None:
+    """Map a stored run back as a read-only, lazily-loaded EPSResult.
+
+    Returns None if the directory holds no complete run, or if *key* is
+    given and differs from the key the run was written with.
+    """
+    directory = Path(directory)
+    try:
+        meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if key is not None and meta.get("key") != key:
+        return None
+
+    def mmap(name: str) -> np.ndarray:
+        return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+    return EPSResult(
+        time_s=mmap("time_s"),
+        link_flow=mmap("link_flow"),
+        link_velocity=mmap("link_velocity"),
+        link_status=mmap("link_status"),
+        node_head=mmap("node_head"),
+        link_cols=meta["link_cols"],
+        node_cols=meta["node_cols"],
+    )
@@ -7,10 +7,12 @@ to avoid duplicating the timestep iteration and change-detection logic.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Iterable, Iterator, Protocol
 
-from rosarito.constants import PUMP_IDS, RIKO_IDS, lps_to_m3h
-from rosarito.model import EPSResult
+import numpy as np
+
+from rosarito.constants import PUMP_IDS, RIKO_IDS_ALL, lps_to_m3h
+from rosarito.model import EPSResult, EPSStep
 
 
 def format_sim_time(seconds: float) -> tuple[int, int]:
@@ -40,52 +42,213 @@ class EPSEventRow:
     h_pump_m: float
 
 
-def iter_eps_events(eps: EPSResult) -> Iterator[EPSEventRow]:
+def iter_eps_events(
+    eps: EPSResult | Iterable[EPSStep],
+) -> Iterator[EPSEventRow]:
     """Iterate EPS timesteps, yielding a row only when state changes.
 
     Yields the first timestep, every timestep where pump status or RIKO
     opening differs from the previous one, and the last timestep.
+
+    *eps* may be a full EPSResult (change detection runs on whole status
+    columns) or a stream of EPSStep from stream_eps(), consumed one step
+    at a time in constant memory.
     """
-    prev_pump_states: list[int] | None = None
-    prev_riko_open: str | None = None
+    if not isinstance(eps, EPSResult):
+        detector = EventDetector()
+        for step in eps:
+            row = detector.update(step)
+            if row is not None:
+                yield row
+        row = detector.finish()
+        if row is not None:
+            yield row
+        return
+
+    n = eps.n_steps
+    if n == 0:
+        return
+
+    riko_ids = _riko_ids(eps.statuses)
+    pump_status = np.stack([eps.statuses[pid] for pid in PUMP_IDS], axis=1)
+    riko_open = np.stack([eps.statuses[rid] for rid in riko_ids], axis=1) != 0
+    # Index of the last open RIKO GPV per step (-1 = none open)
+    riko_last = np.where(
+        riko_open.any(axis=1),
+        len(riko_ids) - 1 - np.argmax(riko_open[:, ::-1], axis=1),
+        -1,
+    )
+
+    changed = np.zeros(n, dtype=bool)
+    changed[0] = changed[-1] = True
+    changed[1:] |= (pump_status[1:] != pump_status[:-1]).any(axis=1)
+    changed[1:] |= riko_last[1:] != riko_last[:-1]
+
+    q_ds_col = eps.flows["P_DS"]
+    h_manifold_col = eps.heads["J_MANIFOLD"]
+    h_suction_col = eps.heads["J_SUCTION"]
+
+    for i in np.flatnonzero(changed):
+        t_s = float(eps.time_s[i])
+        h, m = format_sim_time(t_s)
+        pump_on = [bool(s != 0) for s in pump_status[i]]
+        k = int(riko_last[i])
+
+        q_ds = float(q_ds_col[i])
+        h_pump = float(h_manifold_col[i]) - float(h_suction_col[i])
+
+        yield EPSEventRow(
+            time_s=t_s,
+            hours=h,
+            minutes=m,
+            pump_on=pump_on,
+            n_active=sum(pump_on),
+            riko_opening=riko_label(riko_ids[k]) if k >= 0 else "---",
+            q_ds_lps=q_ds,
+            q_ds_m3h=lps_to_m3h(q_ds),
+            h_pump_m=h_pump,
+        )
+
+
+def _riko_ids(link_cols) -> list[str]:
+    """RIKO GPVs present in an EPS run (all 7 on Rev3, 4 on Rev2)."""
+    return [rid for rid in RIKO_IDS_ALL if rid in link_cols]
+
+
+# ---------------------------------------------------------------------------
+# Incremental (streaming) consumers
+# ---------------------------------------------------------------------------
+
+class StepConsumer(Protocol):
+    def update(self, step: EPSStep) -> None: ...
 
-    for i, t_s in enumerate(eps.time_s):
-        pump_states = [eps.statuses[pid][i] for pid in PUMP_IDS]
-        n_active = sum(1 for s in pump_states if s != 0)
 
+def feed_eps(steps: Iterable[EPSStep], *consumers: StepConsumer) -> int:
+    """Push every step of a stream through *consumers* in one pass.
+
+    Returns the number of steps consumed.
+    """
+    n = 0
+    for step in steps:
+        for consumer in consumers:
+            consumer.update(step)
+        n += 1
+    return n
+
+
+def _event_row(step: EPSStep, pump_states: tuple[int, ...], riko_open: str) -> EPSEventRow:
+    h, m = format_sim_time(step.time_s)
+    q_ds = step.flow("P_DS")
+    pump_on = [s != 0 for s in pump_states]
+    return EPSEventRow(
+        time_s=step.time_s,
+        hours=h,
+        minutes=m,
+        pump_on=pump_on,
+        n_active=sum(pump_on),
+        riko_opening=riko_open,
+        q_ds_lps=q_ds,
+        q_ds_m3h=lps_to_m3h(q_ds),
+        h_pump_m=step.head("J_MANIFOLD") - step.head("J_SUCTION"),
+    )
+
+
+class EventDetector:
+    """Streaming state-change detection for iter_eps_events().
+
+    Holds only the previous pump/RIKO state and the latest step, so the
+    final row can be emitted by finish(). Emitted rows are also kept in
+    ``events`` (state changes are sparse) for use with feed_eps().
+    """
+
+    def __init__(self) -> None:
+        self.events: list[EPSEventRow] = []
+        self._prev: tuple[tuple[int, ...], str] | None = None
+        self._last: EPSStep | None = None
+        self._last_emitted = False
+
+    def update(self, step: EPSStep) -> EPSEventRow | None:
+        """Consume one step; return its event row if the state changed."""
+        pump_states = tuple(step.status(pid) for pid in PUMP_IDS)
         riko_open = "---"
-        for rid in RIKO_IDS:
-            if eps.statuses[rid][i] != 0:
+        for rid in _riko_ids(step.link_cols):
+            if step.status(rid) != 0:
                 riko_open = riko_label(rid)
 
-        changed = (
-            prev_pump_states is None
-            or pump_states != prev_pump_states
-            or riko_open != prev_riko_open
-            or i == len(eps.time_s) - 1
-        )
+        state = (pump_states, riko_open)
+        row = None
+        if state != self._prev:
+            row = _event_row(step, pump_states, riko_open)
+            self.events.append(row)
+        self._prev = state
+        self._last = step
+        self._last_emitted = row is not None
+        return row
+
+    def finish(self) -> EPSEventRow | None:
+        """Emit the final step if it was not already an event."""
+        if self._last is None or self._last_emitted:
+            return None
+        pump_states, riko_open = self._prev
+        row = _event_row(self._last, pump_states, riko_open)
+        self.events.append(row)
+        self._last_emitted = True
+        return row
+
+
+class RunningStats:
+    """Welford running mean/variance with min and max."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self) -> float:
+        return (self._m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+
+class EPSStatistics:
+    """Constant-memory summary statistics over an EPS stream.
+
+    Tracks Q_DS and pump head per step, plus pump running hours and the
+    hours spent at each active-pump count. Durations come from consecutive
+    step times, so the uneven steps EPANET inserts at control events are
+    weighted correctly.
+    """
 
-        if changed:
-            h, m = format_sim_time(t_s)
-
-            q_ds = eps.flows["P_DS"][i]
-            q_m3h = lps_to_m3h(q_ds)
-
-            h_manifold = eps.heads["J_MANIFOLD"][i]
-            h_suction = eps.heads["J_SUCTION"][i]
-            h_pump = h_manifold - h_suction
-
-            yield EPSEventRow(
-                time_s=t_s,
-                hours=h,
-                minutes=m,
-                pump_on=[s != 0 for s in pump_states],
-                n_active=n_active,
-                riko_opening=riko_open,
-                q_ds_lps=q_ds,
-                q_ds_m3h=q_m3h,
-                h_pump_m=h_pump,
-            )
-
-        prev_pump_states = pump_states[:]
-        prev_riko_open = riko_open
+    def __init__(self) -> None:
+        self.q_ds_lps = RunningStats()
+        self.h_pump_m = RunningStats()
+        self.pump_hours: dict[str, float] = {pid: 0.0 for pid in PUMP_IDS}
+        self.hours_by_n_active: dict[int, float] = {}
+        self.n_steps = 0
+        self.duration_h = 0.0
+        self._prev: tuple[float, list[bool]] | None = None
+
+    def update(self, step: EPSStep) -> None:
+        self.n_steps += 1
+        self.q_ds_lps.add(step.flow("P_DS"))
+        self.h_pump_m.add(step.head("J_MANIFOLD") - step.head("J_SUCTION"))
+
+        if self._prev is not None:
+            t_prev, on_prev = self._prev
+            dt_h = (step.time_s - t_prev) / 3600.0
+            self.duration_h += dt_h
+            for pid, on in zip(PUMP_IDS, on_prev):
+                if on:
+                    self.pump_hours[pid] += dt_h
+            n_on = sum(on_prev)
+            self.hours_by_n_active[n_on] = self.hours_by_n_active.get(n_on, 0.0) + dt_h
+        self._prev = (step.time_s, [step.status(pid) != 0 for pid in PUMP_IDS])
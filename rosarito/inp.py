@@ -0,0 +1,510 @@
+"""Native EPANET INP reader: typed sections without loading the toolkit.
+
+parse_inp() reads an INP file into an InpModel: network elements, curves
+and patterns as NumPy arrays, rules as parsed clauses, and typed
+[TIMES], [ENERGY] and [OPTIONS]. Every section's data lines (comments
+stripped) are also kept verbatim in InpModel.sections, so nothing the
+typed view does not cover is lost.
+
+load_inp() adds caching: parsed models are memoized in-process and
+pickled into the content-addressed result cache (rosarito.cache), keyed
+by the file bytes, whose digest is itself memoized on the file's mtime
+and size. Reading curves or times this way costs microseconds once warm.
+
+Values are as written in the file; the project's INPs use LPS, metres
+and millimetres.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.cache import default_cache, make_key
+from rosarito.constants import INP_FILE
+
+# Bump when the parsed types change shape (invalidates cached models).
+PARSER_VERSION = 1
+
+_RULE_KEYWORDS = ("IF", "AND", "OR", "THEN", "ELSE")
+_TIME_UNITS = {
+    "SEC": 1, "SECONDS": 1, "MIN": 60, "MINUTES": 60,
+    "HOUR": 3600, "HOURS": 3600, "DAY": 86400, "DAYS": 86400,
+}
+
+
+# ---------------------------------------------------------------------------
+# Section types
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Junction:
+    id: str
+    elevation_m: float
+    demand: float = 0.0
+    pattern: str | None = None
+
+
+@dataclass(frozen=True)
+class Reservoir:
+    id: str
+    head_m: float
+    pattern: str | None = None
+
+
+@dataclass(frozen=True)
+class Pipe:
+    id: str
+    node1: str
+    node2: str
+    length_m: float
+    diameter_mm: float
+    roughness: float
+    minor_loss: float = 0.0
+    status: str = "OPEN"
+
+
+@dataclass(frozen=True)
+class Pump:
+    id: str
+    node1: str
+    node2: str
+    head_curve: str | None = None
+    power_kw: float | None = None
+    speed: float | None = None
+    pattern: str | None = None
+
+
+@dataclass(frozen=True)
+class Valve:
+    id: str
+    node1: str
+    node2: str
+    diameter_mm: float
+    type: str
+    setting: str            # number, or curve ID for a GPV
+    minor_loss: float = 0.0
+
+
+@dataclass(frozen=True, eq=False)
+class Curve:
+    """[CURVES] entry: x/y points in file order."""
+    id: str
+    x: np.ndarray
+    y: np.ndarray
+
+    @property
+    def points(self) -> list[tuple[float, float]]:
+        return list(zip(self.x.tolist(), self.y.tolist()))
+
+
+@dataclass(frozen=True)
+class RuleClause:
+    """One IF/AND/OR/THEN/ELSE line, e.g. LINK PUMP_1 STATUS = OPEN."""
+    keyword: str
+    object: str             # NODE, LINK, SYSTEM, ...
+    id: str                 # "" for SYSTEM clauses
+    attribute: str
+    relation: str           # =, <>, <, >, <=, >=, IS, NOT, BELOW, ABOVE
+    value: str
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    premises: tuple[RuleClause, ...]
+    then_actions: tuple[RuleClause, ...]
+    else_actions: tuple[RuleClause, ...] = ()
+    priority: float | None = None
+
+
+@dataclass(frozen=True)
+class Times:
+    """[TIMES] in seconds (EPANET defaults where absent)."""
+    duration_s: int = 0
+    hydraulic_step_s: int = 3600
+    quality_step_s: int = 300
+    pattern_step_s: int = 3600
+    pattern_start_s: int = 0
+    report_step_s: int = 3600
+    report_start_s: int = 0
+    start_clocktime_s: int = 0
+    rule_step_s: int | None = None      # EPANET default: hydraulic step / 10
+    statistic: str = "NONE"
+
+
+@dataclass(frozen=True)
+class Energy:
+    """[ENERGY] global values and per-pump overrides."""
+    global_efficiency_pct: float = 75.0
+    global_price: float = 0.0
+    global_pattern: str | None = None
+    demand_charge: float = 0.0
+    pump_efficiency: dict[str, str] = field(default_factory=dict)    # pump → curve ID
+    pump_price: dict[str, float] = field(default_factory=dict)
+    pump_pattern: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Options:
+    """Commonly used [OPTIONS]; every option is also in *values*."""
+    units: str = "GPM"
+    headloss: str = "H-W"
+    specific_gravity: float = 1.0
+    viscosity: float = 1.0
+    trials: int = 200
+    accuracy: float = 0.001
+    demand_multiplier: float = 1.0
+    quality: str = "NONE"
+    values: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(eq=False)
+class InpModel:
+    """Typed view of one INP file."""
+    path: str
+    title: tuple[str, ...]
+    junctions: dict[str, Junction]
+    reservoirs: dict[str, Reservoir]
+    pipes: dict[str, Pipe]
+    pumps: dict[str, Pump]
+    valves: dict[str, Valve]
+    status: dict[str, str]
+    patterns: dict[str, np.ndarray]
+    curves: dict[str, Curve]
+    controls: tuple[str, ...]
+    rules: tuple[Rule, ...]
+    energy: Energy
+    times: Times
+    options: Options
+    sections: dict[str, tuple[str, ...]]
+
+    def curve(self, curve_id: str) -> Curve:
+        try:
+            return self.curves[curve_id]
+        except KeyError:
+            raise KeyError(f"{self.path}: no curve {curve_id!r}") from None
+
+    def pump_curve(self, pump_id: str) -> Curve:
+        """Head curve of *pump_id*."""
+        pump = self.pumps[pump_id]
+        if pump.head_curve is None:
+            raise ValueError(f"{pump_id} has no HEAD curve")
+        return self.curve(pump.head_curve)
+
+    def gpv_curves(self) -> dict[str, Curve]:
+        """{GPV link ID: headloss curve}."""
+        return {
+            v.id: self.curve(v.setting) for v in self.valves.values() if v.type == "GPV"
+        }
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def parse_time_s(value: str, units: str | None = None) -> int:
+    """EPANET time value in seconds: "h:mm[:ss]", decimal hours or "n UNITS"."""
+    v = value.strip().upper()
+    if units is None:
+        parts = v.split()
+        if len(parts) == 2 and parts[1] in ("AM", "PM"):
+            seconds = parse_time_s(parts[0]) % (12 * 3600)
+            return seconds + (12 * 3600 if parts[1] == "PM" else 0)
+        if len(parts) == 2:
+            v, units = parts
+    if ":" in v:
+        fields = [float(x) for x in v.split(":")] + [0.0]
+        return int(round(fields[0] * 3600 + fields[1] * 60 + fields[2]))
+    scale = _TIME_UNITS.get((units or "HOURS").upper())
+    if scale is None:
+        raise ValueError(f"unknown time unit {units!r}")
+    return int(round(float(v) * scale))
+
+
+def _split_sections(text: str) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """({section: data lines}, {section: raw lines}); comments stripped from data."""
+    data: dict[str, list[str]] = {}
+    raw: dict[str, list[str]] = {}
+    name = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("[") and "]" in stripped:
+            name = stripped[1:stripped.index("]")].upper()
+            data.setdefault(name, [])
+            raw.setdefault(name, [])
+            continue
+        if name is None:
+            continue
+        raw[name].append(line)
+        content = line.split(";", 1)[0].strip()
+        if content:
+            data[name].append(content)
+    return data, raw
+
+
+def _keyed(lines: list[str], keys: tuple[str, ...]) -> dict[str, str]:
+    """{KEY: value} for "Key Words  value" lines; multi-word keys from *keys*."""
+    out: dict[str, str] = {}
+    for line in lines:
+        upper = " ".join(line.split()).upper()
+        key = next((k for k in keys if upper == k or upper.startswith(k + " ")), None)
+        if key is None:
+            key = upper.split(" ", 1)[0]
+        n_words = len(key.split())
+        out[key] = " ".join(line.split()[n_words:])
+    return out
+
+
+def _parse_clause(line: str) -> RuleClause:
+    tok = line.split()
+    keyword = tok[0].upper()
+    if tok[1].upper() == "SYSTEM":
+        return RuleClause(keyword, "SYSTEM", "", tok[2].upper(), tok[3].upper(), " ".join(tok[4:]))
+    return RuleClause(
+        keyword, tok[1].upper(), tok[2], tok[3].upper(), tok[4].upper(), " ".join(tok[5:]),
+    )
+
+
+def _parse_rules(lines: list[str]) -> tuple[Rule, ...]:
+    rules = []
+    current: dict | None = None
+
+    def close() -> None:
+        if current is not None:
+            rules.append(Rule(
+                id=current["id"],
+                premises=tuple(current["IF"]),
+                then_actions=tuple(current["THEN"]),
+                else_actions=tuple(current["ELSE"]),
+                priority=current["priority"],
+            ))
+
+    for line in lines:
+        tok = line.split()
+        head = tok[0].upper()
+        if head == "RULE":
+            close()
+            current = {"id": tok[1], "IF": [], "THEN": [], "ELSE": [], "priority": None}
+            block = "IF"
+        elif current is None:
+            raise ValueError(f"[RULES] clause outside a rule: {line!r}")
+        elif head == "PRIORITY":
+            current["priority"] = float(tok[1])
+        elif head in _RULE_KEYWORDS:
+            if head in ("IF", "THEN", "ELSE"):
+                block = head
+            current[block].append(_parse_clause(line))
+        else:
+            raise ValueError(f"rule {current['id']}: unexpected line {line!r}")
+    close()
+    return tuple(rules)
+
+
+def _opt_float(tok: list[str], i: int, default: float = 0.0) -> float:
+    return float(tok[i]) if len(tok) > i else default
+
+
+def _parse_times(lines: list[str]) -> Times:
+    v = _keyed(lines, (
+        "HYDRAULIC TIMESTEP", "QUALITY TIMESTEP", "PATTERN TIMESTEP", "PATTERN START",
+        "REPORT TIMESTEP", "REPORT START", "START CLOCKTIME", "RULE TIMESTEP",
+    ))
+    hyd = parse_time_s(v["HYDRAULIC TIMESTEP"]) if "HYDRAULIC TIMESTEP" in v else 3600
+    get = lambda key, default: parse_time_s(v[key]) if key in v else default  # noqa: E731
+    return Times(
+        duration_s=get("DURATION", 0),
+        hydraulic_step_s=hyd,
+        quality_step_s=get("QUALITY TIMESTEP", hyd // 10),
+        pattern_step_s=get("PATTERN TIMESTEP", 3600),
+        pattern_start_s=get("PATTERN START", 0),
+        report_step_s=get("REPORT TIMESTEP", 3600),
+        report_start_s=get("REPORT START", 0),
+        start_clocktime_s=get("START CLOCKTIME", 0),
+        rule_step_s=get("RULE TIMESTEP", None),
+        statistic=v.get("STATISTIC", "NONE").upper(),
+    )
+
+
+def _parse_energy(lines: list[str]) -> Energy:
+    kwargs: dict = {"pump_efficiency": {}, "pump_price": {}, "pump_pattern": {}}
+    for line in lines:
+        tok = line.split()
+        head = tok[0].upper()
+        if head == "PUMP":
+            pid, key, value = tok[1], tok[2].upper(), tok[3]
+            if key.startswith("EFFIC"):
+                kwargs["pump_efficiency"][pid] = value
+            elif key == "PRICE":
+                kwargs["pump_price"][pid] = float(value)
+            elif key == "PATTERN":
+                kwargs["pump_pattern"][pid] = value
+        elif head == "GLOBAL":
+            key = tok[1].upper()
+            if key.startswith("EFFIC"):
+                kwargs["global_efficiency_pct"] = float(tok[2])
+            elif key == "PRICE":
+                kwargs["global_price"] = float(tok[2])
+            elif key == "PATTERN":
+                kwargs["global_pattern"] = tok[2]
+        elif head == "DEMAND":
+            kwargs["demand_charge"] = float(tok[2])
+    return Energy(**kwargs)
+
+
+def _parse_options(lines: list[str]) -> Options:
+    v = _keyed(lines, (
+        "SPECIFIC GRAVITY", "DEMAND MULTIPLIER", "EMITTER EXPONENT", "DEMAND MODEL",
+        "MINIMUM PRESSURE", "REQUIRED PRESSURE", "PRESSURE EXPONENT",
+    ))
+    return Options(
+        units=v.get("UNITS", "GPM").upper(),
+        headloss=v.get("HEADLOSS", "H-W").upper(),
+        specific_gravity=float(v.get("SPECIFIC GRAVITY", 1.0)),
+        viscosity=float(v.get("VISCOSITY", 1.0)),
+        trials=int(float(v.get("TRIALS", 200))),
+        accuracy=float(v.get("ACCURACY", 0.001)),
+        demand_multiplier=float(v.get("DEMAND MULTIPLIER", 1.0)),
+        quality=v.get("QUALITY", "NONE").split()[0].upper() if v.get("QUALITY") else "NONE",
+        values=v,
+    )
+
+
+def _parse_pump(tok: list[str]) -> Pump:
+    kwargs: dict = {}
+    for key, value in zip(tok[3::2], tok[4::2]):
+        key = key.upper()
+        if key == "HEAD":
+            kwargs["head_curve"] = value
+        elif key == "POWER":
+            kwargs["power_kw"] = float(value)
+        elif key == "SPEED":
+            kwargs["speed"] = float(value)
+        elif key == "PATTERN":
+            kwargs["pattern"] = value
+    return Pump(tok[0], tok[1], tok[2], **kwargs)
+
+
+def _numbered(lines: list[str]) -> dict[str, tuple[list[float], list[float]]]:
+    """Group "ID x y" rows by ID, in file order."""
+    out: dict[str, tuple[list[float], list[float]]] = {}
+    for line in lines:
+        tok = line.split()
+        xs, ys = out.setdefault(tok[0], ([], []))
+        xs.append(float(tok[1]))
+        ys.append(float(tok[2]))
+    return out
+
+
+def parse_inp_text(text: str, path: str = "") -> InpModel:
+    """Parse INP *text*; *path* is only recorded for messages."""
+    data, raw = _split_sections(text)
+    sec = lambda name: data.get(name, [])  # noqa: E731
+
+    patterns: dict[str, list[float]] = {}
+    for line in sec("PATTERNS"):
+        tok = line.split()
+        patterns.setdefault(tok[0], []).extend(float(x) for x in tok[1:])
+
+    curves = {
+        cid: Curve(cid, np.array(xs), np.array(ys))
+        for cid, (xs, ys) in _numbered(sec("CURVES")).items()
+    }
+
+    junctions = {}
+    for line in sec("JUNCTIONS"):
+        tok = line.split()
+        junctions[tok[0]] = Junction(
+            tok[0], float(tok[1]), _opt_float(tok, 2), tok[3] if len(tok) > 3 else None,
+        )
+    reservoirs = {}
+    for line in sec("RESERVOIRS"):
+        tok = line.split()
+        reservoirs[tok[0]] = Reservoir(tok[0], float(tok[1]), tok[2] if len(tok) > 2 else None)
+    pipes = {}
+    for line in sec("PIPES"):
+        tok = line.split()
+        pipes[tok[0]] = Pipe(
+            tok[0], tok[1], tok[2], float(tok[3]), float(tok[4]), float(tok[5]),
+            _opt_float(tok, 6), tok[7].upper() if len(tok) > 7 else "OPEN",
+        )
+    pumps = {p.id: p for p in (_parse_pump(line.split()) for line in sec("PUMPS"))}
+    valves = {}
+    for line in sec("VALVES"):
+        tok = line.split()
+        valves[tok[0]] = Valve(
+            tok[0], tok[1], tok[2], float(tok[3]), tok[4].upper(), tok[5], _opt_float(tok, 6),
+        )
+    status = {}
+    for line in sec("STATUS"):
+        tok = line.split()
+        status[tok[0]] = tok[1].upper()
+
+    return InpModel(
+        path=path,
+        title=tuple(line.rstrip() for line in raw.get("TITLE", [])),
+        junctions=junctions,
+        reservoirs=reservoirs,
+        pipes=pipes,
+        pumps=pumps,
+        valves=valves,
+        status=status,
+        patterns={pid: np.array(v) for pid, v in patterns.items()},
+        curves=curves,
+        controls=tuple(sec("CONTROLS")),
+        rules=_parse_rules(sec("RULES")),
+        energy=_parse_energy(sec("ENERGY")),
+        times=_parse_times(sec("TIMES")),
+        options=_parse_options(sec("OPTIONS")),
+        sections={name: tuple(lines) for name, lines in data.items()},
+    )
+
+
+def parse_inp(inp_path: str | Path | None = None) -> InpModel:
+    """Parse an INP file (no caching)."""
+    path = Path(inp_path or INP_FILE)
+    return parse_inp_text(path.read_text(encoding="utf-8", errors="replace"), str(path))
+
+
+# ---------------------------------------------------------------------------
+# Cached access
+# ---------------------------------------------------------------------------
+
+_memo: dict[str, InpModel] = {}
+
+
+def load_inp(inp_path: str | Path | None = None, use_cache: bool = True) -> InpModel:
+    """Parsed INP, reused while the file bytes are unchanged.
+
+    The returned model is shared between callers; treat it as read-only.
+
+    Args:
+        inp_path: INP file. Defaults to Rev2.
+        use_cache: Reuse the in-process and on-disk parsed copies.
+    """
+    path = str(inp_path or INP_FILE)
+    if not use_cache:
+        return parse_inp(path)
+    key = make_key("inp", path, PARSER_VERSION)
+    model = _memo.get(key)
+    if model is None:
+        cache = default_cache()
+        model = cache.get(key) if cache is not None else None
+        if model is None:
+            model = parse_inp(path)
+            if cache is not None:
+                cache.put(key, model)
+    if model.path != path:
+        model = replace(model, path=path)      # same bytes under another name
+    _memo[key] = model
+    return model
+
+
+def gpv_phi_pct(curve_id: str) -> float | None:
+    """Opening encoded in a RIKO curve ID ("RIKO_44pct" → 44.0), else None."""
+    m = re.fullmatch(r"RIKO_(\d+(?:\.\d+)?)pct", curve_id)
+    return float(m.group(1)) if m else None
+
@@ -0,0 +1,383 @@
+"""Generate complete EPANET INP files from a structured model spec.
+
+Rev0-Rev3 were hand-edited copies of one another. Here a ModelSpec
+holds everything a revision varies: the pumps and which one is standby,
+the pump and efficiency curves, the RIKO openings (each GPV's headloss
+curve built from the Kv CSV via valve.gpv_curve_points), the pump count
+→ opening assignment that the [RULES] enforce, the number of segments
+P_DS is split into, and [TIMES]/[OPTIONS]/[ENERGY] as the parser's own
+Times/Options/Energy types. build_inp() renders the spec as INP text.
+
+The output is a pure function of the spec (fixed element order and
+number formatting), so equal specs give byte-identical files and their
+cache keys (rosarito.cache) match. Rendering takes about a millisecond.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from rosarito.constants import (
+    EFF_35WX_POINTS,
+    ETA_BEP_PCT,
+    H_PLANT,
+    H_RATED_M,
+    H_RUNOUT_M,
+    H_SEA,
+    H_SHUTOFF_M,
+    PIPE_DN_MM,
+    PIPE_DS_IDS,
+    PIPE_LENGTH_M,
+    PIPE_MINOR_LOSS,
+    PIPE_ROUGHNESS_MM,
+    PUMP_IDS,
+    Q_RATED_LPS,
+    Q_RUNOUT_LPS,
+    RELATIVE_VISCOSITY,
+    RIKO_BY_NPUMPS,
+    RIKO_OPENINGS_ALL,
+    SG,
+    STANDBY_PUMP_ID,
+)
+from rosarito.inp import Energy, Options, Times
+from rosarito.valve import GPV_CURVE_POINTS, gpv_curve_points, kv_at
+
+PUMP_CURVE_ID = "PC_35WX"
+EFFICIENCY_CURVE_ID = "EFF_35WX"
+RIKO_DN_MM = 1800.0
+
+DEFAULT_TIMES = Times(
+    duration_s=24 * 3600,
+    hydraulic_step_s=300,
+    quality_step_s=300,
+    pattern_step_s=3600,
+    report_step_s=1800,
+)
+DEFAULT_OPTIONS = Options(
+    units="LPS",
+    headloss="D-W",
+    specific_gravity=SG,
+    viscosity=RELATIVE_VISCOSITY,
+    trials=200,
+    accuracy=0.0001,
+    values={
+        "UNBALANCED": "CONTINUE 10",
+        "EMITTER EXPONENT": "0.5",
+        "DIFFUSIVITY": "1.0",
+        "TOLERANCE": "0.01",
+    },
+)
+DEFAULT_ENERGY = Energy(global_efficiency_pct=ETA_BEP_PCT, global_price=0.08)
+
+
+# ---------------------------------------------------------------------------
+# Spec
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Everything that varies between generated model revisions.
+
+    The defaults reproduce Rev3 (apart from the GPV curves, which are
+    sampled from the Kv CSV instead of Rev3's 7 hand-picked points).
+
+    Args:
+        phi_pct: RIKO openings, one GPV (RIKO_<phi>) each, in file order.
+        service_phi: {pump count: opening} the rules open for that count;
+                     every value must be in phi_pct.
+        n_ds_segments: P_DS is split into this many equal pipes
+                       (1 → a single P_DS as in Rev2).
+        gpv_q_max_lps: Top of the GPV curves. Defaults to 1.1 × runout
+                       of every pump.
+        kv_csv: Kv CSV for the GPV curves. Defaults to RIKO_CSV.
+        standby_rules: Emit the rules that start the standby pump on a
+                       duty trip (and keep the duty opening meanwhile).
+        energy: Global [ENERGY] values; every pump gets the efficiency
+                curve whatever energy.pump_efficiency says.
+    """
+    title: tuple[str, ...] = ("ROSARITO DESALINATION PLANT - SEAWATER INTAKE SYSTEM",)
+    pump_ids: tuple[str, ...] = tuple(PUMP_IDS)
+    standby_pump_id: str | None = STANDBY_PUMP_ID
+    pump_curve: tuple[tuple[float, float], ...] = (
+        (0.0, H_SHUTOFF_M), (Q_RATED_LPS, H_RATED_M), (Q_RUNOUT_LPS, H_RUNOUT_M),
+    )
+    efficiency_curve: tuple[tuple[float, float], ...] = EFF_35WX_POINTS
+    phi_pct: tuple[float, ...] = tuple(o.phi_pct for o in RIKO_OPENINGS_ALL)
+    service_phi: dict[int, float] = field(
+        default_factory=lambda: {
+            n: o.phi_pct for n, o in sorted(RIKO_BY_NPUMPS.items(), reverse=True)
+        }
+    )
+    n_ds_segments: int = len(PIPE_DS_IDS)
+    h_sea_m: float = H_SEA
+    h_plant_m: float = H_PLANT
+    ds_roughness_mm: float = PIPE_ROUGHNESS_MM[PIPE_DS_IDS[0]]
+    gpv_points: int = GPV_CURVE_POINTS
+    gpv_q_max_lps: float | None = None
+    kv_csv: str | Path | None = None
+    standby_rules: bool = True
+    times: Times = DEFAULT_TIMES
+    options: Options = DEFAULT_OPTIONS
+    energy: Energy = DEFAULT_ENERGY
+
+    def __post_init__(self) -> None:
+        if self.n_ds_segments < 1:
+            raise ValueError(f"n_ds_segments must be >= 1, got {self.n_ds_segments}")
+        if len(set(map(_phi_tag, self.phi_pct))) != len(self.phi_pct):
+            raise ValueError(f"duplicate RIKO openings in {self.phi_pct}")
+        missing = set(self.service_phi.values()) - set(self.phi_pct)
+        if missing:
+            raise ValueError(f"service openings {sorted(missing)} not in phi_pct")
+        if self.standby_pump_id is not None and self.standby_pump_id not in self.pump_ids:
+            raise ValueError(f"standby pump {self.standby_pump_id} not in pump_ids")
+        if max(self.service_phi, default=0) > len(self.duty_pump_ids):
+            raise ValueError("service_phi has more pumps than there are duty pumps")
+
+    @property
+    def duty_pump_ids(self) -> list[str]:
+        return [pid for pid in self.pump_ids if pid != self.standby_pump_id]
+
+    def valve_id(self, phi: float) -> str:
+        return f"RIKO_{_phi_tag(phi)}"
+
+    def curve_id(self, phi: float) -> str:
+        return f"RIKO_{_phi_tag(phi)}pct"
+
+    def with_openings(
+        self, phi_pct, service_phi: dict[int, float] | None = None,
+    ) -> ModelSpec:
+        """Copy with other RIKO openings (service openings kept unless given)."""
+        return replace(
+            self, phi_pct=tuple(phi_pct), service_phi=dict(service_phi or self.service_phi),
+        )
+
+
+def _phi_tag(phi: float) -> str:
+    return f"{float(phi):g}"
+
+
+def _fmt(x: float) -> str:
+    """Shortest round-trip-exact decimal for *x* (deterministic)."""
+    return repr(float(x))
+
+
+def _fmt_time(seconds: int) -> str:
+    h, rem = divmod(int(seconds), 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}"
+
+
+# ---------------------------------------------------------------------------
+# Sections
+# ---------------------------------------------------------------------------
+
+def _ds_chain(spec: ModelSpec) -> tuple[list[str], list[str]]:
+    """(downstream pipe IDs, intermediate junction IDs) for P_DS."""
+    n = spec.n_ds_segments
+    if n == 1:
+        return ["P_DS"], []
+    return [f"P_DS_{i}" for i in range(1, n + 1)], [f"J_DS_{i}" for i in range(1, n)]
+
+
+def _pipes(spec: ModelSpec) -> list[str]:
+    ds_pipes, ds_nodes = _ds_chain(spec)
+    ds_length = sum(PIPE_LENGTH_M[p] for p in PIPE_DS_IDS) / len(ds_pipes)
+    rows = [
+        ("P_INTAKE", "SEA", "J_SUCTION", PIPE_LENGTH_M["P_INTAKE"], PIPE_DN_MM["P_INTAKE"],
+         PIPE_ROUGHNESS_MM["P_INTAKE"], PIPE_MINOR_LOSS["P_INTAKE"]),
+        ("P_US", "J_MANIFOLD", "J_RIKO_IN", PIPE_LENGTH_M["P_US"], PIPE_DN_MM["P_US"],
+         PIPE_ROUGHNESS_MM["P_US"], PIPE_MINOR_LOSS["P_US"]),
+    ]
+    chain = ["J_RIKO_OUT", *ds_nodes, "PLANT"]
+    for pid, n1, n2 in zip(ds_pipes, chain[:-1], chain[1:]):
+        rows.append((pid, n1, n2, ds_length, PIPE_DN_MM[PIPE_DS_IDS[0]], spec.ds_roughness_mm, 0.0))
+    return [
+        f" {pid:<12} {n1:<12} {n2:<12} {_fmt(length)} {_fmt(dn)} {_fmt(rough)} {_fmt(minor)} OPEN"
+        for pid, n1, n2, length, dn, rough, minor in rows
+    ]
+
+
+def _status(spec: ModelSpec) -> list[str]:
+    lines = []
+    if spec.standby_pump_id is not None:
+        lines.append(f" {spec.standby_pump_id:<12} CLOSED")
+    open_phi = spec.service_phi.get(len(spec.duty_pump_ids))
+    for phi in spec.phi_pct:
+        if open_phi is None or _phi_tag(phi) != _phi_tag(open_phi):
+            lines.append(f" {spec.valve_id(phi):<12} CLOSED")
+    return lines
+
+
+def _curves(spec: ModelSpec) -> list[str]:
+    lines = [f" {PUMP_CURVE_ID:<14} {_fmt(q)} {_fmt(h)}" for q, h in spec.pump_curve]
+    lines += [f" {EFFICIENCY_CURVE_ID:<14} {_fmt(q)} {_fmt(e)}" for q, e in spec.efficiency_curve]
+    q_max = spec.gpv_q_max_lps or 1.1 * len(spec.pump_ids) * spec.pump_curve[-1][0]
+    for phi in spec.phi_pct:
+        kv = float(kv_at(phi, spec.kv_csv))
+        cid = spec.curve_id(phi)
+        lines.append(f" ;Kv = {kv:.2f} m3/h at phi = {_phi_tag(phi)}%")
+        lines += [
+            f" {cid:<14} {q:.4f} {dh:.6f}"
+            for q, dh in gpv_curve_points(kv, q_max, spec.gpv_points)
+        ]
+    return lines
+
+
+def _pump_clauses(keyword_first: str, states: dict[str, str]) -> list[str]:
+    return [
+        f"{keyword_first if i == 0 else 'AND'} LINK {pid} STATUS = {state}"
+        for i, (pid, state) in enumerate(states.items())
+    ]
+
+
+def _rule(
+    rule_id: str, premises: dict[str, str], actions: dict[str, str], priority: int,
+) -> list[str]:
+    return [
+        f"RULE {rule_id}",
+        *_pump_clauses("IF", premises),
+        *_pump_clauses("THEN", actions),
+        f"PRIORITY {priority}",
+        "",
+    ]
+
+
+def _rules(spec: ModelSpec) -> list[str]:
+    duty = spec.duty_pump_ids
+    standby = spec.standby_pump_id
+    n_duty = len(duty)
+    lines: list[str] = []
+
+    def valve_actions(phi: float) -> dict[str, str]:
+        actions = {spec.valve_id(phi): "OPEN"}
+        actions.update({
+            spec.valve_id(p): "CLOSED" for p in spec.phi_pct if _phi_tag(p) != _phi_tag(phi)
+        })
+        return actions
+
+    def states(on: set[str]) -> dict[str, str]:
+        return {pid: "OPEN" if pid in on else "CLOSED" for pid in spec.pump_ids}
+
+    for n, phi in spec.service_phi.items():
+        lines += _rule(f"R_{n}P_VALVE", states(set(duty[:n])), valve_actions(phi), n)
+        if n == n_duty and standby is not None and spec.standby_rules:
+            for k, pid in enumerate(duty, start=1):
+                on = set(duty) - {pid} | {standby}
+                lines += _rule(f"R_{n}P_STBY_P{k}_VALVE", states(on), valve_actions(phi), n)
+    if standby is not None and spec.standby_rules:
+        for k, pid in enumerate(duty, start=1):
+            lines += _rule(f"R_STBY_ON_P{k}", states(set(duty) - {pid}), {standby: "OPEN"}, 10)
+        lines += _rule("R_STBY_OFF", states(set(spec.pump_ids)), {standby: "CLOSED"}, 5)
+    return lines
+
+
+def _times(t: Times) -> list[str]:
+    rows = [
+        ("Duration", t.duration_s),
+        ("Hydraulic Timestep", t.hydraulic_step_s),
+        ("Quality Timestep", t.quality_step_s),
+        ("Pattern Timestep", t.pattern_step_s),
+        ("Pattern Start", t.pattern_start_s),
+        ("Report Timestep", t.report_step_s),
+        ("Report Start", t.report_start_s),
+        ("Start ClockTime", t.start_clocktime_s),
+    ]
+    if t.rule_step_s is not None:
+        rows.append(("Rule Timestep", t.rule_step_s))
+    lines = [f" {key:<20} {_fmt_time(value)}" for key, value in rows]
+    return lines + [f" {'Statistic':<20} {t.statistic}"]
+
+
+def _energy(spec: ModelSpec) -> list[str]:
+    e = spec.energy
+    lines = [
+        f" Global Efficiency   {_fmt(e.global_efficiency_pct)}",
+        f" Global Price        {_fmt(e.global_price)}",
+    ]
+    if e.global_pattern is not None:
+        lines.append(f" Global Pattern      {e.global_pattern}")
+    lines.append(f" Demand Charge       {_fmt(e.demand_charge)}")
+    for pid in spec.pump_ids:
+        lines.append(f" Pump {pid:<14} Efficiency {EFFICIENCY_CURVE_ID}")
+        if pid in e.pump_price:
+            lines.append(f" Pump {pid:<14} Price {_fmt(e.pump_price[pid])}")
+        if pid in e.pump_pattern:
+            lines.append(f" Pump {pid:<14} Pattern {e.pump_pattern[pid]}")
+    return lines
+
+
+def _options(o: Options) -> list[str]:
+    typed = {
+        "UNITS": o.units,
+        "HEADLOSS": o.headloss,
+        "SPECIFIC GRAVITY": _fmt(o.specific_gravity),
+        "VISCOSITY": _fmt(o.viscosity),
+        "TRIALS": str(o.trials),
+        "ACCURACY": _fmt(o.accuracy),
+        "DEMAND MULTIPLIER": _fmt(o.demand_multiplier),
+        "QUALITY": o.quality,
+    }
+    extra = {k: v for k, v in o.values.items() if k not in typed}
+    return [f" {key.title():<20} {value}" for key, value in {**typed, **extra}.items()]
+
+
+def _coordinates(spec: ModelSpec) -> list[str]:
+    _, ds_nodes = _ds_chain(spec)
+    nodes = ["SEA", "J_SUCTION", "J_MANIFOLD", "J_RIKO_IN", "J_RIKO_OUT", *ds_nodes, "PLANT"]
+    return [f" {nid:<14} {100 * i} 0" for i, nid in enumerate(nodes)]
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def build_inp(spec: ModelSpec | None = None) -> str:
+    """INP text for *spec* (defaults to the Rev3 layout)."""
+    spec = spec or ModelSpec()
+    _, ds_nodes = _ds_chain(spec)
+    junctions = ["J_SUCTION", "J_MANIFOLD", "J_RIKO_IN", "J_RIKO_OUT", *ds_nodes]
+    sections: list[tuple[str, list[str]]] = [
+        ("TITLE", [f";{line}" if line else ";" for line in spec.title]),
+        ("JUNCTIONS", [f" {jid:<12} 0 0" for jid in junctions]),
+        ("RESERVOIRS", [
+            f" SEA          {_fmt(spec.h_sea_m)}", f" PLANT        {_fmt(spec.h_plant_m)}",
+        ]),
+        ("PIPES", _pipes(spec)),
+        ("PUMPS", [
+            f" {pid:<12} J_SUCTION    J_MANIFOLD   HEAD {PUMP_CURVE_ID}" for pid in spec.pump_ids
+        ]),
+        ("VALVES", [
+            f" {spec.valve_id(phi):<12} J_RIKO_IN    J_RIKO_OUT   {_fmt(RIKO_DN_MM)} GPV "
+            f"{spec.curve_id(phi)} 0"
+            for phi in spec.phi_pct
+        ]),
+        ("STATUS", _status(spec)),
+        ("PATTERNS", []),
+        ("CURVES", _curves(spec)),
+        ("CONTROLS", []),
+        ("RULES", _rules(spec)),
+        ("ENERGY", _energy(spec)),
+        ("TIMES", _times(spec.times)),
+        ("OPTIONS", _options(spec.options)),
+        ("COORDINATES", _coordinates(spec)),
+    ]
+    out: list[str] = []
+    for name, lines in sections:
+        out += [f"[{name}]", *lines, ""]
+    out.append("[END]")
+    return "\n".join(out) + "\n"
+
+
+def write_inp(spec: ModelSpec | None, path: str | Path) -> Path:
+    """Write build_inp(*spec*) to *path*; unchanged files are not rewritten.
+
+    Leaving identical files untouched keeps their mtime, so the digest
+    memo and every cache entry keyed on the file stay warm across sweeps.
+    """
+    path = Path(path)
+    text = build_inp(spec)
+    if not path.exists() or path.read_text(encoding="utf-8") != text:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return path
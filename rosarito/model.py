@@ -6,10 +6,12 @@ to pumps, valves, pipes, and nodes by their engineering IDs.
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from epyt import epanet
+import numpy as np
 
 from rosarito.constants import (
     INP_FILE,
@@ -20,6 +22,9 @@ from rosarito.constants import (
     RESERVOIR_IDS,
 )
 
+if TYPE_CHECKING:
+    from epyt import epanet
+
 
 @dataclass
 class SteadyStateResult:
@@ -38,14 +43,128 @@ class SteadyStateResult:
     pipe_headlosses: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+class ColumnView(Mapping[str, np.ndarray]):
+    """Read-only ID → 1-D column view over a 2-D (n_steps, n_cols) array.
+
+    Lets ``eps.flows["P_DS"][i]`` keep working on the columnar layout
+    without copying any data.
+    """
+
+    def __init__(self, data: np.ndarray, cols: dict[str, int]):
+        self._data = data
+        self._cols = cols
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._data[:, self._cols[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cols)
+
+    def __len__(self) -> int:
+        return len(self._cols)
+
+
+@dataclass(eq=False)
 class EPSResult:
-    """Time-series results from an extended period simulation."""
-    time_s: list[float]
-    flows: dict[str, list[float]]       # link_id → [flow at each timestep]
-    heads: dict[str, list[float]]       # node_id → [head at each timestep]
-    velocities: dict[str, list[float]]  # link_id → [velocity at each timestep]
-    statuses: dict[str, list[int]]      # link_id → [status at each timestep]
+    """Columnar time-series results from an extended period simulation.
+
+    Each quantity is one contiguous (n_steps, n_cols) array. Columns are
+    found through the ID → column maps; an alias (e.g. P_DS → P_DS_1 in
+    Rev3) simply maps to the same column.
+    """
+    time_s: np.ndarray                  # (n_steps,) simulation time, s
+    link_flow: np.ndarray               # (n_steps, n_links) l/s, float64/32
+    link_velocity: np.ndarray           # (n_steps, n_links) m/s, float64/32
+    link_status: np.ndarray             # (n_steps, n_links) int8, 0 = closed
+    node_head: np.ndarray               # (n_steps, n_nodes) m, float64/32
+    link_cols: dict[str, int]           # link_id → column
+    node_cols: dict[str, int]           # node_id → column
+
+    # --- Per-ID compatibility accessors (column views, no copies) ---
+
+    @property
+    def flows(self) -> ColumnView:
+        return ColumnView(self.link_flow, self.link_cols)
+
+    @property
+    def velocities(self) -> ColumnView:
+        return ColumnView(self.link_velocity, self.link_cols)
+
+    @property
+    def statuses(self) -> ColumnView:
+        return ColumnView(self.link_status, self.link_cols)
+
+    @property
+    def heads(self) -> ColumnView:
+        return ColumnView(self.node_head, self.node_cols)
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.time_s)
+
+    def window(self, start_h: float, end_h: float) -> EPSResult:
+        """Steps with start_h <= t <= end_h, as views (no copy, stays lazy)."""
+        lo = np.searchsorted(self.time_s, start_h * 3600.0, side="left")
+        hi = np.searchsorted(self.time_s, end_h * 3600.0, side="right")
+        rows = slice(int(lo), int(hi))
+        return EPSResult(
+            time_s=self.time_s[rows],
+            link_flow=self.link_flow[rows],
+            link_velocity=self.link_velocity[rows],
+            link_status=self.link_status[rows],
+            node_head=self.node_head[rows],
+            link_cols=self.link_cols,
+            node_cols=self.node_cols,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EPSResult):
+            return NotImplemented
+        return (
+            self.link_cols == other.link_cols
+            and self.node_cols == other.node_cols
+            and all(
+                np.array_equal(getattr(self, name), getattr(other, name))
+                and getattr(self, name).dtype == getattr(other, name).dtype
+                for name in _EPS_ARRAYS
+            )
+        )
+
+
+_EPS_ARRAYS = ("time_s", "link_flow", "link_velocity", "link_status", "node_head")
+
+
+@dataclass
+class EPSStep:
+    """Tracked values at one hydraulic step (one row of an EPSResult).
+
+    The ID → column maps are shared between all steps of a stream.
+    """
+    time_s: float
+    link_flow: np.ndarray               # (n_links,) l/s
+    link_velocity: np.ndarray           # (n_links,) m/s
+    link_status: np.ndarray             # (n_links,) int8, 0 = closed
+    node_head: np.ndarray               # (n_nodes,) m
+    link_cols: dict[str, int]
+    node_cols: dict[str, int]
+
+    def flow(self, link_id: str) -> float:
+        return float(self.link_flow[self.link_cols[link_id]])
+
+    def status(self, link_id: str) -> int:
+        return int(self.link_status[self.link_cols[link_id]])
+
+    def head(self, node_id: str) -> float:
+        return float(self.node_head[self.node_cols[node_id]])
+
+
+@dataclass
+class HydraulicSnapshot:
+    """Link/node results of one solve, shaped (1, n) like EPyT time series."""
+    Flow: np.ndarray
+    Velocity: np.ndarray
+    HeadLoss: np.ndarray
+    Head: np.ndarray
 
 
 class RosaritoModel:
@@ -59,7 +178,7 @@ class RosaritoModel:
 
     def load(self) -> epanet:
         """Load the INP file and build name→index maps. Returns the epanet object."""
-        self._d = epanet(self.inp_path)
+        self._d = load_epanet(self.inp_path)
         self._build_index_maps()
         return self._d
 
@@ -82,6 +201,8 @@ class RosaritoModel:
         if self._d is not None:
             self._d.unload()
             self._d = None
+            self._link_name_to_idx.clear()
+            self._node_name_to_idx.clear()
 
     def __enter__(self) -> RosaritoModel:
         self.load()
@@ -92,6 +213,16 @@ class RosaritoModel:
 
     # --- Index accessors ---
 
+    @property
+    def link_indices(self) -> dict[str, int]:
+        """Link ID → 1-based EPANET index (empty until loaded)."""
+        return self._link_name_to_idx
+
+    @property
+    def node_indices(self) -> dict[str, int]:
+        """Node ID → 1-based EPANET index (empty until loaded)."""
+        return self._node_name_to_idx
+
     def link_index(self, link_id: str) -> int:
         return self._link_name_to_idx[link_id]
 
@@ -106,3 +237,62 @@ class RosaritoModel:
 
     def pipe_index(self, pipe_id: str) -> int:
         return self.link_index(pipe_id)
+
+    # --- Snapshot solver ---
+
+    def open_hydraulics(self) -> None:
+        """Open the hydraulic solver for repeated solve_snapshot() calls."""
+        self.d.openHydraulicAnalysis()
+
+    def close_hydraulics(self) -> None:
+        self.d.closeHydraulicAnalysis()
+
+    def solve_snapshot(self, warm_start: bool = False) -> int:
+        """Solve the current configuration at t=0; return the trial count."""
+        return solve_snapshot(self.d, warm_start)
+
+    def read_snapshot(self) -> HydraulicSnapshot:
+        """Read flow, velocity, headloss and head of the last solve."""
+        return read_snapshot(self.d)
+
+
+# ---------------------------------------------------------------------------
+# Toolkit step helpers (work on any loaded epanet object)
+# ---------------------------------------------------------------------------
+
+def load_epanet(inp_path: str) -> epanet:
+    """Load *inp_path* into a new EPyT project.
+
+    EPyT (and the matplotlib/pandas it pulls in) is imported here rather
+    than at module level, so importing the result types and helpers of
+    this package does not pay for loading the toolkit.
+    """
+    from epyt import epanet
+
+    return epanet(inp_path)
+
+
+def solve_snapshot(d: epanet, warm_start: bool = False) -> int:
+    """Initialise and solve one hydraulic period; return the trial count.
+
+    The hydraulic solver must already be open. With *warm_start* the
+    solver is initialised without resetting link flows, so Newton
+    iteration starts from the previous solution (EPANET still re-seeds
+    links that were closed). Otherwise flows are re-initialised as on a
+    fresh run.
+    """
+    flag = 0 if warm_start else d.ToolkitConstants.EN_INITFLOW
+    d.initializeHydraulicAnalysis(flag)
+    d.runHydraulicAnalysis()
+    return int(d.getStatisticIterations())
+
+
+def read_snapshot(d: epanet) -> HydraulicSnapshot:
+    """Read flow, velocity, headloss and head at the current solver time."""
+    api, c = d.api, d.ToolkitConstants
+    return HydraulicSnapshot(
+        Flow=np.atleast_2d(api.ENgetlinkvalues(c.EN_FLOW)),
+        Velocity=np.atleast_2d(api.ENgetlinkvalues(c.EN_VELOCITY)),
+        HeadLoss=np.atleast_2d(api.ENgetlinkvalues(c.EN_HEADLOSS)),
+        Head=np.atleast_2d(api.ENgetnodevalues(c.EN_HEAD)),
+    )
@@ -3,18 +3,43 @@
 Compares fixed-speed pump + throttling valve vs variable-frequency drive (VFD)
 operating the pump at reduced speed. Uses affinity laws:
   Q ~ N/N_rated,  H ~ (N/N_rated)^2,  P ~ (N/N_rated)^3
+
+The speed is found exactly on the affinity-scaled PC_35WX curve
+(surrogate.PumpCurve), not by scaling the throttled head. VFDTable
+precomputes the valve-free operating points over a grid of speeds and
+pump counts for fast speed/flow/power lookup.
+
+search_vfd_valve_grid() solves every (pump count, speed, RIKO opening)
+combination and keeps the Pareto front of shaft power, delivered flow
+and RIKO control margin (see pareto_mask).
 """
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+import numpy as np
+
 from rosarito.constants import (
     RHO_SEAWATER,
     G,
     ETA_DUTY_PCT,
+    H_PLANT,
+    H_SEA,
+    N_TOTAL_PUMPS,
+    Q_MIN_STABLE_LPS,
+    RIKO_CONTROL_MAX_PCT,
+    RIKO_CONTROL_MIN_PCT,
+    VAG_QMAX_M3H,
+    VAG_QMIN_M3H,
     ReferenceOperatingPoint,
+    lps_to_m3h,
 )
+from rosarito.energy import EfficiencyCurve
+from rosarito.surrogate import PumpCurve, SeriesNetwork, solve_operating_points
+from rosarito.valve import kv_at, load_riko_kv
 
 
 @dataclass
@@ -36,45 +61,55 @@ class VFDResult:
     saving_per_pump_kw: float
     saving_total_kw: float
     saving_pct: float
+    # Efficiencies used for the two shaft powers
+    eta_throttled_pct: float = ETA_DUTY_PCT
+    eta_vfd_pct: float = ETA_DUTY_PCT
 
 
 def compute_vfd_comparison(
     ref: ReferenceOperatingPoint,
     eta_pct: float = ETA_DUTY_PCT,
+    pump: PumpCurve | None = None,
+    efficiency: EfficiencyCurve | None = None,
 ) -> VFDResult:
     """Compare throttled vs VFD operation at one operating point.
 
     Without the RIKO valve, the pump only needs to overcome:
         H_required = H_pump - dH_RIKO
-    Using the simple affinity law approximation (valid near BEP):
-        speed_ratio = sqrt(H_required / H_pump)
+    at the same flow. The speed ratio is the exact root of the
+    affinity-scaled pump curve through (Q/pump, H_required); the old
+    sqrt(H_required / H_pump) shortcut assumes the throttled and VFD
+    points are homologous, which only holds near BEP.
 
     Args:
         ref: Reference operating point with pump head and RIKO headloss.
-        eta_pct: Pump efficiency in %.
+        eta_pct: Pump efficiency in %, used when *efficiency* is None.
+        pump: Rated-speed pump curve. Defaults to PC_35WX.
+        efficiency: Efficiency curve; the VFD point reads it at the
+                    homologous rated-speed flow Q/speed_ratio.
     """
+    pump = pump or SeriesNetwork.default().pump
     q_per_pump = ref.q_total_lps / ref.n_pumps
 
-    # --- Throttled shaft power per pump ---
-    q_m3s = q_per_pump / 1000.0
-    p_hyd_throttled = RHO_SEAWATER * G * q_m3s * ref.h_pump_m / 1000.0
-    p_shaft_throttled = p_hyd_throttled / (eta_pct / 100.0)
-
     # --- H_required without valve = H_pump - dH_RIKO ---
     h_required = ref.h_pump_m - ref.dh_riko_m
-
-    # --- Affinity law: speed ratio = sqrt(H_required / H_pump) ---
-    # At rated speed, the pump delivers (q_per_pump, h_pump_m).
-    # At speed ratio r, the same dimensionless point maps to
-    # (q_per_pump*r, h_pump_m*r^2).
-    # We want to find r such that at flow q_per_pump the pump delivers h_required.
-    # Simple approximation (valid when operating near BEP):
-    speed_ratio = (h_required / ref.h_pump_m) ** 0.5
+    speed_ratio = float(pump.speed_for(q_per_pump, h_required))
     h_pump_vfd = h_required
 
+    if efficiency is None:
+        eta_throttled = eta_vfd = eta_pct
+    else:
+        eta_throttled = float(efficiency.eta_at(q_per_pump))
+        eta_vfd = float(efficiency.eta_at(q_per_pump / speed_ratio))
+
+    # --- Throttled shaft power per pump ---
+    q_m3s = q_per_pump / 1000.0
+    p_hyd_throttled = RHO_SEAWATER * G * q_m3s * ref.h_pump_m / 1000.0
+    p_shaft_throttled = p_hyd_throttled / (eta_throttled / 100.0)
+
     # --- VFD shaft power: P_hyd_vfd = rho * g * Q * H_required / 1000 ---
     p_hyd_vfd = RHO_SEAWATER * G * q_m3s * h_required / 1000.0
-    p_shaft_vfd = p_hyd_vfd / (eta_pct / 100.0)
+    p_shaft_vfd = p_hyd_vfd / (eta_vfd / 100.0)
 
     saving_per_pump = p_shaft_throttled - p_shaft_vfd
     saving_total = saving_per_pump * ref.n_pumps
@@ -97,4 +132,319 @@ def compute_vfd_comparison(
         saving_per_pump_kw=saving_per_pump,
         saving_total_kw=saving_total,
         saving_pct=saving_pct,
+        eta_throttled_pct=eta_throttled,
+        eta_vfd_pct=eta_vfd,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Valve-free operating-point table
+# ---------------------------------------------------------------------------
+
+DEFAULT_VFD_SPEEDS = np.round(np.arange(0.50, 1.0001, 0.005), 3)
+
+
+@dataclass
+class VFDTable:
+    """Valve-free operating points on a (pump count × speed) grid.
+
+    Flow rises monotonically with speed for each pump count, so the
+    speed for a target flow is a 1-D interpolation per row.
+    """
+    n_pumps: np.ndarray         # (k,)
+    speeds: np.ndarray          # (m,) ascending
+    q_total_lps: np.ndarray     # (k, m)
+    h_pump_m: np.ndarray        # (k, m)
+    p_shaft_kw: np.ndarray      # (k, m) total shaft power
+    h_plant_m: float
+    h_sea_m: float
+
+    def _row(self, n: int) -> int:
+        rows = np.flatnonzero(self.n_pumps == n)
+        if not rows.size:
+            raise ValueError(f"no table row for {n} pumps")
+        return int(rows[0])
+
+    def speed_for_flow(self, n_pumps, q_total_lps) -> np.ndarray:
+        """Speed ratio delivering *q_total_lps* with *n_pumps* running.
+
+        NaN where the flow is outside the table's speed range.
+        """
+        n, q = np.broadcast_arrays(np.asarray(n_pumps), np.asarray(q_total_lps, dtype=float))
+        out = np.full(q.shape, np.nan)
+        for k in np.unique(n):
+            row, mask = self._row(int(k)), n == k
+            out[mask] = np.interp(
+                q[mask], self.q_total_lps[row], self.speeds, left=np.nan, right=np.nan,
+            )
+        return out
+
+    def at_speed(self, n_pumps, speed_ratio) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(Q_total, H_pump, P_shaft total) interpolated at *speed_ratio*."""
+        n, s = np.broadcast_arrays(np.asarray(n_pumps), np.asarray(speed_ratio, dtype=float))
+        q, h, p = (np.full(s.shape, np.nan) for _ in range(3))
+        for k in np.unique(n):
+            row, mask = self._row(int(k)), n == k
+            for out, table in ((q, self.q_total_lps), (h, self.h_pump_m), (p, self.p_shaft_kw)):
+                out[mask] = np.interp(s[mask], self.speeds, table[row], left=np.nan, right=np.nan)
+        return q, h, p
+
+    def flow_range(self, n_pumps: int) -> tuple[float, float]:
+        """(min, max) valve-free flow over the speed grid."""
+        row = self._row(n_pumps)
+        return float(self.q_total_lps[row, 0]), float(self.q_total_lps[row, -1])
+
+
+def build_vfd_table(
+    n_pumps: Sequence[int] = tuple(range(1, N_TOTAL_PUMPS + 1)),
+    speeds: Sequence[float] = DEFAULT_VFD_SPEEDS,
+    h_plant_m: float = H_PLANT,
+    h_sea_m: float = H_SEA,
+    network: SeriesNetwork | None = None,
+    efficiency: EfficiencyCurve | None = None,
+    eta_pct: float = ETA_DUTY_PCT,
+    kv_m3h: float = np.inf,
+) -> VFDTable:
+    """Solve the valve-free system at every (pump count, speed) in one call.
+
+    Args:
+        n_pumps: Pump counts (table rows).
+        speeds: Speed ratios (table columns), ascending.
+        h_plant_m: Plant forebay head.
+        h_sea_m: Sea level.
+        kv_m3h: RIKO Kv left in the line (e.g. fully open); inf = no valve.
+        network: Series path. Defaults to SeriesNetwork.default().
+        efficiency: Efficiency curve, read at the homologous flow q/speed.
+                    Constant *eta_pct* if None.
+        eta_pct: Constant pump efficiency.
+    """
+    n = np.asarray(n_pumps, dtype=float)[:, None]
+    s = np.asarray(speeds, dtype=float)[None, :]
+    if np.any(np.diff(s[0]) <= 0):
+        raise ValueError("speeds must be strictly ascending")
+    r = solve_operating_points(
+        n, kv_m3h, h_plant_m, h_sea_m, network=network, friction="swamee-jain", speed_ratio=s,
+    )
+    q_pump = r.q_per_pump_lps
+    if efficiency is None:
+        eta = np.full(q_pump.shape, float(eta_pct))
+    else:
+        eta = efficiency.eta_at(q_pump / s)
+    p_hyd = RHO_SEAWATER * G * (q_pump / 1000.0) * r.h_pump_m / 1000.0
+    return VFDTable(
+        n_pumps=np.asarray(n_pumps, dtype=int),
+        speeds=s[0].copy(),
+        q_total_lps=r.q_total_lps,
+        h_pump_m=r.h_pump_m,
+        p_shaft_kw=n * p_hyd / (eta / 100.0),
+        h_plant_m=h_plant_m,
+        h_sea_m=h_sea_m,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Pareto front
+# ---------------------------------------------------------------------------
+
+def pareto_mask(objectives) -> np.ndarray:
+    """Non-dominated rows of *objectives* (n, 2 or 3), all minimised.
+
+    A row is dominated if another is no worse in every column and better
+    in at least one; identical rows do not dominate each other. After a
+    lexicographic sort, earlier rows are the only candidate dominators, so
+    one sweep suffices: for 3 objectives it keeps the (2nd, 3rd) staircase
+    of the front so far, sorted for bisection (Kung et al.). That is
+    O(n log n) comparisons, but the staircase is a plain list, so its
+    splices make the worst case O(n²) list updates (memmoves of floats,
+    cheap at grid-search sizes).
+    """
+    obj = np.asarray(objectives, dtype=float)
+    if obj.ndim != 2 or obj.shape[1] not in (2, 3):
+        raise ValueError(f"objectives must be (n, 2) or (n, 3), got {obj.shape}")
+    if np.isnan(obj).any():
+        raise ValueError("objectives contain NaN")
+    if obj.shape[1] == 2:
+        obj = np.column_stack([obj, np.zeros(len(obj))])
+    unique, inverse = np.unique(obj, axis=0, return_inverse=True)
+
+    keep = np.zeros(len(unique), dtype=bool)
+    ys: list[float] = []    # ascending
+    zs: list[float] = []    # strictly descending
+    for k, (_, y, z) in enumerate(unique):      # np.unique sorts lexicographically
+        i = bisect_right(ys, y)
+        if i and zs[i - 1] <= z:
+            continue
+        keep[k] = True
+        lo = bisect_left(ys, y)
+        hi = lo
+        while hi < len(zs) and zs[hi] >= z:
+            hi += 1
+        ys[lo:hi] = [y]
+        zs[lo:hi] = [z]
+    return keep[np.ravel(inverse)]
+
+
+# ---------------------------------------------------------------------------
+# Pump count × speed × RIKO opening grid
+# ---------------------------------------------------------------------------
+
+DEFAULT_GRID_SPEEDS = np.round(np.arange(0.60, 1.0001, 0.01), 3)
+
+
+def riko_control_margin(phi_pct) -> np.ndarray:
+    """Travel (% points) to the nearer end of the RIKO control range."""
+    phi = np.asarray(phi_pct, dtype=float)
+    return np.minimum(phi - RIKO_CONTROL_MIN_PCT, RIKO_CONTROL_MAX_PCT - phi)
+
+
+@dataclass(frozen=True)
+class GridPoint:
+    """One solved (pump count, speed, RIKO opening) combination."""
+    n_pumps: int
+    speed_ratio: float
+    phi_pct: float
+    q_total_lps: float
+    h_pump_m: float
+    dh_riko_m: float
+    p_shaft_kw: float       # total shaft power
+    margin_pct: float       # RIKO control margin
+
+    @property
+    def specific_energy_kwh_m3(self) -> float:
+        return self.p_shaft_kw / (self.q_total_lps * 3.6) if self.q_total_lps else np.inf
+
+
+@dataclass
+class GridSearchResult:
+    """Flat arrays over the whole grid plus the Pareto front indices."""
+    n_pumps: np.ndarray
+    speed_ratio: np.ndarray
+    phi_pct: np.ndarray
+    q_total_lps: np.ndarray
+    h_pump_m: np.ndarray
+    dh_riko_m: np.ndarray
+    p_shaft_kw: np.ndarray
+    margin_pct: np.ndarray
+    feasible: np.ndarray
+    front: np.ndarray           # indices of non-dominated feasible points, by power
+
+    def __len__(self) -> int:
+        return len(self.q_total_lps)
+
+    def point(self, i: int) -> GridPoint:
+        return GridPoint(
+            n_pumps=int(self.n_pumps[i]),
+            speed_ratio=float(self.speed_ratio[i]),
+            phi_pct=float(self.phi_pct[i]),
+            q_total_lps=float(self.q_total_lps[i]),
+            h_pump_m=float(self.h_pump_m[i]),
+            dh_riko_m=float(self.dh_riko_m[i]),
+            p_shaft_kw=float(self.p_shaft_kw[i]),
+            margin_pct=float(self.margin_pct[i]),
+        )
+
+    def pareto_points(self) -> list[GridPoint]:
+        return [self.point(int(i)) for i in self.front]
+
+    def cheapest_for_flow(self, q_total_lps: float, min_margin_pct: float = 0.0) -> GridPoint:
+        """Lowest-power front point delivering at least *q_total_lps*."""
+        f = self.front
+        ok = (self.q_total_lps[f] >= q_total_lps) & (self.margin_pct[f] >= min_margin_pct)
+        if not ok.any():
+            raise ValueError(
+                f"no feasible point delivers {q_total_lps:g} l/s "
+                f"with a margin of {min_margin_pct:g}%"
+            )
+        return self.point(int(f[ok][np.argmin(self.p_shaft_kw[f][ok])]))
+
+
+def search_vfd_valve_grid(
+    n_pumps: Sequence[int] = tuple(range(1, N_TOTAL_PUMPS + 1)),
+    speeds: Sequence[float] = DEFAULT_GRID_SPEEDS,
+    phi_pct: Sequence[float] | None = None,
+    h_plant_m: float = H_PLANT,
+    h_sea_m: float = H_SEA,
+    network: SeriesNetwork | None = None,
+    efficiency: EfficiencyCurve | None = None,
+    eta_pct: float = ETA_DUTY_PCT,
+    batch_size: int = 8192,
+) -> GridSearchResult:
+    """Solve every pump count × speed × RIKO opening and find the trade-off front.
+
+    Each point is the exact intersection of the affinity-scaled PC_35WX
+    curve with the system curve through the RIKO Kv at that opening.
+    Points are solved *batch_size* at a time to bound memory. The front
+    minimises shaft power and maximises delivered flow and RIKO control
+    margin over the feasible points: converged, per-pump flow at least
+    Q_MIN_STABLE_LPS and total flow inside the VAG sizing range.
+
+    Args:
+        n_pumps: Pump counts.
+        speeds: Speed ratios.
+        phi_pct: RIKO openings. Defaults to the Kv CSV rows inside the
+                 control range.
+        h_plant_m: Plant forebay head.
+        h_sea_m: Sea level.
+        network: Series path. Defaults to SeriesNetwork.default().
+        efficiency: Efficiency curve, read at the homologous flow q/speed.
+                    Constant *eta_pct* if None.
+        eta_pct: Constant pump efficiency.
+        batch_size: Grid points per solver call.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    if phi_pct is None:
+        phi_tab, _ = load_riko_kv()
+        phi_pct = phi_tab[phi_tab >= RIKO_CONTROL_MIN_PCT]
+    grid = np.meshgrid(
+        np.asarray(n_pumps, dtype=float),
+        np.asarray(speeds, dtype=float),
+        np.asarray(phi_pct, dtype=float),
+        indexing="ij",
+    )
+    n, s, phi = (g.ravel() for g in grid)
+    kv = kv_at(phi)
+
+    q = np.empty(n.size)
+    h = np.empty(n.size)
+    dh = np.empty(n.size)
+    converged = np.empty(n.size, dtype=bool)
+    for lo in range(0, n.size, batch_size):
+        sl = slice(lo, lo + batch_size)
+        r = solve_operating_points(
+            n[sl], kv[sl], h_plant_m, h_sea_m,
+            network=network, friction="swamee-jain", speed_ratio=s[sl],
+        )
+        q[sl], h[sl], dh[sl], converged[sl] = r.q_total_lps, r.h_pump_m, r.dh_riko_m, r.converged
+
+    q_pump = q / n
+    if efficiency is None:
+        eta = np.full(n.size, float(eta_pct))
+    else:
+        eta = efficiency.eta_at(q_pump / s)
+    p_shaft = n * RHO_SEAWATER * G * (q_pump / 1000.0) * h / 1000.0 / (eta / 100.0)
+    margin = riko_control_margin(phi)
+    q_m3h = lps_to_m3h(q)
+    feasible = (
+        converged
+        & (q_pump >= Q_MIN_STABLE_LPS)
+        & (q_m3h >= VAG_QMIN_M3H)
+        & (q_m3h <= VAG_QMAX_M3H)
+    )
+
+    idx = np.flatnonzero(feasible)
+    on_front = pareto_mask(np.column_stack([p_shaft[idx], -q[idx], -margin[idx]]))
+    front = idx[on_front]
+    front = front[np.argsort(p_shaft[front], kind="stable")]
+    return GridSearchResult(
+        n_pumps=n.astype(int),
+        speed_ratio=s,
+        phi_pct=phi,
+        q_total_lps=q,
+        h_pump_m=h,
+        dh_riko_m=dh,
+        p_shaft_kw=p_shaft,
+        margin_pct=margin,
+        feasible=feasible,
+        front=front,
     )
@@ -0,0 +1,227 @@
+"""Memoized analysis pipeline shared by main.py, report.py and report.qmd.
+
+The standard analyses form a small dependency graph:
+
+    staging ─┬─ energy ─────┬─ tables
+             └─ validation ─┤
+    eps ────────────────────┴─ figures
+
+An AnalysisPipeline computes each stage at most once, however many
+consumers ask for it, so a full run solves every scenario exactly once.
+Solver stages (those that load EPANET) have no dependencies and run
+concurrently when more than one is pending: the first in this process,
+the others in worker processes on a private copy of the INP (EPyT writes
+scratch files next to the input file, see scenarios._init_worker).
+Everything else runs here as soon as its inputs exist.
+
+Stage functions import their modules when called, so building a
+pipeline costs nothing and only the stages asked for load EPyT, pandas
+or matplotlib.
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from rosarito.constants import INP_FILE
+
+DEFAULT_STAGES = ("staging", "energy", "validation", "eps")
+
+
+@dataclass(frozen=True)
+class SolverArgs:
+    """Inputs of a solver stage."""
+    inp_path: str
+    use_cache: bool
+    jobs: int = 1
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the pipeline.
+
+    A solver stage is called as func(SolverArgs); any other stage as
+    func(*results of deps).
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+    solver: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Stage functions
+# ---------------------------------------------------------------------------
+
+def _staging(args: SolverArgs):
+    from rosarito.scenarios import run_staging_scenarios
+
+    return run_staging_scenarios(args.inp_path, workers=args.jobs, use_cache=args.use_cache)
+
+
+def _eps(args: SolverArgs):
+    from rosarito.scenarios import run_eps_with_trips
+
+    return run_eps_with_trips(args.inp_path, use_cache=args.use_cache)
+
+
+def _energy(staging):
+    from rosarito.energy import compute_all_scenario_energies
+
+    return compute_all_scenario_energies(staging)
+
+
+def _validation(staging):
+    from rosarito.validation import validate_all_scenarios
+
+    return validate_all_scenarios(staging)
+
+
+def _tables(staging, energy, validations, eps) -> dict[str, Any]:
+    from rosarito.tables import (
+        energy_dataframe,
+        eps_events_dataframe,
+        staging_dataframe,
+        validation_dataframe,
+    )
+
+    return {
+        "staging": staging_dataframe(staging),
+        "energy": energy_dataframe(energy),
+        "validation": [validation_dataframe(v) for v in validations],
+        "eps_events": eps_events_dataframe(eps),
+    }
+
+
+def _figures(staging, energy, validations, eps) -> dict[str, Any]:
+    from rosarito.plotting import (
+        plot_energy_comparison,
+        plot_eps_timeseries,
+        plot_pump_hq,
+        plot_validation_deviations,
+        plot_valve_kv,
+        plot_valve_zeta,
+    )
+
+    return {
+        "valve_kv": plot_valve_kv(),
+        "valve_zeta": plot_valve_zeta(),
+        "pump_hq": plot_pump_hq(staging),
+        "energy": plot_energy_comparison(energy),
+        "validation": plot_validation_deviations(validations),
+        "eps": plot_eps_timeseries(eps),
+    }
+
+
+_REPORT_INPUTS = ("staging", "energy", "validation", "eps")
+
+STAGES: dict[str, Stage] = {
+    s.name: s for s in (
+        Stage("staging", _staging, solver=True),
+        Stage("eps", _eps, solver=True),
+        Stage("energy", _energy, ("staging",)),
+        Stage("validation", _validation, ("staging",)),
+        Stage("tables", _tables, _REPORT_INPUTS),
+        Stage("figures", _figures, _REPORT_INPUTS),
+    )
+}
+
+
+def _run_isolated(stage_name: str, args: SolverArgs):
+    """Worker entry point: run a solver stage on a private copy of the INP."""
+    workdir = tempfile.mkdtemp(prefix="rosarito_stage_")
+    try:
+        local_inp = Path(workdir) / Path(args.inp_path).name
+        shutil.copy2(args.inp_path, local_inp)
+        local = SolverArgs(str(local_inp), args.use_cache, args.jobs)
+        return STAGES[stage_name].func(local)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+class AnalysisPipeline:
+    """Per-run memo of the analysis stages for one INP.
+
+    Args:
+        inp_path: INP file. Defaults to Rev2.
+        jobs: Process count for the staging solves (as --jobs).
+        concurrent: Run pending solver stages side by side.
+        use_cache: Also reuse results from the content-addressed cache.
+    """
+
+    def __init__(
+        self,
+        inp_path: str | Path | None = None,
+        jobs: int = 1,
+        concurrent: bool = True,
+        use_cache: bool = True,
+    ):
+        self.inp_path = str(inp_path or INP_FILE)
+        self.jobs = jobs
+        self.concurrent = concurrent
+        self.use_cache = use_cache
+        self.timings: dict[str, float] = {}
+        self._results: dict[str, Any] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._results
+
+    def get(self, name: str) -> Any:
+        """Result of stage *name*, computing it and its inputs if needed."""
+        if name not in self._results:
+            self.run((name,))
+        return self._results[name]
+
+    def run(self, names: tuple[str, ...] | list[str] = DEFAULT_STAGES) -> dict[str, Any]:
+        """Compute *names* (and their inputs) once; return {name: result}."""
+        order = self._plan(names)
+        solvers = [n for n in order if STAGES[n].solver]
+        futures: dict[str, Future] = {}
+        pool = None
+        if self.concurrent and len(solvers) > 1:
+            pool = ProcessPoolExecutor(max_workers=len(solvers) - 1)
+            args = SolverArgs(self.inp_path, self.use_cache, self.jobs)
+            futures = {n: pool.submit(_run_isolated, n, args) for n in solvers[1:]}
+        try:
+            for name in order:
+                stage = STAGES[name]
+                t0 = time.perf_counter()
+                if name in futures:
+                    result = futures[name].result()
+                elif stage.solver:
+                    result = stage.func(SolverArgs(self.inp_path, self.use_cache, self.jobs))
+                else:
+                    result = stage.func(*(self._results[d] for d in stage.deps))
+                self._results[name] = result
+                self.timings[name] = time.perf_counter() - t0
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return {name: self._results[name] for name in names}
+
+    def _plan(self, names) -> list[str]:
+        """Missing stages needed for *names*, solver stages first, then topological."""
+        order: list[str] = []
+
+        def visit(name: str) -> None:
+            if name not in STAGES:
+                raise KeyError(f"unknown pipeline stage {name!r}; choose from {list(STAGES)}")
+            if name in self._results or name in order:
+                return
+            for dep in STAGES[name].deps:
+                visit(dep)
+            order.append(name)
+
+        for name in names:
+            visit(name)
+        return sorted(order, key=lambda n: not STAGES[n].solver)
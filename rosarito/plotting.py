@@ -10,21 +10,20 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 
-import pandas as pd
-
 from rosarito.constants import (
     H_SHUTOFF_M,
-    Q_RATED_LPS,
-    H_RATED_M,
+    INP_FILE,
     Q_MIN_STABLE_LPS,
     Q_BEP_BOWL_LPS,
     PUMP_IDS,
-    RIKO_CSV,
     RIKO_OPENINGS_ALL,
 )
+from rosarito.inp import load_inp
 from rosarito.model import SteadyStateResult, EPSResult
 from rosarito.energy import ScenarioEnergyResult
+from rosarito.surrogate import PumpCurve
 from rosarito.validation import ScenarioValidation
+from rosarito.valve import load_riko_table
 
 # ---------------------------------------------------------------------------
 # VAG-inspired color palette
@@ -54,22 +53,14 @@ def _apply_style(ax: plt.Axes) -> None:
 # ---------------------------------------------------------------------------
 
 def _solve_pump_curve() -> tuple[float, float]:
-    """Solve H = H_shutoff - B * Q^C using the 3-point EPANET fit.
+    """(B, C) of H = H_shutoff - B * Q^C, fitted as EPANET does.
 
-    Points: (0, 46.54), (1256, 26.07), (1700, 14.50)
-    At Q=0: H = H_shutoff, so we solve for B, C from the other two points.
+    The three PC_35WX points, (0, 46.54), (1256, 26.07) and (1700, 14.50)
+    in Rev2, are read from the INP (cached parse, no EPANET load).
     """
-    q1, h1 = Q_RATED_LPS, H_RATED_M       # (1256, 26.07)
-    q2, h2 = 1700.0, 14.50                 # shutoff extrapolation point
-
-    dh1 = H_SHUTOFF_M - h1  # 46.54 - 26.07 = 20.47
-    dh2 = H_SHUTOFF_M - h2  # 46.54 - 14.50 = 32.04
-
-    # dh1 = B * q1^C  and  dh2 = B * q2^C
-    # => dh2/dh1 = (q2/q1)^C  => C = ln(dh2/dh1) / ln(q2/q1)
-    C = np.log(dh2 / dh1) / np.log(q2 / q1)
-    B = dh1 / (q1 ** C)
-    return float(B), float(C)
+    (q0, h0), (q1, h1), (q2, h2) = load_inp(INP_FILE).pump_curve(PUMP_IDS[0]).points
+    curve = PumpCurve.from_points(h0, q1, h1, q2, h2)
+    return curve.b, curve.c
 
 
 def plot_pump_hq(staging_results: list[SteadyStateResult]) -> Figure:
@@ -206,7 +197,7 @@ def plot_eps_timeseries(eps: EPSResult) -> Figure:
     for t in trip_times:
         ax3.axvline(t, color=VAG_GRAY, linestyle=":", linewidth=0.6, alpha=0.5)
 
-    ax3.set_xlim(0, 24)
+    ax3.set_xlim(time_h[0], time_h[-1])
 
     fig.tight_layout()
     return fig
@@ -265,16 +256,14 @@ def plot_validation_deviations(
 # Valve characteristic data loader
 # ---------------------------------------------------------------------------
 
-def _load_riko_csv() -> pd.DataFrame:
-    """Load and parse the RIKO DN1800 valve characteristic CSV.
-
-    Strips '%' from positions and removes commas from Kv numbers.
-    """
-    df = pd.read_csv(RIKO_CSV)
-    df["position"] = df["valve_position"].str.rstrip("%").astype(int)
-    df["kv"] = df["kv_value"].astype(str).str.replace(",", "").astype(float)
-    df["zeta"] = df["zeta_value"].astype(float)
-    return df
+def _load_riko_csv() -> dict[str, np.ndarray]:
+    """RIKO DN1800 characteristic: position (%), kv and zeta arrays."""
+    table = load_riko_table()
+    return {
+        "position": table["valve_position"],
+        "kv": table["kv_value"],
+        "zeta": table["zeta_value"],
+    }
 
 
 # ---------------------------------------------------------------------------
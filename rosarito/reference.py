@@ -0,0 +1,100 @@
+"""Reference operating points recomputed from first principles.
+
+REFERENCE_POINTS_ALL in constants.py was calculated by hand with a
+rounded pump curve, Colebrook-White friction and the Kv valve loss. This
+module repeats that calculation for any list of openings in one batched
+surrogate solve, using the same stated assumptions, so validation is no
+longer limited to the seven literal points and the literals themselves
+can be regenerated:
+
+    python -m rosarito.reference    # prints a REFERENCE_POINTS_ALL block
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from rosarito.constants import (
+    H_PLANT,
+    H_SHUTOFF_M,
+    RIKO_OPENINGS_ALL,
+    ReferenceOperatingPoint,
+    RikoOpening,
+    lps_to_m3h,
+)
+from rosarito.surrogate import PumpCurve, SeriesNetwork, solve_operating_points
+
+# Assumptions of the hand calculation (see the constants.py header)
+REFERENCE_PUMP_CURVE = PumpCurve(a=H_SHUTOFF_M, b=5.300e-4, c=1.480)
+REFERENCE_VISCOSITY_M2S = 1.05e-6
+
+
+def reference_network() -> SeriesNetwork:
+    """The design network with the hand calculation's pump curve and ν."""
+    return replace(
+        SeriesNetwork.default(),
+        pump=REFERENCE_PUMP_CURVE,
+        viscosity_m2s=REFERENCE_VISCOSITY_M2S,
+    )
+
+
+def compute_reference_points(
+    openings: list[RikoOpening] | None = None,
+    h_plant_m: float = H_PLANT,
+    network: SeriesNetwork | None = None,
+) -> list[ReferenceOperatingPoint]:
+    """Operating points for *openings*, solved together in one batch.
+
+    Args:
+        openings: Openings to compute. Defaults to RIKO_OPENINGS_ALL.
+        h_plant_m: Plant forebay head.
+        network: Series path. Defaults to reference_network().
+
+    Returns:
+        Unrounded ReferenceOperatingPoints in input order.
+    """
+    if openings is None:
+        openings = RIKO_OPENINGS_ALL
+    r = solve_operating_points(
+        [o.n_pumps for o in openings],
+        [o.kv_m3h for o in openings],
+        h_plant_m=h_plant_m,
+        network=network or reference_network(),
+        friction="colebrook",
+    )
+    return [
+        ReferenceOperatingPoint(
+            phi_pct=o.phi_pct,
+            n_pumps=o.n_pumps,
+            q_total_lps=float(q),
+            q_total_m3h=lps_to_m3h(float(q)),
+            q_per_pump_lps=float(qp),
+            h_pump_m=float(h),
+            dh_riko_m=float(dh),
+            v_pipe_ms=float(v),
+        )
+        for o, q, qp, h, dh, v in zip(
+            openings, r.q_total_lps, r.q_per_pump_lps, r.h_pump_m,
+            r.dh_riko_m, r.v_ds_ms,
+        )
+    ]
+
+
+def format_reference_points(points: list[ReferenceOperatingPoint]) -> str:
+    """Render *points* as a REFERENCE_POINTS_ALL literal for constants.py."""
+    lines = ["REFERENCE_POINTS_ALL: list[ReferenceOperatingPoint] = ["]
+    for p in points:
+        lines += [
+            "    ReferenceOperatingPoint(",
+            f"        phi_pct={p.phi_pct}, n_pumps={p.n_pumps},",
+            f"        q_total_lps={p.q_total_lps:.1f}, q_total_m3h={p.q_total_m3h:.1f},",
+            f"        q_per_pump_lps={p.q_per_pump_lps:.1f}, h_pump_m={p.h_pump_m:.2f},",
+            f"        dh_riko_m={p.dh_riko_m:.2f}, v_pipe_ms={p.v_pipe_ms:.3f},",
+            "    ),",
+        ]
+    lines.append("]")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_reference_points(compute_reference_points()))
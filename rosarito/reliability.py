@@ -0,0 +1,284 @@
+"""Monte Carlo pump-trip reliability analysis for the N+1 pump station.
+
+Random trip/restore schedules are sampled from configurable time-to-failure
+and repair-time distributions, run as EPS with the INP's own rules (which
+start the standby and re-stage the RIKO valve), and reduced per run to a
+handful of metrics. Runs are streamed through incremental consumers, so
+no time series is ever kept, and spread across a process pool where each
+worker keeps one project loaded (EPSSession).
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from multiprocessing.util import Finalize
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import (
+    INP_FILE,
+    DUTY_PUMP_IDS,
+    STANDBY_PUMP_ID,
+    VAG_QMIN_M3H,
+    lps_to_m3h,
+)
+from rosarito.energy import EPSEnergyAccumulator
+from rosarito.model import EPSStep
+from rosarito.scenarios import EPSSession, PumpTripEvent
+
+
+# ---------------------------------------------------------------------------
+# Time distributions (hours)
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Exponential:
+    """Memoryless times with the given mean (constant failure rate)."""
+    mean_h: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(rng.exponential(self.mean_h))
+
+
+@dataclass(frozen=True)
+class Weibull:
+    """Weibull times; shape > 1 models wear-out, < 1 infant mortality."""
+    shape: float
+    scale_h: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(self.scale_h * rng.weibull(self.shape))
+
+
+@dataclass(frozen=True)
+class LogNormal:
+    """Log-normal times given the median and log-space sigma (repairs)."""
+    median_h: float
+    sigma: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(rng.lognormal(np.log(self.median_h), self.sigma))
+
+
+@dataclass(frozen=True)
+class TripModel:
+    """Failure/repair model for the Monte Carlo sampler.
+
+    Args:
+        time_to_failure: Running time between failures of one pump.
+        repair_time: Time from trip to restore.
+        pump_ids: Pumps subject to trips. Defaults to the duty pumps; the
+                  standby is started by the INP rules when one trips.
+        duration_h: EPS horizon per run.
+    """
+    time_to_failure: Exponential | Weibull | LogNormal = Exponential(mean_h=24.0 * 30)
+    repair_time: Exponential | Weibull | LogNormal = LogNormal(median_h=4.0, sigma=0.6)
+    pump_ids: tuple[str, ...] = tuple(DUTY_PUMP_IDS)
+    duration_h: float = 24.0
+
+
+def sample_trip_schedules(
+    n_runs: int,
+    model: TripModel | None = None,
+    seed: int | None = None,
+) -> list[list[PumpTripEvent]]:
+    """Sample *n_runs* independent trip/restore schedules.
+
+    Each pump alternates failure and repair: the next time-to-failure is
+    counted from the previous restore. Trips after the horizon are dropped;
+    a restore past it is kept (the control simply never fires).
+    """
+    model = model or TripModel()
+    rng = np.random.default_rng(seed)
+    schedules = []
+    for _ in range(n_runs):
+        trips = []
+        for pump_id in model.pump_ids:
+            t = model.time_to_failure.sample(rng)
+            while t < model.duration_h:
+                restore = t + model.repair_time.sample(rng)
+                trips.append(PumpTripEvent(pump_id, trip_hour=t, restore_hour=restore))
+                t = restore + model.time_to_failure.sample(rng)
+        trips.sort(key=lambda e: e.trip_hour)
+        schedules.append(trips)
+    return schedules
+
+
+# ---------------------------------------------------------------------------
+# Per-run metrics
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TripRunMetrics:
+    """Reliability metrics of one EPS run."""
+    n_trips: int
+    delivered_m3: float
+    hours_below_qmin: float     # Q_DS below the VAG RIKO minimum
+    standby_starts: int         # PUMP_5 closed → open transitions
+    energy_kwh: float
+
+
+class _RunMetricsConsumer:
+    """Step consumer reducing one EPS stream to TripRunMetrics."""
+
+    def __init__(self) -> None:
+        self.energy = EPSEnergyAccumulator()
+        self.delivered_m3 = 0.0
+        self.hours_below_qmin = 0.0
+        self.standby_starts = 0
+        self._prev: tuple[float, float, bool] | None = None
+
+    def update(self, step: EPSStep) -> None:
+        self.energy.update(step)
+        q_m3h = lps_to_m3h(step.flow("P_DS"))
+        standby_on = step.status(STANDBY_PUMP_ID) != 0
+        if self._prev is not None:
+            t_prev, q_prev, standby_prev = self._prev
+            dt_h = (step.time_s - t_prev) / 3600.0
+            self.delivered_m3 += q_prev * dt_h
+            if q_prev < VAG_QMIN_M3H:
+                self.hours_below_qmin += dt_h
+            if standby_on and not standby_prev:
+                self.standby_starts += 1
+        self._prev = (step.time_s, q_m3h, standby_on)
+
+    def result(self, n_trips: int) -> TripRunMetrics:
+        return TripRunMetrics(
+            n_trips=n_trips,
+            delivered_m3=self.delivered_m3,
+            hours_below_qmin=self.hours_below_qmin,
+            standby_starts=self.standby_starts,
+            energy_kwh=self.energy.result().energy_kwh,
+        )
+
+
+def _run_schedule(session: EPSSession, trips: list[PumpTripEvent]) -> TripRunMetrics:
+    consumer = _RunMetricsConsumer()
+    for step in session.stream(trips):
+        consumer.update(step)
+    return consumer.result(len(trips))
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MetricDistribution:
+    """Summary of one metric across Monte Carlo runs."""
+    mean: float
+    std: float
+    p05: float
+    p50: float
+    p95: float
+    min: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, x: np.ndarray) -> MetricDistribution:
+        p05, p50, p95 = np.percentile(x, [5, 50, 95])
+        return cls(
+            mean=float(x.mean()),
+            std=float(x.std(ddof=1)) if len(x) > 1 else 0.0,
+            p05=float(p05),
+            p50=float(p50),
+            p95=float(p95),
+            min=float(x.min()),
+            max=float(x.max()),
+        )
+
+
+@dataclass
+class MonteCarloResult:
+    """All per-run metrics of a Monte Carlo study, plus its inputs."""
+    model: TripModel
+    schedules: list[list[PumpTripEvent]]
+    runs: list[TripRunMetrics] = field(default_factory=list)
+
+    def samples(self, metric: str) -> np.ndarray:
+        """One metric across all runs, e.g. samples("delivered_m3")."""
+        return np.array([getattr(r, metric) for r in self.runs], dtype=float)
+
+    def distributions(self) -> dict[str, MetricDistribution]:
+        """MetricDistribution for every TripRunMetrics field."""
+        return {
+            f.name: MetricDistribution.from_samples(self.samples(f.name))
+            for f in fields(TripRunMetrics)
+        }
+
+    def probability(self, metric: str, threshold: float) -> float:
+        """Fraction of runs where *metric* exceeds *threshold*."""
+        return float(np.mean(self.samples(metric) > threshold))
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+# Per-worker EPS session, created once by the pool initializer.
+_worker_session: EPSSession | None = None
+
+
+def _init_worker(inp_path: str, duration_h: float) -> None:
+    """Pool initializer: load a private copy of the INP (see scenarios)."""
+    global _worker_session
+    workdir = tempfile.mkdtemp(prefix="rosarito_mc_")
+    local_inp = Path(workdir) / Path(inp_path).name
+    shutil.copy2(inp_path, local_inp)
+    _worker_session = EPSSession(local_inp, duration_h).open()
+    Finalize(None, _close_worker, args=(workdir,), exitpriority=10)
+
+
+def _close_worker(workdir: str) -> None:
+    if _worker_session is not None:
+        _worker_session.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_in_worker(trips: list[PumpTripEvent]) -> TripRunMetrics:
+    return _run_schedule(_worker_session, trips)
+
+
+def run_monte_carlo(
+    n_runs: int = 1000,
+    model: TripModel | None = None,
+    inp_path: str | Path | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+) -> MonteCarloResult:
+    """Sample trip schedules and run each as an EPS.
+
+    Results do not depend on *workers*: schedules are sampled up front from
+    *seed*, and every run starts from the same project state.
+
+    Args:
+        n_runs: Number of sampled schedules.
+        model: Failure/repair model. Defaults to TripModel().
+        inp_path: Path to INP file. Defaults to Rev2.
+        workers: Processes to use; 1 runs in-process.
+        seed: Seed for reproducible sampling.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    model = model or TripModel()
+    path = str(inp_path or INP_FILE)
+    schedules = sample_trip_schedules(n_runs, model, seed)
+
+    if workers == 1 or n_runs < 2:
+        with EPSSession(path, model.duration_h) as session:
+            runs = [_run_schedule(session, trips) for trips in schedules]
+    else:
+        n_workers = min(workers, n_runs)
+        chunksize = max(1, n_runs // (n_workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(path, model.duration_h),
+        ) as pool:
+            runs = list(pool.map(_run_in_worker, schedules, chunksize=chunksize))
+
+    return MonteCarloResult(model=model, schedules=schedules, runs=runs)
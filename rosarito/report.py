@@ -1,7 +1,8 @@
 """Generate Markdown report of pump operation scenarios.
 
-Runs all EPANET analyses via EPyT and writes a formatted Markdown report
-with staging scenarios, energy summary, validation, and EPS event log.
+Pulls all EPANET analyses from an AnalysisPipeline and writes a formatted
+Markdown report with staging scenarios, energy summary, validation, and
+EPS event log.
 """
 
 from __future__ import annotations
@@ -17,51 +18,44 @@ from rosarito.constants import (
     lps_to_m3h,
 )
 from rosarito.model import SteadyStateResult, EPSResult
-from rosarito.scenarios import (
-    run_staging_scenarios,
-    run_eps_with_trips,
-    DEFAULT_PUMP_TRIPS,
-)
-from rosarito.energy import (
-    compute_all_scenario_energies,
-    ScenarioEnergyResult,
-)
-from rosarito.validation import validate_all_scenarios, ScenarioValidation
+from rosarito.scenarios import DEFAULT_PUMP_TRIPS
+from rosarito.energy import ScenarioEnergyResult
+from rosarito.validation import ScenarioValidation
 from rosarito.eps_utils import iter_eps_events
+from rosarito.pipeline import AnalysisPipeline
 
 
 _DEFAULT_OUTPUT = Path(__file__).resolve().parent.parent / "reports" / "scenarios_report.md"
 
 
-def generate_report(output_path: str | Path | None = None) -> Path:
+def generate_report(
+    output_path: str | Path | None = None,
+    pipeline: AnalysisPipeline | None = None,
+) -> Path:
     """Run all analyses and write Markdown report.
 
+    Args:
+        output_path: Report file. Defaults to reports/scenarios_report.md.
+        pipeline: Analyses to report; stages it already holds are not rerun.
+            Defaults to a fresh pipeline on Rev2.
+
     Returns the path to the generated report file.
     """
     out = Path(output_path or _DEFAULT_OUTPUT)
     out.parent.mkdir(parents=True, exist_ok=True)
+    pipeline = pipeline or AnalysisPipeline(INP_FILE)
 
-    print(f"Loading model: {INP_FILE}")
-
-    # 1. Steady-state staging
-    print("Running staging scenarios...")
-    staging_results = run_staging_scenarios()
+    print(f"Loading model: {pipeline.inp_path}")
 
-    # 2. Energy calculations
-    print("Computing energy...")
-    energy_results = compute_all_scenario_energies(staging_results)
+    # Staging and 24h EPS with pump trips are solved side by side; energy
+    # and validation post-process the staging results
+    print("Running staging scenarios, energy, validation and 24h EPS...")
+    results = pipeline.run(("staging", "energy", "validation", "eps"))
 
-    # 3. Validation
-    print("Validating against reference...")
-    validations = validate_all_scenarios(staging_results)
-
-    # 4. EPS with pump trips
-    print("Running 24h EPS with pump trips...")
-    eps = run_eps_with_trips()
-
-    # 5. Build report
     print("Writing report...")
-    md = _build_markdown(staging_results, energy_results, validations, eps)
+    md = _build_markdown(
+        results["staging"], results["energy"], results["validation"], results["eps"],
+    )
     out.write_text(md, encoding="utf-8")
 
     print(f"Report written to: {out}")
@@ -2,13 +2,29 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from rosarito.constants import lps_to_m3h
-from rosarito.model import SteadyStateResult, EPSResult
-from rosarito.energy import ScenarioEnergyResult, ThrottleLoss
-from rosarito.optimization import VFDResult
-from rosarito.validation import ScenarioValidation
 from rosarito.eps_utils import iter_eps_events
 
+# Result types are only annotations here; importing them at runtime would
+# make every CLI command pay for every analysis module.
+if TYPE_CHECKING:
+    from rosarito.model import SteadyStateResult, EPSResult
+    from rosarito.energy import EPSEnergyResult, ScenarioEnergyResult, ThrottleLoss
+    from rosarito.optimization import GridSearchResult, VFDResult
+    from rosarito.validation import ParameterCheck, ScenarioValidation
+    from rosarito.eps_utils import EPSStatistics
+    from rosarito.scenarios import EnvelopePoint, WarmStartReport
+    from rosarito.reliability import MonteCarloResult
+    from rosarito.contingency import ContingencySummary
+    from rosarito.surrogate import CrossCheckReport
+    from rosarito.sensitivity import SensitivityResult
+    from rosarito.scheduling import StagingSchedule
+    from rosarito.startup import StartupProfile
+    from rosarito.tariff import EPSCostResult
+    from rosarito.vfd import EPSRunSummary
+
 
 # ---------------------------------------------------------------------------
 # Staging table
@@ -44,6 +60,48 @@ def print_staging_table(results: list[SteadyStateResult]) -> None:
     print()
 
 
+# ---------------------------------------------------------------------------
+# Operating envelope (dense RIKO sweep)
+# ---------------------------------------------------------------------------
+
+def print_envelope_table(points: list[EnvelopePoint]) -> None:
+    """Print the dense RIKO opening × pump-count operating envelope."""
+    print()
+    print("=" * 100)
+    print("  RIKO OPERATING ENVELOPE — DENSE OPENING SWEEP (Kv CSV)")
+    print("=" * 100)
+    print(
+        f"{'N_pump':>6}  {'phi%':>6}  {'Kv':>10}  {'Q_total':>10}  "
+        f"{'Q/pump':>8}  {'H_pump':>8}  {'dH_RIKO':>8}  {'PumpQmin':>8}  {'VAG':>5}"
+    )
+    print(
+        f"{'':>6}  {'':>6}  {'(m3/h)':>10}  {'(m3/h)':>10}  "
+        f"{'(l/s)':>8}  {'(m)':>8}  {'(m)':>8}  {'':>8}  {'':>5}"
+    )
+    print("-" * 100)
+
+    for p in points:
+        print(
+            f"{p.n_pumps:>6}  {p.phi_pct:>5g}%  {p.kv_m3h:>10.1f}  "
+            f"{p.q_total_m3h:>10.0f}  {p.q_per_pump_lps:>8.1f}  "
+            f"{p.h_pump_m:>8.2f}  {p.dh_riko_m:>8.2f}  "
+            f"{'OK' if p.pump_flow_ok else 'LOW':>8}  "
+            f"{'OK' if p.valve_flow_ok else 'OUT':>5}"
+        )
+
+    print("=" * 100)
+    print()
+
+
+def print_warm_start_summary(report: WarmStartReport) -> None:
+    """Print solver trial counts for a cold vs warm-started sweep."""
+    print(f"  Solver trials over {report.n_points} points:")
+    print(f"    cold start : {report.cold_iterations:>6}  ({report.cold_mean:.2f} per point)")
+    print(f"    warm start : {report.warm_iterations:>6}  ({report.warm_mean:.2f} per point)")
+    print(f"    saving     : {report.saving_pct:>5.1f}%   max |dQ| = {report.max_dq_lps:.3f} l/s")
+    print()
+
+
 # ---------------------------------------------------------------------------
 # Validation report
 # ---------------------------------------------------------------------------
@@ -77,6 +135,28 @@ def print_validation_report(validations: list[ScenarioValidation]) -> None:
     print()
 
 
+def print_inp_checks(runs: dict[str, list[ParameterCheck]]) -> None:
+    """Print INP design-input checks per model file."""
+    print()
+    print("=" * 90)
+    print("  INP INPUT DATA vs DATASHEETS AND Kv CSV")
+    print("=" * 90)
+    for label, checks in runs.items():
+        status = "PASS" if all(c.passed for c in checks) else "FAIL"
+        print(f"\n  {label}  [{status}]")
+        print(f"  {'Parameter':<18}  {'INP':>10}  {'Reference':>10}  {'Dev%':>8}  {'Result':>6}")
+        print(f"  {'-'*60}")
+        for c in checks:
+            tag = "OK" if c.passed else "FAIL"
+            print(
+                f"  {c.name:<18}  {c.computed:>10.2f}  {c.reference:>10.2f}  "
+                f"{c.deviation_pct:>7.2f}%  {tag:>6}"
+            )
+    print()
+    print("=" * 90)
+    print()
+
+
 # ---------------------------------------------------------------------------
 # Energy table
 # ---------------------------------------------------------------------------
@@ -148,6 +228,278 @@ def print_eps_summary(eps: EPSResult) -> None:
     print()
 
 
+# ---------------------------------------------------------------------------
+# Monte Carlo pump-trip reliability
+# ---------------------------------------------------------------------------
+
+_MC_METRICS = [
+    ("n_trips", "Trips per run", "{:>10.2f}"),
+    ("standby_starts", "Standby starts", "{:>10.2f}"),
+    ("delivered_m3", "Delivered (m3)", "{:>10.0f}"),
+    ("hours_below_qmin", "Q < VAG Qmin (h)", "{:>10.2f}"),
+    ("energy_kwh", "Energy (kWh)", "{:>10.0f}"),
+]
+
+
+def print_boundary_comparison(
+    runs: dict[str, tuple[EPSStatistics, EPSEnergyResult]],
+) -> None:
+    """Print Q_DS / H_pump ranges and energy for EPS runs under different boundaries."""
+    print()
+    print("=" * 100)
+    print("  EPS UNDER STATIC vs TIME-VARYING RESERVOIR HEADS")
+    print("=" * 100)
+    print(
+        f"{'Boundary':<14}  {'Hours':>6}  {'Q_DS min':>9}  {'Q_DS max':>9}  "
+        f"{'H_pump min':>10}  {'H_pump max':>10}  {'Energy':>10}  {'Peak':>8}"
+    )
+    print(
+        f"{'':<14}  {'':>6}  {'(l/s)':>9}  {'(l/s)':>9}  "
+        f"{'(m)':>10}  {'(m)':>10}  {'(MWh)':>10}  {'(kW)':>8}"
+    )
+    print("-" * 100)
+    for label, (stats, energy) in runs.items():
+        print(
+            f"{label:<14}  {stats.duration_h:>6.1f}  {stats.q_ds_lps.min:>9.1f}  "
+            f"{stats.q_ds_lps.max:>9.1f}  {stats.h_pump_m.min:>10.2f}  "
+            f"{stats.h_pump_m.max:>10.2f}  {energy.energy_kwh / 1000:>10.2f}  "
+            f"{energy.peak_shaft_kw:>8.0f}"
+        )
+    print("=" * 100)
+    print()
+
+
+def print_cost_ranking(title: str, ranked: list[tuple[str, EPSCostResult]]) -> None:
+    """Print EPS runs ranked by electricity cost under one tariff."""
+    print()
+    print("=" * 100)
+    print(f"  PUMP ELECTRICITY COST — {title}")
+    print("=" * 100)
+    print(
+        f"{'Run':<26}  {'Hours':>6}  {'Energy':>10}  {'Energy':>10}  "
+        f"{'Demand':>10}  {'Total':>10}  {'Average':>9}"
+    )
+    print(
+        f"{'':<26}  {'':>6}  {'(MWh)':>10}  {'cost':>10}  "
+        f"{'cost':>10}  {'cost':>10}  {'(/kWh)':>9}"
+    )
+    print("-" * 100)
+    for label, c in ranked:
+        print(
+            f"{label:<26}  {c.hours:>6.1f}  {c.energy_kwh / 1000:>10.2f}  "
+            f"{c.energy_cost:>10,.0f}  {c.demand_cost:>10,.0f}  "
+            f"{c.total_cost:>10,.0f}  {c.average_price_per_kwh:>9.4f}"
+        )
+    print("=" * 100)
+    print()
+
+
+def print_energy_audit(runs: dict[str, EPSEnergyResult]) -> None:
+    """Print per-pump run hours and shaft energy for EPS energy integrations."""
+    print()
+    print("=" * 100)
+    print("  EPS PUMP ENERGY AUDIT")
+    print("=" * 100)
+    for label, e in runs.items():
+        print(
+            f"  {label}: {e.energy_kwh / 1000:,.2f} MWh over {e.hours:.1f} h  |  "
+            f"mean eta {e.mean_eta_pct:.1f}%  |  peak {e.peak_shaft_kw:,.0f} kW"
+        )
+    print("-" * 100)
+    labels = list(runs)
+    print(f"{'Pump':<8}  {'Run':>7}" + "".join(f"  {label[:22]:>22}" for label in labels))
+    print(f"{'':<8}  {'(h)':>7}" + "".join(f"  {'(kWh)':>22}" for _ in labels))
+    print("-" * 100)
+    first = runs[labels[0]]
+    for pid, hours in first.pump_run_hours.items():
+        row = f"{pid:<8}  {hours:>7.2f}"
+        row += "".join(f"  {runs[label].pump_energy_kwh[pid]:>22,.0f}" for label in labels)
+        print(row)
+    print("=" * 100)
+    print()
+
+
+def print_vfd_eps_comparison(summaries: list[EPSRunSummary]) -> None:
+    """Print throttled vs VFD EPS runs side by side."""
+    print()
+    print("=" * 110)
+    print("  EPS: RIKO THROTTLING vs VFD SPEED CONTROL")
+    print("=" * 110)
+    print(
+        f"{'Run':<28}  {'Q_mean':>8}  {'Q_min':>8}  {'Q_max':>8}  {'H_mean':>7}  "
+        f"{'s_min':>6}  {'eta':>6}  {'Energy':>9}  {'E_spec':>8}"
+    )
+    print(
+        f"{'':<28}  {'(l/s)':>8}  {'(l/s)':>8}  {'(l/s)':>8}  {'(m)':>7}  "
+        f"{'(-)':>6}  {'(%)':>6}  {'(MWh)':>9}  {'(kWh/m3)':>8}"
+    )
+    print("-" * 110)
+    for s in summaries:
+        print(
+            f"{s.label[:28]:<28}  {s.q_mean_lps:>8,.0f}  {s.q_min_lps:>8,.0f}  "
+            f"{s.q_max_lps:>8,.0f}  {s.h_pump_mean_m:>7.2f}  {s.speed_min:>6.3f}  "
+            f"{s.energy.mean_eta_pct:>6.1f}  {s.energy.energy_kwh / 1000:>9,.2f}  "
+            f"{s.specific_energy_kwh_m3:>8.4f}"
+        )
+    print("-" * 110)
+    base = summaries[0]
+    for s in summaries[1:]:
+        saved = base.energy.energy_kwh - s.energy.energy_kwh
+        pct = 100.0 * saved / base.energy.energy_kwh if base.energy.energy_kwh else 0.0
+        print(f"  {s.label}: {saved / 1000:,.2f} MWh ({pct:.1f}%) less than {base.label}")
+    print("=" * 110)
+    print()
+
+
+def print_monte_carlo_summary(mc: MonteCarloResult) -> None:
+    """Print per-metric distributions of a Monte Carlo trip study."""
+    print()
+    print("=" * 90)
+    print(
+        f"  MONTE CARLO PUMP-TRIP RELIABILITY — {len(mc.runs)} runs × "
+        f"{mc.model.duration_h:g} h"
+    )
+    print("=" * 90)
+    print(
+        f"{'Metric':<18}  {'mean':>10}  {'P5':>10}  {'P50':>10}  "
+        f"{'P95':>10}  {'max':>10}"
+    )
+    print("-" * 90)
+
+    dists = mc.distributions()
+    for name, label, fmt in _MC_METRICS:
+        dist = dists[name]
+        values = [dist.mean, dist.p05, dist.p50, dist.p95, dist.max]
+        print(f"{label:<18}  " + "  ".join(fmt.format(v) for v in values))
+
+    print("-" * 90)
+    print(
+        f"  P(any time below VAG Qmin) = "
+        f"{mc.probability('hours_below_qmin', 0.0) * 100:.2f}%"
+    )
+    print("=" * 90)
+    print()
+
+
+# ---------------------------------------------------------------------------
+# N-k pump outage contingencies
+# ---------------------------------------------------------------------------
+
+def print_contingency_table(summaries: list[ContingencySummary]) -> None:
+    """Print worst-case flow per N-k outage level and RIKO opening."""
+    print()
+    print("=" * 90)
+    print("  PUMP OUTAGE CONTINGENCIES (N-k) — WORST CASE PER LEVEL AND OPENING")
+    print("=" * 90)
+    print(
+        f"{'N-k':>5}  {'phi%':>5}  {'Sets':>5}  {'N_run':>5}  {'N_nom':>5}  "
+        f"{'Q_min':>10}  {'Q_min':>10}  {'Deficit':>8}"
+    )
+    print(
+        f"{'':>5}  {'':>5}  {'':>5}  {'(min)':>5}  {'':>5}  "
+        f"{'(l/s)':>10}  {'(m3/h)':>10}  {'(%)':>8}"
+    )
+    print("-" * 90)
+
+    for s in summaries:
+        print(
+            f"{'N-' + str(s.level):>5}  {s.opening.phi_pct:>4}%  {s.n_sets:>5}  "
+            f"{s.n_running_min:>5}  {s.opening.n_pumps:>5}  "
+            f"{s.q_min_lps:>10.1f}  {lps_to_m3h(s.q_min_lps):>10.0f}  "
+            f"{s.q_deficit_pct_max:>8.1f}"
+        )
+
+    print("=" * 90)
+    print()
+
+
+def print_surrogate_check(report: CrossCheckReport) -> None:
+    """Print surrogate-vs-EPANET deviations and timings."""
+    sur = report.surrogate
+    print()
+    print("=" * 70)
+    print("  NUMPY SURROGATE vs EPANET — CROSS-CHECK")
+    print("=" * 70)
+    print(f"  Cases:                 {report.n_cases}")
+    print(f"  Newton iterations:     {sur.iterations} "
+          f"({int(sur.converged.sum())}/{sur.converged.size} converged)")
+    print(f"  max |dQ|:              {report.max_dq_lps:.3f} l/s "
+          f"({report.max_dq_pct:.4f} %)")
+    print(f"  max |dH_pump|:         {report.max_dh_pump_m * 1000:.1f} mm")
+    print(f"  max |dH_RIKO|:         {report.max_dh_riko_m * 1000:.1f} mm")
+    print(f"  Surrogate:             {report.surrogate_s * 1000:.1f} ms")
+    print(f"  EPANET:                {report.epanet_s * 1000:.1f} ms "
+          f"({report.speedup:.0f}x slower)")
+    print("=" * 70)
+    print()
+
+
+_SENSITIVITY_METRICS = [
+    ("q_total_lps", "Q_total (l/s)", "{:>9.1f}"),
+    ("h_pump_m", "H_pump (m)", "{:>9.2f}"),
+    ("power_kw", "P_shaft (kW)", "{:>9.0f}"),
+]
+
+
+def print_tornado_table(result: SensitivityResult) -> None:
+    """Print tornado bars (metric at low / base / high) per scenario."""
+    print()
+    print("=" * 90)
+    print("  SENSITIVITY — ONE-AT-A-TIME TORNADO (RANGE ENDS, WIDEST SWING FIRST)")
+    print("=" * 90)
+    for par in result.parameters:
+        print(f"  {par.name:<18} {par.low:g} … {par.high:g}  (design {par.base:g})")
+
+    for metric, label, fmt in _SENSITIVITY_METRICS:
+        print()
+        print(f"  {label}")
+        print(
+            f"{'phi%':>6}  {'N':>3}  {'Parameter':<18}  "
+            f"{'Low':>9}  {'Base':>9}  {'High':>9}  {'Swing':>9}"
+        )
+        print("-" * 90)
+        for b in result.tornado(metric):
+            print(
+                f"{b.opening.phi_pct:>5}%  {b.opening.n_pumps:>3}  {b.parameter:<18}  "
+                f"{fmt.format(b.metric_low)}  {fmt.format(b.metric_base)}  "
+                f"{fmt.format(b.metric_high)}  {fmt.format(b.swing)}"
+            )
+    print("=" * 90)
+    print()
+
+
+def print_schedule(schedule: StagingSchedule) -> None:
+    """Print the hour-by-hour staging schedule and its totals."""
+    print()
+    print("=" * 90)
+    print("  DEMAND-FOLLOWING STAGING SCHEDULE (min shaft energy + switching penalties)")
+    print("=" * 90)
+    print(
+        f"{'Start':>6}  {'Target':>8}  {'N':>3}  {'phi%':>5}  {'Q_total':>8}  "
+        f"{'Short':>7}  {'H_pump':>7}  {'P_shaft':>8}"
+    )
+    print(
+        f"{'(h)':>6}  {'(l/s)':>8}  {'':>3}  {'':>5}  {'(l/s)':>8}  "
+        f"{'(l/s)':>7}  {'(m)':>7}  {'(kW)':>8}"
+    )
+    print("-" * 90)
+    for iv in schedule.intervals:
+        o = iv.option
+        print(
+            f"{iv.start_h:>6.1f}  {iv.target_lps:>8.0f}  {o.n_pumps:>3}  "
+            f"{o.opening.phi_pct:>4}%  {o.q_total_lps:>8.0f}  {iv.shortfall_lps:>7.0f}  "
+            f"{o.h_pump_m:>7.2f}  {o.power_kw:>8.0f}"
+        )
+    print("-" * 90)
+    print(
+        f"  Energy {schedule.energy_kwh:,.0f} kWh + penalties {schedule.penalty_kwh:,.0f} kWh"
+        f"  |  pump starts/stops {schedule.pump_switches}"
+        f"  |  RIKO changes {schedule.valve_switches}"
+    )
+    print("=" * 90)
+    print()
+
+
 # ---------------------------------------------------------------------------
 # Throttling analysis
 # ---------------------------------------------------------------------------
@@ -190,29 +542,117 @@ def print_throttling_analysis(
 def print_vfd_comparison(vfd_results: list[VFDResult]) -> None:
     """Print VFD vs throttled comparison table."""
     print()
-    print("=" * 110)
+    print("=" * 124)
     print("  VFD COMPARISON — THROTTLED (FIXED SPEED) vs VARIABLE FREQUENCY DRIVE")
-    print("=" * 110)
+    print("=" * 124)
     print(
         f"{'phi%':>6}  {'N':>3}  {'Q_total':>8}  {'H_pump':>7}  {'dH_RIKO':>7}  "
-        f"{'N/N_r':>6}  {'P_throttle':>11}  {'P_VFD':>8}  "
+        f"{'N/N_r':>6}  {'eta_thr':>7}  {'eta_VFD':>7}  {'P_throttle':>11}  {'P_VFD':>8}  "
         f"{'Save/pump':>10}  {'Save_tot':>9}  {'Save':>6}"
     )
     print(
         f"{'':>6}  {'':>3}  {'(l/s)':>8}  {'(m)':>7}  {'(m)':>7}  "
-        f"{'':>6}  {'(kW/pump)':>11}  {'(kW/p)':>8}  "
+        f"{'':>6}  {'(%)':>7}  {'(%)':>7}  {'(kW/pump)':>11}  {'(kW/p)':>8}  "
         f"{'(kW)':>10}  {'(kW)':>9}  {'(%)':>6}"
     )
-    print("-" * 110)
+    print("-" * 124)
 
     for v in vfd_results:
         print(
             f"{v.phi_pct:>5}%  {v.n_pumps:>3}  {v.q_total_lps:>8.1f}  "
             f"{v.h_pump_throttled_m:>7.2f}  {v.h_pump_throttled_m - v.h_pump_vfd_m:>7.2f}  "
-            f"{v.speed_ratio:>6.3f}  {v.p_shaft_throttled_kw:>11.1f}  "
+            f"{v.speed_ratio:>6.3f}  {v.eta_throttled_pct:>7.1f}  {v.eta_vfd_pct:>7.1f}  "
+            f"{v.p_shaft_throttled_kw:>11.1f}  "
             f"{v.p_shaft_vfd_kw:>8.1f}  {v.saving_per_pump_kw:>10.1f}  "
             f"{v.saving_total_kw:>9.1f}  {v.saving_pct:>5.1f}%"
         )
 
-    print("=" * 110)
+    print("=" * 124)
+    print()
+
+
+def print_pareto_front(
+    result: GridSearchResult,
+    flow_targets_lps,
+    min_margin_pct: float = 20.0,
+) -> None:
+    """Print the cheapest front point per flow target, with and without a valve margin."""
+    print()
+    print("=" * 112)
+    print(
+        f"  PUMP COUNT × SPEED × RIKO OPENING — {len(result):,} points, "
+        f"{int(result.feasible.sum()):,} feasible, {len(result.front):,} on the Pareto front"
+    )
+    print("=" * 112)
+    header = f"{'N':>2}  {'N/N_r':>5}  {'phi%':>5}  {'Q':>7}  {'P_shaft':>8}"
+    print(f"{'Q_target':>9}  | {'any margin':^33} | {f'margin >= {min_margin_pct:g}%':^33} | {'dP':>6}")
+    print(f"{'(l/s)':>9}  | {header} | {header} | {'(kW)':>6}")
+    print("-" * 112)
+    for q in flow_targets_lps:
+        cells = []
+        for margin in (0.0, min_margin_pct):
+            try:
+                pt = result.cheapest_for_flow(q, margin)
+            except ValueError:
+                cells.append(None)
+                continue
+            cells.append(pt)
+        row = f"{q:>9,.0f}  "
+        for pt in cells:
+            if pt is None:
+                row += f"| {'—':^33} "
+            else:
+                row += (
+                    f"| {pt.n_pumps:>2}  {pt.speed_ratio:>5.3f}  {pt.phi_pct:>5.0f}  "
+                    f"{pt.q_total_lps:>7,.0f}  {pt.p_shaft_kw:>8,.1f} "
+                )
+        dp = cells[1].p_shaft_kw - cells[0].p_shaft_kw if None not in cells else float("nan")
+        print(row + f"| {dp:>6.1f}")
+    print("=" * 112)
+    print()
+
+
+# ---------------------------------------------------------------------------
+# CLI startup profile
+# ---------------------------------------------------------------------------
+
+def print_startup_profiles(
+    profiles: list[StartupProfile],
+    budgets: dict[str, float],
+    top: int = 8,
+) -> None:
+    """Print startup wall/import time per command against its budget.
+
+    With a single profile, also print its per-package and slowest-module
+    import times.
+    """
+    print()
+    print("=" * 96)
+    print("  CLI STARTUP — python -X importtime")
+    print("=" * 96)
+    print(
+        f"{'Command':<18}  {'Wall':>7}  {'Import':>7}  {'Budget':>7}  {'EPyT':>5}  "
+        f"{'Largest packages (self import ms)':<34}  {'Result':>6}"
+    )
+    print("-" * 96)
+    for p in profiles:
+        budget = budgets[p.label]
+        packages = ", ".join(
+            f"{name} {s * 1000:.0f}" for name, s in list(p.by_package().items())[:3]
+        )
+        print(
+            f"{p.label:<18}  {p.wall_s * 1000:>5.0f}ms  {p.import_s * 1000:>5.0f}ms  "
+            f"{budget * 1000:>5.0f}ms  {'yes' if p.loaded('epyt') else 'no':>5}  "
+            f"{packages[:34]:<34}  {'OK' if p.wall_s <= budget else 'OVER':>6}"
+        )
+    if len(profiles) == 1:
+        p = profiles[0]
+        print("-" * 96)
+        print(f"  {'Package':<40}  {'Self (ms)':>10}")
+        for name, s in list(p.by_package().items())[:top]:
+            print(f"  {name:<40}  {s * 1000:>10.1f}")
+        print(f"\n  {'Module':<40}  {'Self (ms)':>10}  {'Cumulative (ms)':>16}")
+        for r in p.slowest(top):
+            print(f"  {r.module:<40}  {r.self_us / 1000:>10.1f}  {r.cumulative_us / 1000:>16.1f}")
+    print("=" * 96)
     print()
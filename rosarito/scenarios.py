@@ -1,18 +1,32 @@
 """Steady-state staging scenarios and 24h EPS with pump trips.
 
-Each scenario loads a fresh epanet object to avoid state leakage.
+Each scenario loads a fresh epanet object to avoid state leakage, unless
+a StagingSession is used to keep one project loaded across a sweep.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import shutil
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from multiprocessing.util import Finalize
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Protocol
 
-from epyt import epanet
+import numpy as np
 
 from rosarito.constants import (
     INP_FILE,
     INP_FILE_REV3,
+    N_TOTAL_PUMPS,
+    H_PLANT,
+    H_SEA,
+    Q_RUNOUT_LPS,
+    Q_MIN_STABLE_LPS,
+    VAG_QMIN_M3H,
+    VAG_QMAX_M3H,
     DUTY_PUMP_IDS,
     STANDBY_PUMP_ID,
     PUMP_IDS,
@@ -28,8 +42,24 @@ from rosarito.constants import (
     JUNCTION_IDS_REV2,
     RESERVOIR_IDS,
     RikoOpening,
+    lps_to_m3h,
 )
-from rosarito.model import SteadyStateResult, EPSResult
+from rosarito.model import (
+    RosaritoModel,
+    SteadyStateResult,
+    EPSResult,
+    EPSStep,
+    load_epanet,
+    read_snapshot,
+    solve_snapshot,
+)
+from rosarito.boundary import BoundaryConditions
+from rosarito.cache import default_cache, make_key
+from rosarito.eps_store import DEFAULT_CHUNK_STEPS, ChunkedEPSWriter, load_eps
+from rosarito.valve import load_riko_kv, kv_at, gpv_curve_points
+
+if TYPE_CHECKING:
+    from epyt import epanet
 
 
 def _build_name_index_maps(
@@ -50,15 +80,25 @@ def _build_name_index_maps(
 def run_staging_scenarios(
     inp_path: str | Path | None = None,
     openings: list[RikoOpening] | None = None,
+    reuse_session: bool = False,
+    workers: int = 1,
+    use_cache: bool = True,
 ) -> list[SteadyStateResult]:
     """Run steady-state staging scenarios.
 
-    Each scenario uses a fresh EPyT instance and a duration-0 simulation.
+    Each scenario uses a fresh EPyT instance and a duration-0 simulation,
+    unless *reuse_session* is set, in which case one StagingSession is
+    loaded and reset between scenarios (same results, one INP load).
 
     Args:
         inp_path: Path to INP file. Defaults to Rev2 for original 4 openings,
                   Rev3 when extended openings are requested.
         openings: List of RIKO openings to simulate. Defaults to RIKO_OPENINGS (4).
+        reuse_session: Keep one loaded project alive for the whole sweep.
+        workers: Number of worker processes. Values > 1 fan the openings out
+                 to a process pool (see run_openings_parallel).
+        use_cache: Reuse results from the content-addressed result cache;
+                   only cache misses are solved.
     """
     if openings is None:
         openings = RIKO_OPENINGS
@@ -66,21 +106,67 @@ def run_staging_scenarios(
         inp_path = INP_FILE_REV3 if openings is RIKO_OPENINGS_ALL else INP_FILE
     path = str(inp_path)
 
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+
+    cache = default_cache() if use_cache else None
+    if cache is None:
+        return _solve_openings(path, openings, reuse_session, workers)
+
+    keys = [_steady_state_key(path, o) for o in openings]
+    results = [cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        solved = _solve_openings(
+            path, [openings[i] for i in missing], reuse_session, workers,
+        )
+        for i, r in zip(missing, solved):
+            cache.put(keys[i], r)
+            results[i] = r
+    return results
+
+
+def _steady_state_key(inp_path: str, opening: RikoOpening) -> str:
+    """Cache key: INP bytes + opening + the pump set it switches on."""
+    active = tuple(DUTY_PUMP_IDS[:opening.n_pumps])
+    return make_key("steady", inp_path, opening, active)
+
+
+def _solve_openings(
+    path: str,
+    openings: list[RikoOpening],
+    reuse_session: bool,
+    workers: int,
+) -> list[SteadyStateResult]:
+    """Solve openings serially, in one session, or across a process pool."""
+    if workers > 1:
+        return run_openings_parallel(path, openings, workers)
+
+    if reuse_session:
+        with StagingSession(path) as session:
+            return [session.run(o) for o in openings]
+
     return [_run_single_scenario(path, o) for o in openings]
 
 
 def run_staging_scenarios_extended(
     inp_path: str | Path | None = None,
+    reuse_session: bool = False,
+    workers: int = 1,
+    use_cache: bool = True,
 ) -> list[SteadyStateResult]:
     """Run all 7 staging scenarios (including 3 intermediate openings)."""
-    return run_staging_scenarios(inp_path, openings=RIKO_OPENINGS_ALL)
+    return run_staging_scenarios(
+        inp_path, openings=RIKO_OPENINGS_ALL,
+        reuse_session=reuse_session, workers=workers, use_cache=use_cache,
+    )
 
 
 def _run_single_scenario(
     inp_path: str, opening: RikoOpening,
 ) -> SteadyStateResult:
     """Run a single steady-state scenario for the given RIKO opening."""
-    d = epanet(inp_path)
+    d = load_epanet(inp_path)
 
     try:
         link_idx, node_idx = _build_name_index_maps(d)
@@ -88,22 +174,206 @@ def _run_single_scenario(
         # Single hydraulic timestep (steady state)
         d.setTimeSimulationDuration(0)
 
+        result = _solve_steady_state(d, link_idx, node_idx, opening)
+
+    finally:
+        d.unload()
+
+    return result
+
+
+def _solve_steady_state(
+    d: epanet,
+    link_idx: dict[str, int],
+    node_idx: dict[str, int],
+    opening: RikoOpening,
+    pump_ids: list[str] | None = None,
+) -> SteadyStateResult:
+    """Configure pumps/GPVs for *opening* on a loaded project and solve.
+
+    By default the first opening.n_pumps duty pumps run; *pump_ids* runs
+    an explicit set instead (any pumps, including the standby).
+    """
+    if pump_ids is None:
         # Configure pump statuses: first N duty pumps OPEN, rest CLOSED
         _configure_pumps(d, link_idx, opening.n_pumps)
+    else:
+        _configure_pump_set(d, link_idx, pump_ids)
+        opening = replace(opening, n_pumps=len(pump_ids))
 
-        # Configure RIKO GPVs: only the correct one OPEN
-        _configure_riko(d, link_idx, opening)
+    # Configure RIKO GPVs: only the correct one OPEN
+    _configure_riko(d, link_idx, opening)
 
-        # Run hydraulic simulation
-        ts = d.getComputedHydraulicTimeSeries()
+    # Solve the single period and read back only flow/velocity/headloss/head
+    d.openHydraulicAnalysis()
+    try:
+        solve_snapshot(d)
+        snapshot = read_snapshot(d)
+    finally:
+        d.closeHydraulicAnalysis()
 
-        # Extract results from the single timestep (index 0)
-        result = _extract_results(d, ts, link_idx, node_idx, opening)
+    return _extract_results(d, snapshot, link_idx, node_idx, opening)
 
-    finally:
-        d.unload()
 
-    return result
+# ---------------------------------------------------------------------------
+# Reusable steady-state session
+# ---------------------------------------------------------------------------
+
+class StagingSession:
+    """One loaded EPANET project reused across steady-state scenarios.
+
+    For this 5-pump network the INP parse, toolkit init and index-map build
+    cost more than the hydraulic solve itself, so sweeps keep one project
+    alive and only reset pump and GPV initial statuses between scenarios.
+
+    Everything else (duration, controls, rules, node elevations, initial
+    status and setting of all other links) is fingerprinted at
+    load time and re-checked around every run; any drift raises
+    RuntimeError instead of leaking into the next scenario.
+
+    Note: EPyT binds one toolkit project per process, so only one session
+    (or other epanet object) should be open at a time.
+    """
+
+    def __init__(self, inp_path: str | Path | None = None):
+        self.model = RosaritoModel(inp_path)
+        self._pump_idx: list[int] = []
+        self._managed_idx: list[int] = []
+        self._fingerprint: tuple | None = None
+
+    @property
+    def inp_path(self) -> str:
+        return self.model.inp_path
+
+    @property
+    def d(self) -> epanet:
+        return self.model.d
+
+    def open(self) -> StagingSession:
+        """Load the project once and record its baseline fingerprint."""
+        d = self.model.load()
+        d.setTimeSimulationDuration(0)
+        link_idx = self.model.link_indices
+        riko_ids = RIKO_IDS_ALL if "RIKO_40" in link_idx else RIKO_IDS
+        self._pump_idx = [link_idx[lid] for lid in PUMP_IDS]
+        self._managed_idx = self._pump_idx + [link_idx[lid] for lid in riko_ids]
+        self._fingerprint = self._take_fingerprint()
+        return self
+
+    def close(self) -> None:
+        self.model.close()
+        self._fingerprint = None
+
+    def __enter__(self) -> StagingSession:
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def run(
+        self, opening: RikoOpening, pump_ids: list[str] | None = None,
+    ) -> SteadyStateResult:
+        """Solve one staging scenario on the loaded project.
+
+        *pump_ids* overrides which pumps run (default: the first
+        opening.n_pumps duty pumps).
+        """
+        if self._fingerprint is None:
+            raise RuntimeError("Session not open. Call open() first.")
+        self._check_fingerprint("before")
+        result = _solve_steady_state(
+            self.d, self.model.link_indices, self.model.node_indices, opening,
+            pump_ids,
+        )
+        self._check_fingerprint("after")
+        return result
+
+    def _take_fingerprint(self) -> tuple:
+        d = self.d
+        # Pump status/speed and GPV status are reset by every run; all
+        # other initial link state must stay exactly as loaded.
+        statuses = tuple(
+            float(s) for i, s in enumerate(d.getLinkInitialStatus(), start=1)
+            if i not in self._managed_idx
+        )
+        settings = tuple(
+            float(s) for i, s in enumerate(d.getLinkInitialSetting(), start=1)
+            if i not in self._pump_idx
+        )
+        return (
+            int(d.getTimeSimulationDuration()),
+            int(d.getControlCount()),
+            int(d.getRuleCount()),
+            tuple(float(v) for v in d.getNodeElevations()),
+            statuses,
+            settings,
+        )
+
+    def _check_fingerprint(self, when: str) -> None:
+        if self._take_fingerprint() != self._fingerprint:
+            raise RuntimeError(
+                f"Project state changed {when} scenario run in session for "
+                f"{self.inp_path}; refusing to reuse a modified model"
+            )
+
+
+# ---------------------------------------------------------------------------
+# Process-pool execution
+# ---------------------------------------------------------------------------
+
+# Per-worker session, created once by the pool initializer.
+_worker_session: StagingSession | None = None
+
+
+def _init_worker(inp_path: str) -> None:
+    """Pool initializer: preload a private copy of the INP into a session.
+
+    EPyT writes <name>_temp.inp/.txt/.bin next to the input file, so
+    workers loading the same path would clobber each other's scratch files.
+    """
+    global _worker_session
+    workdir = tempfile.mkdtemp(prefix="rosarito_worker_")
+    local_inp = Path(workdir) / Path(inp_path).name
+    shutil.copy2(inp_path, local_inp)
+    _worker_session = StagingSession(local_inp).open()
+    # Pool workers leave via os._exit, which skips atexit; multiprocessing
+    # finalizers still run on worker shutdown.
+    Finalize(None, _close_worker, args=(workdir,), exitpriority=10)
+
+
+def _close_worker(workdir: str) -> None:
+    if _worker_session is not None:
+        _worker_session.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_in_worker(opening: RikoOpening) -> SteadyStateResult:
+    return _worker_session.run(opening)
+
+
+def run_openings_parallel(
+    inp_path: str | Path,
+    openings: list[RikoOpening],
+    workers: int,
+) -> list[SteadyStateResult]:
+    """Solve *openings* across a process pool, preserving input order.
+
+    Each worker loads the INP once into a StagingSession and then solves
+    whatever openings it is handed. Every scenario is an independent
+    duration-0 solve from the same project state, so results are identical
+    to the serial path regardless of which worker ran them.
+    """
+    openings = list(openings)
+    if not openings:
+        return []
+    n_workers = min(workers, len(openings))
+    chunksize = max(1, len(openings) // (n_workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_worker,
+        initargs=(str(inp_path),),
+    ) as pool:
+        return list(pool.map(_run_in_worker, openings, chunksize=chunksize))
 
 
 def _get_pipe_and_junction_ids(
@@ -120,12 +390,26 @@ def _configure_pumps(
     d: epanet, link_idx: dict[str, int], n_active: int,
 ) -> None:
     """Set initial status: first n_active duty pumps OPEN, rest CLOSED."""
-    for i, pump_id in enumerate(DUTY_PUMP_IDS):
-        status = 1 if i < n_active else 0  # 1=OPEN, 0=CLOSED
-        d.setLinkInitialStatus(link_idx[pump_id], status)
-
     # Standby always CLOSED for steady-state scenarios
-    d.setLinkInitialStatus(link_idx[STANDBY_PUMP_ID], 0)
+    _configure_pump_set(d, link_idx, DUTY_PUMP_IDS[:n_active])
+
+
+def _configure_pump_set(
+    d: epanet, link_idx: dict[str, int], active_ids: list[str], speed_ratio: float = 1.0,
+) -> None:
+    """Set initial status: pumps in active_ids OPEN, all others CLOSED.
+
+    A pump listed CLOSED in [STATUS] (the standby) also loads with relative
+    speed 0, so opened pumps get their initial speed setting reset to
+    *speed_ratio* (1.0 = rated speed).
+    """
+    for pump_id in PUMP_IDS:
+        idx = link_idx[pump_id]
+        if pump_id in active_ids:
+            d.setLinkInitialStatus(idx, 1)  # OPEN
+            d.setLinkInitialSetting(idx, speed_ratio)
+        else:
+            d.setLinkInitialStatus(idx, 0)  # CLOSED
 
 
 def _configure_riko(
@@ -146,7 +430,7 @@ def _extract_results(
     node_idx: dict[str, int],
     opening: RikoOpening,
 ) -> SteadyStateResult:
-    """Extract hydraulic results from the computed time series."""
+    """Extract hydraulic results from a solved snapshot (row 0 of *ts*)."""
     pipe_ids, _, subdivided = _get_pipe_and_junction_ids(link_idx)
 
     # Flow through downstream pipe = total system flow
@@ -198,6 +482,297 @@ def _extract_results(
     )
 
 
+# ---------------------------------------------------------------------------
+# Dense RIKO opening sweep (operating envelope)
+# ---------------------------------------------------------------------------
+
+SWEEP_VALVE_ID = "RIKO_44"      # GPV link that carries the swept curve
+SWEEP_CURVE_ID = "RIKO_SWEEP"   # in-memory curve added at run time
+
+
+@dataclass
+class EnvelopePoint:
+    """One (n_pumps, phi) point of the RIKO operating envelope."""
+    n_pumps: int
+    phi_pct: float
+    kv_m3h: float
+    q_total_lps: float
+    q_per_pump_lps: float
+    h_pump_m: float
+    dh_riko_m: float
+    v_ds_ms: float
+    iterations: int = 0     # hydraulic solver trials for this point
+
+    @property
+    def q_total_m3h(self) -> float:
+        return lps_to_m3h(self.q_total_lps)
+
+    @property
+    def pump_flow_ok(self) -> bool:
+        """Q/pump at or above the minimum stable continuous flow."""
+        return self.q_per_pump_lps >= Q_MIN_STABLE_LPS
+
+    @property
+    def valve_flow_ok(self) -> bool:
+        """Q_total within the VAG RIKO sizing range (Qmin–Qmax)."""
+        return VAG_QMIN_M3H <= self.q_total_m3h <= VAG_QMAX_M3H
+
+
+def run_opening_sweep(
+    inp_path: str | Path | None = None,
+    phi_grid: list[float] | None = None,
+    pump_counts: list[int] | None = None,
+    warm_start: bool = False,
+) -> list[EnvelopePoint]:
+    """Sweep RIKO openings × pump counts on a single loaded model.
+
+    Instead of one GPV link per opening, a Kv-based curve is built in
+    memory for each phi and swapped onto SWEEP_VALVE_ID; all other GPVs
+    are closed. Pumps are opened in PUMP_IDS order, so 5 pumps includes
+    the standby.
+
+    Points are solved pump count by pump count, walking the phi grid up
+    and back down alternately, so consecutive solves are always nearest
+    neighbours. With *warm_start*, each solve starts from the previous
+    point's link flows instead of EPANET's default initial flows.
+
+    Args:
+        inp_path: Path to INP file. Defaults to Rev3.
+        phi_grid: Openings in %. Defaults to every row of the Kv CSV (2% steps).
+                  Off-grid values are interpolated linearly in Kv.
+        pump_counts: Pump counts to sweep. Defaults to 1–5.
+        warm_start: Seed each solve with the previous solution's flows.
+
+    Returns:
+        Envelope points ordered by (n_pumps, phi_pct), each carrying the
+        solver trial count.
+    """
+    path = str(inp_path or INP_FILE_REV3)
+    if phi_grid is None:
+        phi_grid = load_riko_kv()[0]
+    if pump_counts is None:
+        pump_counts = list(range(1, N_TOTAL_PUMPS + 1))
+    for n in pump_counts:
+        if not 1 <= n <= N_TOTAL_PUMPS:
+            raise ValueError(f"pump count must be 1–{N_TOTAL_PUMPS}, got {n}")
+
+    phis = sorted(float(p) for p in phi_grid)
+    grid = list(zip(phis, (float(k) for k in kv_at(phis))))
+    q_max = N_TOTAL_PUMPS * Q_RUNOUT_LPS * 1.1
+
+    points: list[EnvelopePoint] = []
+    with RosaritoModel(path) as model, warnings.catch_warnings():
+        # Small openings drive the pumps to shutoff; EPANET warns on every
+        # such point, which is expected here (flagged via pump_flow_ok).
+        warnings.filterwarnings("ignore", message=".*Pumps cannot deliver")
+        d = model.d
+        link_idx, node_idx = model.link_indices, model.node_indices
+        d.setTimeSimulationDuration(0)
+
+        d.addCurve(SWEEP_CURVE_ID, [[0.0, 0.0], [1.0, 0.0]])
+        curve_idx = d.getCurveIndex(SWEEP_CURVE_ID)
+        d.setLinkValveCurveGPV(link_idx[SWEEP_VALVE_ID], curve_idx)
+
+        model.open_hydraulics()
+        try:
+            for i, n in enumerate(pump_counts):
+                _configure_pump_set(d, link_idx, PUMP_IDS[:n])
+                for phi, kv in (grid if i % 2 == 0 else reversed(grid)):
+                    opening = RikoOpening(
+                        phi_pct=phi, kv_m3h=kv, n_pumps=n,
+                        gpv_link_id=SWEEP_VALVE_ID, curve_id=SWEEP_CURVE_ID,
+                    )
+                    d.setCurve(curve_idx, gpv_curve_points(kv, q_max))
+                    _configure_riko(d, link_idx, opening)
+                    iterations = model.solve_snapshot(warm_start=warm_start)
+                    r = _extract_results(
+                        d, model.read_snapshot(), link_idx, node_idx, opening
+                    )
+                    points.append(EnvelopePoint(
+                        n_pumps=n,
+                        phi_pct=phi,
+                        kv_m3h=kv,
+                        q_total_lps=r.q_total_lps,
+                        q_per_pump_lps=r.q_per_pump_lps,
+                        h_pump_m=r.h_pump_m,
+                        dh_riko_m=r.dh_riko_m,
+                        v_ds_ms=r.pipe_velocities["P_DS"],
+                        iterations=iterations,
+                    ))
+        finally:
+            model.close_hydraulics()
+
+    points.sort(key=lambda p: (p.n_pumps, p.phi_pct))
+    return points
+
+
+@dataclass
+class WarmStartReport:
+    """Solver trial counts for one sweep, cold vs warm-started."""
+    n_points: int
+    cold_iterations: int
+    warm_iterations: int
+    max_dq_lps: float           # largest |Q_total| difference between modes
+    points: list[EnvelopePoint] = field(default_factory=list)  # warm results
+
+    @property
+    def cold_mean(self) -> float:
+        return self.cold_iterations / self.n_points
+
+    @property
+    def warm_mean(self) -> float:
+        return self.warm_iterations / self.n_points
+
+    @property
+    def saving_pct(self) -> float:
+        return 100.0 * (1.0 - self.warm_iterations / self.cold_iterations)
+
+
+def compare_warm_start(
+    inp_path: str | Path | None = None,
+    phi_grid: list[float] | None = None,
+    pump_counts: list[int] | None = None,
+) -> WarmStartReport:
+    """Run the same sweep cold and warm-started and compare trial counts.
+
+    Args are as for run_opening_sweep().
+    """
+    cold = run_opening_sweep(inp_path, phi_grid, pump_counts, warm_start=False)
+    warm = run_opening_sweep(inp_path, phi_grid, pump_counts, warm_start=True)
+    return WarmStartReport(
+        n_points=len(warm),
+        cold_iterations=sum(p.iterations for p in cold),
+        warm_iterations=sum(p.iterations for p in warm),
+        max_dq_lps=max(
+            (abs(c.q_total_lps - w.q_total_lps) for c, w in zip(cold, warm)),
+            default=0.0,
+        ),
+        points=warm,
+    )
+
+
+@dataclass(frozen=True)
+class BoundaryCase:
+    """A steady-state case with explicit boundary heads and pipe roughness.
+
+    The RIKO is modelled by its Kv alone (curve swapped onto
+    SWEEP_VALVE_ID); *phi_pct* is only carried through as a label.
+    """
+    n_pumps: int
+    kv_m3h: float
+    h_plant_m: float = H_PLANT
+    h_sea_m: float = H_SEA
+    roughness_scale: float = 1.0    # multiplies every pipe's INP roughness
+    phi_pct: float = 0.0
+    speed_ratio: float = 1.0        # relative speed of the running pumps
+
+
+def run_boundary_cases(
+    cases: list[BoundaryCase],
+    inp_path: str | Path | None = None,
+    warm_start: bool = False,
+    workers: int = 1,
+) -> list[SteadyStateResult]:
+    """Solve boundary/roughness/Kv variations on a single loaded model.
+
+    Every case sets pump statuses, the valve curve, both reservoir heads
+    and all pipe roughnesses explicitly, so results do not depend on case
+    order. Pumps are opened in PUMP_IDS order.
+
+    With *workers* > 1 the cases are split into one contiguous block per
+    process; each process loads a private copy of the INP once and solves
+    its block. Cold-started results do not depend on *workers*.
+
+    Args:
+        cases: Cases to solve.
+        inp_path: Path to INP file. Defaults to Rev3.
+        warm_start: Seed each solve with the previous case's flows.
+        workers: Processes to use; 1 runs in-process.
+
+    Returns:
+        One SteadyStateResult per case, in input order.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    path = str(inp_path or INP_FILE_REV3)
+    cases = list(cases)
+    for case in cases:
+        if not 1 <= case.n_pumps <= N_TOTAL_PUMPS:
+            raise ValueError(f"pump count must be 1–{N_TOTAL_PUMPS}, got {case.n_pumps}")
+    if workers == 1 or len(cases) < 2:
+        return _solve_boundary_cases(path, cases, warm_start)
+
+    n_workers = min(workers, len(cases))
+    blocks = [list(b) for b in np.array_split(np.arange(len(cases)), n_workers)]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        solved = pool.map(
+            _run_boundary_block,
+            [(path, [cases[i] for i in b], warm_start) for b in blocks],
+        )
+        return [r for block in solved for r in block]
+
+
+def _run_boundary_block(
+    args: tuple[str, list[BoundaryCase], bool],
+) -> list[SteadyStateResult]:
+    """Worker: solve one block of cases on a private copy of the INP."""
+    inp_path, cases, warm_start = args
+    workdir = tempfile.mkdtemp(prefix="rosarito_worker_")
+    try:
+        local_inp = Path(workdir) / Path(inp_path).name
+        shutil.copy2(inp_path, local_inp)
+        return _solve_boundary_cases(str(local_inp), cases, warm_start)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _solve_boundary_cases(
+    path: str, cases: list[BoundaryCase], warm_start: bool,
+) -> list[SteadyStateResult]:
+    q_max = N_TOTAL_PUMPS * Q_RUNOUT_LPS * 1.1
+
+    results: list[SteadyStateResult] = []
+    with RosaritoModel(path) as model, warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*Pumps cannot deliver")
+        d = model.d
+        link_idx, node_idx = model.link_indices, model.node_indices
+        d.setTimeSimulationDuration(0)
+
+        d.addCurve(SWEEP_CURVE_ID, [[0.0, 0.0], [1.0, 0.0]])
+        curve_idx = d.getCurveIndex(SWEEP_CURVE_ID)
+        d.setLinkValveCurveGPV(link_idx[SWEEP_VALVE_ID], curve_idx)
+
+        pipe_ids, _, _ = _get_pipe_and_junction_ids(link_idx)
+        pipe_roughness = {
+            pid: float(d.getLinkRoughnessCoeff(link_idx[pid])) for pid in pipe_ids
+        }
+
+        model.open_hydraulics()
+        try:
+            for case in cases:
+                opening = RikoOpening(
+                    phi_pct=case.phi_pct, kv_m3h=case.kv_m3h, n_pumps=case.n_pumps,
+                    gpv_link_id=SWEEP_VALVE_ID, curve_id=SWEEP_CURVE_ID,
+                )
+                _configure_pump_set(d, link_idx, PUMP_IDS[:case.n_pumps], case.speed_ratio)
+                d.setCurve(curve_idx, gpv_curve_points(case.kv_m3h, q_max))
+                _configure_riko(d, link_idx, opening)
+                # Reservoir elevation is its fixed head
+                d.setNodeElevations(node_idx["PLANT"], case.h_plant_m)
+                d.setNodeElevations(node_idx["SEA"], case.h_sea_m)
+                for pid, eps in pipe_roughness.items():
+                    d.setLinkRoughnessCoeff(link_idx[pid], eps * case.roughness_scale)
+
+                model.solve_snapshot(warm_start=warm_start)
+                results.append(_extract_results(
+                    d, model.read_snapshot(), link_idx, node_idx, opening,
+                ))
+        finally:
+            model.close_hydraulics()
+
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Extended Period Simulation (EPS) with pump trips
 # ---------------------------------------------------------------------------
@@ -210,6 +785,41 @@ class PumpTripEvent:
     restore_hour: float    # hour to restore (open) pump
 
 
+@dataclass(frozen=True)
+class StagingControl:
+    """A scheduled link status change during EPS (pump or RIKO GPV)."""
+    link_id: str
+    hour: float            # hour the change takes effect
+    status: int            # 1 = OPEN, 0 = CLOSED
+
+
+class SpeedControl(Protocol):
+    """Sets the running pumps' relative speed before each hydraulic step.
+
+    See rosarito.vfd for the schedule and flow-setpoint implementations.
+    """
+
+    def event_times_s(self, duration_s: int) -> list[int]:
+        """Times at which the speed must change (forced hydraulic steps)."""
+        ...
+
+    def speed(self, time_s: int, n_running: int, q_total_lps: float | None) -> float:
+        """Speed for the step at *time_s* with *n_running* pumps open.
+
+        *q_total_lps* is the previous step's total pump flow, or None when
+        it was produced by a different set of pumps (first step, trips,
+        standby starts) and so is no valid feedback.
+        """
+        ...
+
+
+# Pipe used to force hydraulic steps at speed-change times: an OPEN
+# control on an already open pipe changes nothing but ends the step there
+_STEP_MARKER_LINK = "P_INTAKE"
+_Q_ZERO_LPS = 1e-3      # closed links keep a tiny residual flow
+
+EPS_DTYPES = ("float64", "float32")
+
 DEFAULT_PUMP_TRIPS: list[PumpTripEvent] = [
     PumpTripEvent("PUMP_4", trip_hour=6.0,  restore_hour=8.0),
     PumpTripEvent("PUMP_3", trip_hour=12.0, restore_hour=14.0),
@@ -220,75 +830,400 @@ DEFAULT_PUMP_TRIPS: list[PumpTripEvent] = [
 def run_eps_with_trips(
     inp_path: str | Path | None = None,
     trips: list[PumpTripEvent] | None = None,
+    use_cache: bool = True,
+    report_only: bool = False,
+    dtype: str = "float64",
+    duration_h: float | None = None,
+    out_dir: str | Path | None = None,
+    chunk_steps: int = DEFAULT_CHUNK_STEPS,
+    boundary: BoundaryConditions | None = None,
 ) -> EPSResult:
-    """Run 24h EPS with scheduled pump trips.
+    """Run an EPS (24h by default) with scheduled pump trips.
 
     Pump trips are added as EPANET simple controls (per Project Instructions
     Section 7: add to [CONTROLS], never modify [RULES]).
     The rule-based controls in the INP handle standby activation and valve
     position changes automatically.
+
+    By default every hydraulic step is recorded, including the intermediate
+    steps EPANET inserts at control and rule events. With *report_only*,
+    only samples on the [TIMES] report grid are kept.
+
+    Flows, velocities and heads are stored as *dtype* ("float64", or
+    "float32" to halve memory on long runs); statuses are always int8.
+
+    For long horizons (weeks to a year) pass *out_dir*: steps are streamed
+    to memory-mapped .npy files in chunks of *chunk_steps* rows, and the
+    returned EPSResult reads from those files lazily (see eps_store).
+
+    With *use_cache*, results are memoized on the INP bytes and run
+    inputs; with *out_dir*, a complete run already stored there under the
+    same inputs is reopened instead of re-solved.
+
+    *boundary* attaches head patterns to SEA and/or PLANT (tide, forebay
+    level); by default both keep their fixed INP heads.
+
+    Args:
+        duration_h: Simulation duration in hours. Defaults to the INP [TIMES].
+        boundary: Time-varying reservoir heads (see rosarito.boundary).
     """
     path = str(inp_path or INP_FILE)
     if trips is None:
         trips = DEFAULT_PUMP_TRIPS
+    if dtype not in EPS_DTYPES:
+        raise ValueError(f"dtype must be one of {EPS_DTYPES}, got {dtype!r}")
+    if duration_h is not None and duration_h <= 0:
+        raise ValueError(f"duration_h must be positive, got {duration_h}")
+
+    key = make_key("eps", path, tuple(trips), report_only, dtype, duration_h, boundary)
+
+    if out_dir is not None:
+        result = load_eps(out_dir, key) if use_cache else None
+        if result is None:
+            with ChunkedEPSWriter(out_dir, dtype, chunk_steps, key=key) as writer:
+                for step in stream_eps(path, trips, report_only, duration_h, boundary):
+                    writer.update(step)
+            result = load_eps(out_dir)
+        return result
+
+    cache = default_cache() if use_cache else None
+    if cache is None:
+        return _run_eps(path, trips, report_only, dtype, duration_h, boundary)
+
+    result = cache.get(key)
+    if result is None:
+        result = _run_eps(path, trips, report_only, dtype, duration_h, boundary)
+        cache.put(key, result)
+    return result
 
-    d = epanet(path)
 
-    try:
-        link_idx, node_idx = _build_name_index_maps(d)
+def _run_eps(
+    path: str,
+    trips: list[PumpTripEvent],
+    report_only: bool = False,
+    dtype: str = "float64",
+    duration_h: float | None = None,
+    boundary: BoundaryConditions | None = None,
+) -> EPSResult:
+    """Run the full EPS and stack every streamed step into an EPSResult."""
+    return collect_eps(
+        stream_eps(path, trips, report_only, duration_h, boundary), dtype, path,
+    )
+
+
+def collect_eps(steps: Iterator[EPSStep], dtype: str, path: str) -> EPSResult:
+    """Stack a stream of EPSSteps into a columnar EPSResult.
+
+    Args:
+        steps: EPS steps, e.g. from stream_eps() or EPSSession.stream().
+        dtype: Float dtype of the stored quantities (see EPS_DTYPES).
+        path: INP path, for the error message if no step is produced.
+    """
+    time_s: list[float] = []
+    rows: dict[str, list[np.ndarray]] = {
+        "flow": [], "velocity": [], "status": [], "head": [],
+    }
+    step = None
+    for step in steps:
+        time_s.append(step.time_s)
+        rows["flow"].append(step.link_flow)
+        rows["velocity"].append(step.link_velocity)
+        rows["status"].append(step.link_status)
+        rows["head"].append(step.node_head)
+
+    if step is None:
+        raise RuntimeError(f"EPS produced no hydraulic steps: {path}")
+
+    def stack(key: str, dt) -> np.ndarray:
+        return np.array(rows[key], dtype=dt).reshape(len(time_s), -1)
+
+    return EPSResult(
+        time_s=np.asarray(time_s, dtype=np.float64),
+        link_flow=stack("flow", dtype),
+        link_velocity=stack("velocity", dtype),
+        link_status=stack("status", np.int8),
+        node_head=stack("head", dtype),
+        link_cols=step.link_cols,
+        node_cols=step.node_cols,
+    )
+
+
+def run_eps_with_controls(
+    controls: list[StagingControl],
+    inp_path: str | Path | None = None,
+    duration_h: float | None = None,
+    use_rules: bool = False,
+    dtype: str = "float64",
+    boundary: BoundaryConditions | None = None,
+) -> EPSResult:
+    """Replay a list of link status changes as EPS (e.g. a staging schedule).
+
+    The INP [RULES] are dropped by default, so pumps and RIKO GPVs follow
+    *controls* alone. Not cached: schedules are rarely replayed twice.
+
+    Args:
+        controls: Status changes, in any order.
+        inp_path: Path to INP file. Defaults to Rev3 (all seven GPVs).
+        duration_h: Override the INP simulation duration (hours).
+        use_rules: Keep the INP rules active during the replay.
+        dtype: Storage dtype for flows, velocities and heads.
+        boundary: Time-varying reservoir heads.
+    """
+    if dtype not in EPS_DTYPES:
+        raise ValueError(f"dtype must be one of {EPS_DTYPES}, got {dtype!r}")
+    path = str(inp_path or INP_FILE_REV3)
+    with EPSSession(path, duration_h, boundary, use_rules=use_rules) as session:
+        return collect_eps(session.stream([], controls=controls), dtype, path)
+
+
+def stream_eps(
+    inp_path: str | Path | None = None,
+    trips: list[PumpTripEvent] | None = None,
+    report_only: bool = False,
+    duration_h: float | None = None,
+    boundary: BoundaryConditions | None = None,
+) -> Iterator[EPSStep]:
+    """Yield one EPSStep per hydraulic step while the solver advances.
 
-        # Add pump trip/restore controls
-        for trip in trips:
-            trip_seconds = int(trip.trip_hour * 3600)
-            restore_seconds = int(trip.restore_hour * 3600)
+    Nothing is accumulated here, so memory stays constant however long
+    the run; pair with the incremental consumers in eps_utils and energy
+    (iter_eps_events, EPSStatistics, EPSEnergyAccumulator).
 
-            # EPyT addControls format: 'LINK <id> <status> AT TIME <seconds>'
-            d.addControls(f"LINK {trip.pump_id} 0 AT TIME {trip_seconds}")
-            d.addControls(f"LINK {trip.pump_id} 1 AT TIME {restore_seconds}")
+    The project stays loaded until the generator is exhausted or closed,
+    and EPyT allows one loaded project per process, so do not load another
+    model while consuming the stream.
 
-        # Run full 24h EPS
-        ts = d.getComputedHydraulicTimeSeries()
+    Args:
+        inp_path: Path to INP file. Defaults to Rev2.
+        trips: Pump trips as in run_eps_with_trips(). Defaults to DEFAULT_PUMP_TRIPS.
+        report_only: Yield only steps on the [TIMES] report grid.
+        duration_h: Override the INP simulation duration (hours).
+        boundary: Time-varying reservoir heads.
+    """
+    if trips is None:
+        trips = DEFAULT_PUMP_TRIPS
+    with EPSSession(inp_path, duration_h, boundary) as session:
+        yield from session.stream(trips, report_only)
 
-        # Extract time series for all tracked elements
-        time_s = ts.Time.tolist()
+
+class EPSSession:
+    """Keep one project loaded across many EPS runs (e.g. Monte Carlo).
+
+    Each stream() adds its trip controls, steps the solver and deletes the
+    controls again, so every run starts from the INP's own controls and
+    rules, exactly as a fresh load would.
+
+    Args:
+        inp_path: Path to INP file. Defaults to Rev2.
+        duration_h: Override the INP simulation duration (hours).
+        boundary: Reservoir head patterns, applied once on open.
+        use_rules: Keep the INP [RULES]. Without them, staging follows
+                   only the controls passed to stream() (schedule replay);
+                   the rules would otherwise re-open the standby and
+                   override intermediate RIKO openings.
+    """
+
+    def __init__(
+        self,
+        inp_path: str | Path | None = None,
+        duration_h: float | None = None,
+        boundary: BoundaryConditions | None = None,
+        use_rules: bool = True,
+    ):
+        self.model = RosaritoModel(inp_path or INP_FILE)
+        self.duration_h = duration_h
+        self.boundary = boundary
+        self.use_rules = use_rules
+        self._link_ids: list[str] = []
+        self._node_ids: list[str] = []
+        self._link_cols: dict[str, int] = {}
+        self._node_cols: dict[str, int] = {}
+
+    def open(self) -> EPSSession:
+        d = self.model.load()
+        if self.duration_h is not None:
+            d.setTimeSimulationDuration(int(round(self.duration_h * 3600)))
+        if self.boundary is not None:
+            _apply_boundary(d, self.model.node_indices, self.boundary)
+        if not self.use_rules and d.getRuleCount():
+            d.deleteRules()
 
         # Detect subdivided model (Rev3) vs original (Rev2)
+        link_idx = self.model.link_indices
         eps_pipe_ids, eps_node_ids, subdivided = _get_pipe_and_junction_ids(link_idx)
-        all_link_ids = PUMP_IDS + RIKO_IDS + eps_pipe_ids
-        all_node_ids = eps_node_ids + RESERVOIR_IDS
-
-        flows: dict[str, list[float]] = {}
-        velocities: dict[str, list[float]] = {}
-        statuses: dict[str, list[int]] = {}
-        for lid in all_link_ids:
-            idx = link_idx[lid] - 1
-            flows[lid] = ts.Flow[:, idx].tolist()
-            velocities[lid] = ts.Velocity[:, idx].tolist()
-            statuses[lid] = [int(s) for s in ts.Status[:, idx].tolist()]
+        riko_ids = RIKO_IDS_ALL if "RIKO_40" in link_idx else RIKO_IDS
+        self._link_ids = PUMP_IDS + riko_ids + eps_pipe_ids
+        self._node_ids = eps_node_ids + RESERVOIR_IDS
 
+        self._link_cols = {lid: j for j, lid in enumerate(self._link_ids)}
         if subdivided:
-            flows["P_DS"] = flows["P_DS_1"]
-            velocities["P_DS"] = velocities["P_DS_1"]
+            self._link_cols["P_DS"] = self._link_cols["P_DS_1"]
+        self._node_cols = {nid: j for j, nid in enumerate(self._node_ids)}
+        return self
+
+    def close(self) -> None:
+        self.model.close()
+
+    def __enter__(self) -> EPSSession:
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def stream(
+        self,
+        trips: list[PumpTripEvent],
+        report_only: bool = False,
+        controls: list[StagingControl] | tuple[StagingControl, ...] = (),
+        speed_control: SpeedControl | None = None,
+    ) -> Iterator[EPSStep]:
+        """Run one EPS with *trips* and extra *controls*, one EPSStep per step.
+
+        With *speed_control*, the speed setting of every open pump is set
+        before each step; pumps opened by a control or rule during a step
+        start at rated speed and follow the controller from the next step.
+        """
+        d = self.model.d
+        link_idx, node_idx = self.model.link_indices, self.model.node_indices
+        before_solve = None
+        n_base_controls = d.getControlCount()
+        try:
+            # Add pump trip/restore controls
+            for trip in trips:
+                trip_seconds = int(trip.trip_hour * 3600)
+                restore_seconds = int(trip.restore_hour * 3600)
+
+                # EPyT addControls format: 'LINK <id> <status> AT TIME <seconds>'
+                d.addControls(f"LINK {trip.pump_id} 0 AT TIME {trip_seconds}")
+                d.addControls(f"LINK {trip.pump_id} 1 AT TIME {restore_seconds}")
+            for ctl in controls:
+                seconds = int(round(ctl.hour * 3600))
+                d.addControls(f"LINK {ctl.link_id} {ctl.status} AT TIME {seconds}")
+            if speed_control is not None:
+                duration_s = int(d.getTimeSimulationDuration())
+                for seconds in speed_control.event_times_s(duration_s):
+                    if 0 < seconds < duration_s:
+                        d.addControls(f"LINK {_STEP_MARKER_LINK} 1 AT TIME {int(seconds)}")
+                before_solve = _speed_setter(d, [link_idx[pid] for pid in PUMP_IDS], speed_control)
+
+            for t, flow, velocity, status, head in _step_hydraulics(
+                d,
+                [link_idx[lid] - 1 for lid in self._link_ids],
+                [node_idx[nid] - 1 for nid in self._node_ids],
+                report_only,
+                before_solve,
+            ):
+                yield EPSStep(
+                    time_s=float(t),
+                    link_flow=flow,
+                    link_velocity=velocity,
+                    link_status=status.astype(np.int8),
+                    node_head=head,
+                    link_cols=self._link_cols,
+                    node_cols=self._node_cols,
+                )
+        finally:
+            # Controls renumber on delete, so always remove the last one
+            while d.getControlCount() > n_base_controls:
+                d.deleteControls(d.getControlCount())
+
+
+def _apply_boundary(
+    d: epanet, node_idx: dict[str, int], boundary: BoundaryConditions,
+) -> None:
+    """Attach head patterns to the reservoirs.
 
-        heads: dict[str, list[float]] = {}
-        for nid in all_node_ids:
-            idx = node_idx[nid] - 1
-            heads[nid] = ts.Head[:, idx].tolist()
+    EPANET's reservoir head is elevation × multiplier, so the elevation is
+    set to the largest |head| and the pattern holds head / elevation
+    (this also works for a sea level that crosses the datum).
+    """
+    patterns = boundary.patterns
+    if not patterns:
+        return
+    d.setTimePatternStep(next(iter(patterns.values())).timestep_s)
+    d.setTimePatternStart(0)
+    for rid, pattern in patterns.items():
+        heads = np.asarray(pattern.heads_m)
+        base = float(np.max(np.abs(heads))) or 1.0
+        pat_idx = d.addPattern(f"HEAD_{rid}", (heads / base).tolist())
+        d.setNodeElevations(node_idx[rid], base)
+        d.setNodeReservoirHeadPatternIndex(node_idx[rid], pat_idx)
+
+
+def _speed_setter(
+    d: epanet, pump_idx: list[int], control: SpeedControl,
+) -> Callable[[int], None]:
+    """before_solve hook applying *control* to the open pumps (1-based *pump_idx*)."""
+    api, c = d.api, d.ToolkitConstants
+
+    def before_solve(t: int) -> None:
+        # Rules fire while advancing, so statuses may already differ from
+        # the set of pumps that carried the last solved flows
+        running = [i for i in pump_idx if api.ENgetlinkvalue(i, c.EN_STATUS) > 0]
+        flowing = [i for i in pump_idx if api.ENgetlinkvalue(i, c.EN_FLOW) > _Q_ZERO_LPS]
+        q = None
+        if t > 0 and flowing == running:
+            q = sum(api.ENgetlinkvalue(i, c.EN_FLOW) for i in flowing)
+        speed = control.speed(t, len(running), q)
+        # A non-zero setting would re-open a closed pump, so touch open ones only
+        for i in running:
+            api.ENsetlinkvalue(i, c.EN_SETTING, speed)
+
+    return before_solve
+
+
+def _step_hydraulics(
+    d: epanet,
+    link_cols: list[int],
+    node_cols: list[int],
+    report_only: bool = False,
+    before_solve: Callable[[int], None] | None = None,
+) -> Iterator[tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """Step the hydraulic solver, yielding only the tracked columns.
+
+    Unlike getComputedHydraulicTimeSeries(), which stores every property of
+    every element, this reads link flow/velocity/status and node head once
+    per step and keeps only *link_cols* / *node_cols* (0-based).
+
+    *before_solve(t)*, if given, runs before the solve at each time t
+    (e.g. to set pump speeds from the previous step's state).
+
+    Yields:
+        (t, flow, velocity, status, head) per step; arrays are 1-D over the
+        selected columns.
+    """
+    api, c = d.api, d.ToolkitConstants
+    lcols, ncols = np.asarray(link_cols, dtype=int), np.asarray(node_cols, dtype=int)
+    r_step = d.getTimeReportingStep()
+    r_start = d.getTimeReportingStart()
 
+    api.ENopenH()
+    try:
+        api.ENinitH(c.EN_NOSAVE)
+        t_next = 0
+        while True:
+            if before_solve is not None:
+                before_solve(t_next)
+            t = api.ENrunH()
+            if not report_only or (t >= r_start and (t - r_start) % r_step == 0):
+                yield (
+                    t,
+                    np.asarray(api.ENgetlinkvalues(c.EN_FLOW))[lcols],
+                    np.asarray(api.ENgetlinkvalues(c.EN_VELOCITY))[lcols],
+                    np.asarray(api.ENgetlinkvalues(c.EN_STATUS))[lcols],
+                    np.asarray(api.ENgetnodevalues(c.EN_HEAD))[ncols],
+                )
+            t_step = api.ENnextH()
+            if t_step <= 0:
+                break
+            t_next = t + t_step
     finally:
-        d.unload()
-
-    return EPSResult(
-        time_s=time_s,
-        flows=flows,
-        heads=heads,
-        velocities=velocities,
-        statuses=statuses,
-    )
+        api.ENcloseH()
 
 
 def run_eps_baseline(
     inp_path: str | Path | None = None,
+    use_cache: bool = True,
 ) -> EPSResult:
     """Run 24h EPS with no pump trips (baseline: 4 duty pumps, RIKO at 44%)."""
-    return run_eps_with_trips(inp_path, trips=[])
+    return run_eps_with_trips(inp_path, trips=[], use_cache=use_cache)
@@ -0,0 +1,263 @@
+"""Demand-following pump/RIKO staging over a daily flow target profile.
+
+For each interval the scheduler picks one row of a precomputed
+operating-point table (pump count + RIKO opening, by default the seven
+staging scenarios) so that the day's shaft energy plus switching
+penalties is minimal. Rows that violate Q_MIN_STABLE_LPS per pump or the
+VAG Qmin/Qmax range are never used, and a row is only eligible in an
+interval if it delivers at least the target. Dynamic programming over
+the intervals (state = table row) finds the optimum in
+O(intervals × rows²).
+
+The schedule converts to a StagingControl list that replays in EPS via
+run_eps_with_controls().
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import (
+    DUTY_PUMP_IDS,
+    ETA_DUTY_PCT,
+    INP_FILE_REV3,
+    PUMP_IDS,
+    Q_MIN_STABLE_LPS,
+    RIKO_IDS_ALL,
+    RIKO_OPENINGS_ALL,
+    VAG_QMAX_M3H,
+    VAG_QMIN_M3H,
+    RikoOpening,
+    lps_to_m3h,
+)
+from rosarito.energy import compute_scenario_energy
+from rosarito.model import EPSResult, SteadyStateResult
+from rosarito.scenarios import (
+    StagingControl,
+    run_eps_with_controls,
+    run_staging_scenarios_extended,
+)
+
+PUMP_SWITCH_PENALTY_KWH = 50.0      # per pump start or stop
+VALVE_SWITCH_PENALTY_KWH = 5.0      # per RIKO opening change
+
+
+@dataclass(frozen=True)
+class StagingOption:
+    """One row of the operating-point table."""
+    opening: RikoOpening
+    q_total_lps: float
+    h_pump_m: float
+    power_kw: float         # total shaft power
+
+    @property
+    def n_pumps(self) -> int:
+        return self.opening.n_pumps
+
+    @property
+    def feasible(self) -> bool:
+        """Within the pump minimum stable flow and the VAG sizing range."""
+        q_m3h = lps_to_m3h(self.q_total_lps)
+        return (
+            self.q_total_lps / self.n_pumps >= Q_MIN_STABLE_LPS
+            and VAG_QMIN_M3H <= q_m3h <= VAG_QMAX_M3H
+        )
+
+
+def build_option_table(
+    results: list[SteadyStateResult] | None = None,
+    openings: list[RikoOpening] = RIKO_OPENINGS_ALL,
+    eta_pct: float = ETA_DUTY_PCT,
+) -> list[StagingOption]:
+    """Operating-point table from staging results.
+
+    Args:
+        results: Steady-state results. Defaults to
+                 run_staging_scenarios_extended() on Rev3.
+        openings: Openings the results were solved at (matched on phi and
+                  pump count).
+        eta_pct: Pump efficiency for shaft power.
+    """
+    if results is None:
+        results = run_staging_scenarios_extended(INP_FILE_REV3)
+    by_key = {(o.phi_pct, o.n_pumps): o for o in openings}
+    options = []
+    for r in results:
+        energy = compute_scenario_energy(
+            r.n_active_pumps, r.q_per_pump_lps, r.h_pump_m, eta_pct, hours=1.0,
+        )
+        options.append(StagingOption(
+            opening=by_key[(r.riko_opening_pct, r.n_active_pumps)],
+            q_total_lps=r.q_total_lps,
+            h_pump_m=r.h_pump_m,
+            power_kw=energy.p_total_shaft_kw,
+        ))
+    return options
+
+
+@dataclass
+class ScheduledInterval:
+    """The option chosen for one interval of the profile."""
+    start_h: float
+    hours: float
+    target_lps: float
+    option: StagingOption
+
+    @property
+    def energy_kwh(self) -> float:
+        return self.option.power_kw * self.hours
+
+    @property
+    def shortfall_lps(self) -> float:
+        """Flow missing when no feasible option reaches the target."""
+        return max(0.0, self.target_lps - self.option.q_total_lps)
+
+
+@dataclass
+class StagingSchedule:
+    """Optimal staging for a target profile."""
+    intervals: list[ScheduledInterval]
+    penalty_kwh: float
+    pump_switches: int
+    valve_switches: int
+    options: list[StagingOption] = field(default_factory=list)
+
+    @property
+    def energy_kwh(self) -> float:
+        return sum(iv.energy_kwh for iv in self.intervals)
+
+    @property
+    def objective_kwh(self) -> float:
+        """Energy plus switching penalties (the minimised quantity)."""
+        return self.energy_kwh + self.penalty_kwh
+
+    def controls(self) -> list[StagingControl]:
+        """Pump and GPV status changes reproducing the schedule in EPS.
+
+        The first interval sets every pump and GPV explicitly; later ones
+        only emit links whose status changes. Duty pumps are used in
+        order and the standby stays closed.
+        """
+        controls: list[StagingControl] = []
+        prev: dict[str, int] = {}
+        for iv in self.intervals:
+            running = DUTY_PUMP_IDS[:iv.option.n_pumps]
+            state = {pid: int(pid in running) for pid in PUMP_IDS}
+            state.update({
+                rid: int(rid == iv.option.opening.gpv_link_id) for rid in RIKO_IDS_ALL
+            })
+            controls += [
+                StagingControl(link_id, iv.start_h, status)
+                for link_id, status in state.items()
+                if prev.get(link_id) != status
+            ]
+            prev = state
+        return controls
+
+
+def _switch_cost(
+    a: StagingOption, b: StagingOption, pump_penalty: float, valve_penalty: float,
+) -> float:
+    cost = abs(a.n_pumps - b.n_pumps) * pump_penalty
+    if a.opening.gpv_link_id != b.opening.gpv_link_id:
+        cost += valve_penalty
+    return cost
+
+
+def schedule_staging(
+    target_lps,
+    options: list[StagingOption] | None = None,
+    interval_h: float = 1.0,
+    pump_penalty_kwh: float = PUMP_SWITCH_PENALTY_KWH,
+    valve_penalty_kwh: float = VALVE_SWITCH_PENALTY_KWH,
+    initial: StagingOption | None = None,
+) -> StagingSchedule:
+    """Minimum-energy staging that meets every interval's flow target.
+
+    Intervals whose target exceeds every feasible option run the
+    highest-flow feasible option and report a shortfall.
+
+    Args:
+        target_lps: Intake flow target per interval (l/s).
+        options: Operating-point table. Defaults to build_option_table().
+        interval_h: Interval length in hours.
+        pump_penalty_kwh: Cost charged per pump start or stop.
+        valve_penalty_kwh: Cost charged per RIKO opening change.
+        initial: Option running before the first interval; switching into
+                 the first interval is free if None.
+    """
+    targets = np.asarray(target_lps, dtype=float).ravel()
+    if targets.size == 0:
+        raise ValueError("target profile is empty")
+    if options is None:
+        options = build_option_table()
+    table = [o for o in options if o.feasible]
+    if not table:
+        raise ValueError("no feasible operating point in the option table")
+
+    q = np.array([o.q_total_lps for o in table])
+    energy = np.array([o.power_kw for o in table]) * interval_h
+    switch = np.array([
+        [_switch_cost(a, b, pump_penalty_kwh, valve_penalty_kwh) for b in table]
+        for a in table
+    ])
+
+    # Eligible rows per interval; fall back to the largest flow
+    eligible = q[None, :] >= targets[:, None]
+    short = ~eligible.any(axis=1)
+    eligible[short, int(np.argmax(q))] = True
+    stage_cost = np.where(eligible, energy[None, :], np.inf)
+
+    n, m = stage_cost.shape
+    cost = stage_cost[0].copy()
+    if initial is not None:
+        cost += np.array([
+            _switch_cost(initial, b, pump_penalty_kwh, valve_penalty_kwh) for b in table
+        ])
+    back = np.zeros((n, m), dtype=int)
+    for t in range(1, n):
+        total = cost[:, None] + switch          # [from, to]
+        back[t] = np.argmin(total, axis=0)
+        cost = total[back[t], np.arange(m)] + stage_cost[t]
+
+    path = [int(np.argmin(cost))]
+    for t in range(n - 1, 0, -1):
+        path.append(int(back[t, path[-1]]))
+    path.reverse()
+
+    intervals = [
+        ScheduledInterval(
+            start_h=t * interval_h, hours=interval_h,
+            target_lps=float(targets[t]), option=table[k],
+        )
+        for t, k in enumerate(path)
+    ]
+    chosen = [table[k] for k in path]
+    if initial is not None:
+        chosen.insert(0, initial)
+    pairs = list(zip(chosen, chosen[1:]))
+    return StagingSchedule(
+        intervals=intervals,
+        penalty_kwh=sum(
+            _switch_cost(a, b, pump_penalty_kwh, valve_penalty_kwh) for a, b in pairs
+        ),
+        pump_switches=sum(abs(a.n_pumps - b.n_pumps) for a, b in pairs),
+        valve_switches=sum(a.opening.gpv_link_id != b.opening.gpv_link_id for a, b in pairs),
+        options=table,
+    )
+
+
+def replay_schedule(
+    schedule: StagingSchedule,
+    inp_path: str | Path | None = None,
+) -> EPSResult:
+    """Run the schedule's control list as EPS over its full horizon (Rev3)."""
+    last = schedule.intervals[-1]
+    return run_eps_with_controls(
+        schedule.controls(),
+        inp_path or INP_FILE_REV3,
+        duration_h=last.start_h + last.hours,
+    )
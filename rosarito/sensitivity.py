@@ -0,0 +1,234 @@
+"""One-at-a-time sensitivity of the staging scenarios to uncertain inputs.
+
+H_PLANT is back-calculated, so every operating point shifts if it is
+wrong; sea level, pipe roughness and the RIKO Kv (manufacturer tolerance)
+are uncertain too. Each parameter is swept alone over its range for every
+staging scenario, with the others held at their design values, and the
+results are reduced to spider (metric vs parameter value) and tornado
+(metric at range ends, ranked by swing) data for flow, pump head and
+pump shaft power.
+
+The EPANET engine solves all cases through run_boundary_cases(): one
+loaded model per process, reservoir heads set via node elevation rather
+than reloading the INP. The surrogate engine solves every case in a
+single vectorized call.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import (
+    ETA_DUTY_PCT,
+    H_PLANT,
+    H_SEA,
+    INP_FILE_REV3,
+    RIKO_OPENINGS_ALL,
+    RikoOpening,
+)
+from rosarito.energy import compute_scenario_energy
+from rosarito.scenarios import BoundaryCase, run_boundary_cases
+from rosarito.surrogate import solve_operating_points
+
+METRICS = ("q_total_lps", "h_pump_m", "power_kw")
+PARAMETER_NAMES = ("h_plant_m", "h_sea_m", "roughness_scale", "kv_tolerance_pct")
+ENGINES = ("epanet", "surrogate")
+
+
+@dataclass(frozen=True)
+class SensitivityParameter:
+    """Range of one uncertain input, in the units of BoundaryCase.
+
+    kv_tolerance_pct is applied as Kv × (1 + pct/100).
+    """
+    name: str           # one of PARAMETER_NAMES
+    base: float
+    low: float
+    high: float
+    n_points: int = 5   # spider resolution, range ends included
+
+    def __post_init__(self) -> None:
+        if self.name not in PARAMETER_NAMES:
+            raise ValueError(f"parameter must be one of {PARAMETER_NAMES}, got {self.name!r}")
+        if self.n_points < 2:
+            raise ValueError(f"{self.name}: n_points must be >= 2, got {self.n_points}")
+
+    def values(self) -> np.ndarray:
+        return np.linspace(self.low, self.high, self.n_points)
+
+
+DEFAULT_PARAMETERS: tuple[SensitivityParameter, ...] = (
+    SensitivityParameter("h_plant_m", H_PLANT, H_PLANT - 1.0, H_PLANT + 1.0),
+    SensitivityParameter("h_sea_m", H_SEA, H_SEA - 1.0, H_SEA + 1.0),
+    SensitivityParameter("roughness_scale", 1.0, 0.5, 3.0),
+    SensitivityParameter("kv_tolerance_pct", 0.0, -5.0, 5.0),
+)
+
+
+@dataclass
+class SensitivityPoint:
+    """One solved case: *parameter* set to *value*, all else at design."""
+    opening: RikoOpening
+    parameter: str
+    value: float
+    q_total_lps: float
+    h_pump_m: float
+    power_kw: float     # total shaft power of the running pumps
+
+
+@dataclass
+class TornadoBar:
+    """Metric at both ends of one parameter's range, for one scenario."""
+    opening: RikoOpening
+    parameter: str
+    low_value: float
+    high_value: float
+    metric_base: float
+    metric_low: float
+    metric_high: float
+
+    @property
+    def swing(self) -> float:
+        return abs(self.metric_high - self.metric_low)
+
+
+@dataclass
+class SensitivityResult:
+    """All solved cases plus the design-point baseline per scenario."""
+    parameters: tuple[SensitivityParameter, ...]
+    baseline: dict[RikoOpening, SensitivityPoint]
+    points: list[SensitivityPoint] = field(default_factory=list)
+
+    def spider(
+        self, metric: str,
+    ) -> dict[tuple[float, str], tuple[np.ndarray, np.ndarray]]:
+        """{(phi, parameter): (values, % change of *metric* vs baseline)}."""
+        _check_metric(metric)
+        out: dict[tuple[float, str], tuple[list[float], list[float]]] = {}
+        for p in self.points:
+            base = getattr(self.baseline[p.opening], metric)
+            values, changes = out.setdefault((p.opening.phi_pct, p.parameter), ([], []))
+            values.append(p.value)
+            changes.append(100.0 * (getattr(p, metric) / base - 1.0))
+        return {k: (np.array(v), np.array(c)) for k, (v, c) in out.items()}
+
+    def tornado(self, metric: str) -> list[TornadoBar]:
+        """Range-end bars, grouped by scenario and widest swing first."""
+        _check_metric(metric)
+        by_key = {(p.opening, p.parameter, p.value): p for p in self.points}
+        bars = []
+        for opening, base in self.baseline.items():
+            group = [
+                TornadoBar(
+                    opening=opening,
+                    parameter=par.name,
+                    low_value=par.low,
+                    high_value=par.high,
+                    metric_base=getattr(base, metric),
+                    metric_low=getattr(by_key[(opening, par.name, par.low)], metric),
+                    metric_high=getattr(by_key[(opening, par.name, par.high)], metric),
+                )
+                for par in self.parameters
+            ]
+            bars += sorted(group, key=lambda b: b.swing, reverse=True)
+        return bars
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+
+
+def _case(opening: RikoOpening, name: str | None = None, value: float = 0.0) -> BoundaryCase:
+    """BoundaryCase at design values, with *name* overridden by *value*."""
+    kv_scale = 1.0 + (value / 100.0 if name == "kv_tolerance_pct" else 0.0)
+    case = BoundaryCase(
+        n_pumps=opening.n_pumps,
+        kv_m3h=opening.kv_m3h * kv_scale,
+        phi_pct=opening.phi_pct,
+    )
+    if name in ("h_plant_m", "h_sea_m", "roughness_scale"):
+        case = replace(case, **{name: value})
+    return case
+
+
+def _solve(
+    cases: list[BoundaryCase], engine: str, inp_path: str | Path, workers: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(q_total_lps, h_pump_m) arrays for *cases*."""
+    if engine == "surrogate":
+        r = solve_operating_points(
+            [c.n_pumps for c in cases],
+            [c.kv_m3h for c in cases],
+            h_plant_m=[c.h_plant_m for c in cases],
+            h_sea_m=[c.h_sea_m for c in cases],
+            roughness_scale=[c.roughness_scale for c in cases],
+            friction="swamee-jain",
+        )
+        return r.q_total_lps, r.h_pump_m
+    results = run_boundary_cases(cases, inp_path, workers=workers)
+    return (
+        np.array([r.q_total_lps for r in results]),
+        np.array([r.h_pump_m for r in results]),
+    )
+
+
+def run_sensitivity(
+    parameters: tuple[SensitivityParameter, ...] = DEFAULT_PARAMETERS,
+    openings: list[RikoOpening] | None = None,
+    engine: str = "epanet",
+    inp_path: str | Path | None = None,
+    workers: int = 1,
+    eta_pct: float = ETA_DUTY_PCT,
+) -> SensitivityResult:
+    """Sweep each parameter over its range for every staging scenario.
+
+    All cases (baselines included) are solved in one batch.
+
+    Args:
+        parameters: Inputs to vary, one at a time.
+        openings: Staging scenarios. Defaults to RIKO_OPENINGS_ALL.
+        engine: "epanet" or "surrogate" (vectorized, Swamee-Jain friction
+                as in EPANET).
+        inp_path: Path to INP file. Defaults to Rev3.
+        workers: EPANET processes to use; 1 runs in-process.
+        eta_pct: Pump efficiency for shaft power.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    if openings is None:
+        openings = RIKO_OPENINGS_ALL
+
+    labels: list[tuple[RikoOpening, str | None, float]] = [
+        (o, None, 0.0) for o in openings
+    ]
+    for o in openings:
+        for par in parameters:
+            labels += [(o, par.name, float(v)) for v in par.values()]
+
+    q, h = _solve(
+        [_case(o, name, v) for o, name, v in labels],
+        engine, inp_path or INP_FILE_REV3, workers,
+    )
+
+    points = []
+    for (o, name, v), q_i, h_i in zip(labels, q, h):
+        energy = compute_scenario_energy(o.n_pumps, q_i / o.n_pumps, h_i, eta_pct, hours=1.0)
+        points.append(SensitivityPoint(
+            opening=o,
+            parameter=name or "baseline",
+            value=v,
+            q_total_lps=float(q_i),
+            h_pump_m=float(h_i),
+            power_kw=energy.p_total_shaft_kw,
+        ))
+
+    n_base = len(openings)
+    return SensitivityResult(
+        parameters=tuple(parameters),
+        baseline={p.opening: p for p in points[:n_base]},
+        points=points[n_base:],
+    )
@@ -0,0 +1,93 @@
+"""CLI startup profile: ``python -X importtime`` breakdown of a command's imports.
+
+profile_startup() runs a statement in a fresh interpreter under
+``-X importtime`` and parses the per-module self/cumulative import times
+the interpreter writes to stderr, plus the wall time of the whole
+process (interpreter start to exit), which is what a cron job pays
+before a command does any work.
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One ``-X importtime`` line (times in microseconds)."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int              # nesting level; 0 = imported directly
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+@dataclass
+class StartupProfile:
+    """Import-time breakdown and wall time of one startup."""
+    label: str
+    wall_s: float
+    records: list[ImportRecord]
+
+    @property
+    def import_s(self) -> float:
+        """Total import time (sum of the top-level imports' cumulative time)."""
+        return sum(r.cumulative_us for r in self.records if r.depth == 0) / 1e6
+
+    def by_package(self) -> dict[str, float]:
+        """Self import time (s) per top-level package, largest first."""
+        totals: dict[str, float] = {}
+        for r in self.records:
+            totals[r.package] = totals.get(r.package, 0.0) + r.self_us / 1e6
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def slowest(self, n: int = 10) -> list[ImportRecord]:
+        """The *n* modules with the largest self import time."""
+        return sorted(self.records, key=lambda r: -r.self_us)[:n]
+
+    def loaded(self, package: str) -> bool:
+        return any(r.package == package for r in self.records)
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    """Records from ``-X importtime`` output (other lines are ignored)."""
+    records = []
+    for line in text.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cum_us, indent, module = m.groups()
+            records.append(ImportRecord(module, int(self_us), int(cum_us), len(indent) // 2))
+    return records
+
+
+def profile_startup(
+    statement: str,
+    label: str | None = None,
+    cwd: str | Path | None = None,
+) -> StartupProfile:
+    """Run *statement* in a fresh ``python -X importtime`` and profile it.
+
+    Args:
+        statement: Python source passed to ``-c``.
+        label: Name for the profile. Defaults to the statement.
+        cwd: Working directory of the child interpreter.
+    """
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    wall_s = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup profile of {statement!r} failed:\n{proc.stderr[-2000:]}")
+    return StartupProfile(label or statement, wall_s, parse_importtime(proc.stderr))
@@ -13,6 +13,7 @@ from rosarito.model import SteadyStateResult, EPSResult
 from rosarito.energy import ScenarioEnergyResult
 from rosarito.validation import ScenarioValidation
 from rosarito.eps_utils import iter_eps_events
+from rosarito.scenarios import EnvelopePoint
 
 
 def staging_dataframe(results: list[SteadyStateResult]) -> pd.DataFrame:
@@ -37,6 +38,25 @@ def staging_dataframe(results: list[SteadyStateResult]) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
+def envelope_dataframe(points: list[EnvelopePoint]) -> pd.DataFrame:
+    """Build the dense RIKO operating-envelope table (one row per point)."""
+    rows = []
+    for p in points:
+        rows.append({
+            "Pumps": p.n_pumps,
+            "RIKO (%)": f"{p.phi_pct:g}",
+            "Kv (m³/h)": f"{p.kv_m3h:,.2f}",
+            "Q_total (l/s)": f"{p.q_total_lps:.1f}",
+            "Q_total (m³/h)": f"{p.q_total_m3h:.0f}",
+            "Q/pump (l/s)": f"{p.q_per_pump_lps:.1f}",
+            "H_pump (m)": f"{p.h_pump_m:.2f}",
+            "dH_RIKO (m)": f"{p.dh_riko_m:.2f}",
+            "Pump Qmin": "OK" if p.pump_flow_ok else "LOW",
+            "VAG range": "OK" if p.valve_flow_ok else "OUT",
+        })
+    return pd.DataFrame(rows)
+
+
 def energy_dataframe(energy: list[ScenarioEnergyResult]) -> pd.DataFrame:
     """Build the energy summary table."""
     rows = []
@@ -0,0 +1,341 @@
+"""Time-of-use electricity cost of pump operation over an EPS run.
+
+A Tariff prices energy by calendar time: a flat price (optionally scaled
+by an EPANET-style cyclic price pattern, as in the INP [ENERGY] section),
+overridden by seasonal 24-hour price tables, plus peak windows that add
+an energy surcharge and/or bill their own monthly peak demand. A demand
+charge on the overall monthly peak applies as in EPANET's Demand Charge.
+Billed demand is the largest mean power over a fixed demand interval
+(15 min by default), as a utility meter records it, so a solver step of
+a few seconds (e.g. a pump-switching transient) cannot set the peak.
+
+Cost is integrated exactly without looping over steps: pump power is
+held constant over each hydraulic step (as in EPSEnergyAccumulator) and
+the price is piecewise constant on a fixed grid, so the cost of a step is
+its power times the increase of the cumulative price integral across it.
+A year of 5-minute steps costs a few NumPy passes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from math import gcd
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import ETA_DUTY_PCT, INP_FILE, PUMP_IDS
+from rosarito.energy import EfficiencyCurve, eps_pump_power_kw
+from rosarito.inp import load_inp
+from rosarito.model import EPSResult
+
+ALL_MONTHS: tuple[int, ...] = tuple(range(1, 13))
+DEFAULT_START = "2026-01-01T00:00"
+
+
+@dataclass(frozen=True)
+class Season:
+    """Energy price per kWh by hour of day, for the given months."""
+    name: str
+    months: tuple[int, ...]             # 1-12
+    hourly_price: tuple[float, ...]     # 24 values, hour 0 = 00:00-01:00
+
+    def __post_init__(self) -> None:
+        if len(self.hourly_price) != 24:
+            raise ValueError(f"{self.name}: need 24 hourly prices, got {len(self.hourly_price)}")
+        if not set(self.months) <= set(ALL_MONTHS):
+            raise ValueError(f"{self.name}: months must be 1-12, got {self.months}")
+
+
+@dataclass(frozen=True)
+class PeakWindow:
+    """Daily window with an energy surcharge and/or its own demand charge.
+
+    A window with start_h > end_h wraps past midnight.
+    """
+    name: str
+    start_h: float
+    end_h: float
+    demand_charge_per_kw: float = 0.0   # on the monthly peak inside the window
+    price_adder_per_kwh: float = 0.0
+    months: tuple[int, ...] = ALL_MONTHS
+    weekdays_only: bool = False
+
+    def active(
+        self, month: np.ndarray, hour: np.ndarray, weekday: np.ndarray,
+    ) -> np.ndarray:
+        """Boolean mask of the calendar samples inside the window."""
+        if self.start_h <= self.end_h:
+            in_hours = (hour >= self.start_h) & (hour < self.end_h)
+        else:
+            in_hours = (hour >= self.start_h) | (hour < self.end_h)
+        mask = in_hours & np.isin(month, self.months)
+        if self.weekdays_only:
+            mask &= weekday < 5
+        return mask
+
+
+@dataclass(frozen=True)
+class Tariff:
+    """Electricity tariff; prices per kWh and charges per kW per month."""
+    price_per_kwh: float = 0.08
+    price_pattern: tuple[float, ...] = ()   # cyclic multipliers on price_per_kwh
+    pattern_step_s: int = 3600
+    seasons: tuple[Season, ...] = ()
+    demand_charge_per_kw: float = 0.0       # on the overall monthly peak
+    peak_windows: tuple[PeakWindow, ...] = ()
+    start: str = DEFAULT_START              # calendar time of t = 0
+    demand_interval_s: int = 900            # demand is metered as the mean over this
+
+    def __post_init__(self) -> None:
+        if self.demand_interval_s <= 0:
+            raise ValueError(f"demand_interval_s must be positive, got {self.demand_interval_s}")
+
+    @property
+    def grid_step_s(self) -> int:
+        """Step on which the price is piecewise constant."""
+        step = 3600
+        if self.price_pattern:
+            step = gcd(step, int(self.pattern_step_s))
+        for w in self.peak_windows:
+            for h in (w.start_h, w.end_h):
+                step = gcd(step, int(round(h * 3600.0)) % 3600 or 3600)
+        return step
+
+    def clock_phase_s(self, step_s: float) -> float:
+        """How far start lies past a clock boundary of *step_s* (counted from midnight).
+
+        Calendar grids in run time are anchored at -clock_phase_s(step_s),
+        so their edges fall on the clock, not on multiples of t = 0.
+        """
+        t = np.datetime64(self.start, "s")
+        return float((t - t.astype("datetime64[D]")).astype(np.int64) % int(step_s))
+
+    def calendar(self, time_s) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(month 1-12, hour of day, weekday 0=Monday) at run times *time_s*."""
+        t = np.datetime64(self.start, "s") + np.asarray(time_s).astype("timedelta64[s]")
+        days = t.astype("datetime64[D]")
+        month = t.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        hour = (t - days).astype(np.int64) / 3600.0
+        weekday = (days.astype(np.int64) + 3) % 7     # 1970-01-01 was a Thursday
+        return month, hour, weekday
+
+    def price_at(self, time_s) -> np.ndarray:
+        """Energy price per kWh in effect at run times *time_s*."""
+        t = np.asarray(time_s, dtype=np.float64)
+        price = np.full(t.shape, float(self.price_per_kwh))
+        if self.price_pattern:
+            k = (t // self.pattern_step_s).astype(np.int64) % len(self.price_pattern)
+            price *= np.asarray(self.price_pattern)[k]
+        month, hour, weekday = self.calendar(t)
+        for s in self.seasons:
+            mask = np.isin(month, s.months)
+            price[mask] = np.asarray(s.hourly_price)[hour[mask].astype(np.int64)]
+        for w in self.peak_windows:
+            if w.price_adder_per_kwh:
+                price += w.price_adder_per_kwh * w.active(month, hour, weekday)
+        return price
+
+
+# Illustrative three-period industrial tariff (base / intermediate / peak),
+# with a summer season, weekday evening peak and peak-window demand charge
+_WINTER = (0.06,) * 6 + (0.09,) * 12 + (0.14,) * 4 + (0.09,) * 2
+_SUMMER = (0.07,) * 6 + (0.10,) * 12 + (0.18,) * 4 + (0.10,) * 2
+EXAMPLE_TOU_TARIFF = Tariff(
+    price_per_kwh=0.09,
+    seasons=(
+        Season("winter", (11, 12, 1, 2, 3, 4), _WINTER),
+        Season("summer", (5, 6, 7, 8, 9, 10), _SUMMER),
+    ),
+    demand_charge_per_kw=4.0,
+    peak_windows=(PeakWindow("peak", 18.0, 22.0, demand_charge_per_kw=12.0, weekdays_only=True),),
+)
+
+
+def tariff_from_inp(inp_path: str | Path | None = None, start: str = DEFAULT_START) -> Tariff:
+    """Tariff equivalent to the INP [ENERGY] Global Price/Pattern and Demand Charge."""
+    inp = load_inp(inp_path or INP_FILE)
+    pattern: tuple[float, ...] = ()
+    if inp.energy.global_pattern is not None:
+        pattern = tuple(inp.patterns[inp.energy.global_pattern].tolist())
+    return Tariff(
+        price_per_kwh=inp.energy.global_price,
+        price_pattern=pattern,
+        pattern_step_s=inp.times.pattern_step_s,
+        demand_charge_per_kw=inp.energy.demand_charge,
+        start=start,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cost integration
+# ---------------------------------------------------------------------------
+
+@dataclass
+class DemandCharge:
+    """Peak demand billed for one month, overall or inside one peak window."""
+    month: str          # "YYYY-MM"
+    window: str         # "all" or PeakWindow.name
+    peak_kw: float
+    cost: float
+
+
+@dataclass
+class EPSCostResult:
+    """Energy and demand cost of the pumps over an EPS run."""
+    hours: float
+    energy_kwh: float
+    energy_cost: float
+    pump_energy_kwh: dict[str, float]
+    pump_cost: dict[str, float]         # energy cost + coincident-peak share of demand
+    demand_charges: list[DemandCharge] = field(default_factory=list)
+
+    @property
+    def demand_cost(self) -> float:
+        return sum(c.cost for c in self.demand_charges)
+
+    @property
+    def total_cost(self) -> float:
+        return self.energy_cost + self.demand_cost
+
+    @property
+    def average_price_per_kwh(self) -> float:
+        return self.total_cost / self.energy_kwh if self.energy_kwh else 0.0
+
+
+def _price_integral(tariff: Tariff, time_s: np.ndarray) -> np.ndarray:
+    """Cumulative ∫ price dt (price × h) from t = 0 to each time.
+
+    The price only changes on calendar grid edges (clock-aligned, see
+    Tariff.clock_phase_s) and on price pattern steps (run time, as in
+    EPANET), so it is constant between the union of the two.
+    """
+    t_end = float(time_s[-1])
+    step = tariff.grid_step_s
+    parts = [np.arange(-tariff.clock_phase_s(step), t_end, step)]
+    if tariff.price_pattern:
+        parts.append(np.arange(0.0, t_end, tariff.pattern_step_s))
+    inner = np.concatenate(parts)
+    edges = np.union1d(inner[inner > 0.0], [0.0, max(t_end, 1.0)])
+    widths_h = np.diff(edges) / 3600.0
+    cum = np.concatenate(([0.0], np.cumsum(tariff.price_at(edges[:-1]) * widths_h)))
+    return np.interp(time_s, edges, cum)
+
+
+def _interval_demand(
+    tariff: Tariff, time_s: np.ndarray, power_kw: np.ndarray, dt_h: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mean power per pump over each demand interval the run covers.
+
+    Intervals lie on a clock-aligned grid of tariff.demand_interval_s (a
+    15-min meter reads at :00, :15, ... whatever the run's start); the
+    first and last are clipped to the run and averaged over what it covers.
+
+    Returns:
+        (interval start times (n_int,), mean kW (n_int, n_pumps))
+    """
+    step = float(tariff.demand_interval_s)
+    t0, t1 = time_s[0], time_s[-1]
+    first = t0 - (t0 + tariff.clock_phase_s(step)) % step
+    starts = np.arange(first, t1, step)
+    bounds = np.clip(np.append(starts, starts[-1] + step), t0, t1)
+    # Cumulative kWh per pump is piecewise linear between steps
+    cum_kwh = np.vstack((np.zeros(power_kw.shape[1]), np.cumsum(power_kw * dt_h[:, None], axis=0)))
+    at_bounds = np.column_stack([np.interp(bounds, time_s, col) for col in cum_kwh.T])
+    mean_kw = np.diff(at_bounds, axis=0) / (np.diff(bounds) / 3600.0)[:, None]
+    return bounds[:-1], mean_kw
+
+
+def _demand_charges(
+    tariff: Tariff, time_s: np.ndarray, power_kw: np.ndarray, dt_h: np.ndarray,
+) -> tuple[list[DemandCharge], np.ndarray]:
+    """Monthly demand charges and their allocation per pump.
+
+    Args:
+        time_s: All step times (n_steps,).
+        power_kw: Per-pump power held over each step (n_steps - 1, n_pumps).
+        dt_h: Step durations in hours (n_steps - 1,).
+    """
+    start_s, power_kw = _interval_demand(tariff, time_s, power_kw, dt_h)
+    total_kw = power_kw.sum(axis=1)
+    month, hour, weekday = tariff.calendar(start_s)
+    billing = (np.datetime64(tariff.start, "s") + start_s.astype("timedelta64[s]")).astype(
+        "datetime64[M]"
+    )
+    windows = [("all", tariff.demand_charge_per_kw, np.ones(len(start_s), dtype=bool))]
+    windows += [
+        (w.name, w.demand_charge_per_kw, w.active(month, hour, weekday))
+        for w in tariff.peak_windows if w.demand_charge_per_kw
+    ]
+    charges: list[DemandCharge] = []
+    allocated = np.zeros(power_kw.shape[1])
+    for period in np.unique(billing):
+        in_period = billing == period
+        for name, rate, mask in windows:
+            if not rate:
+                continue
+            kw = np.where(in_period & mask, total_kw, -np.inf)
+            k = int(np.argmax(kw))
+            if not np.isfinite(kw[k]):
+                continue
+            cost = rate * total_kw[k]
+            charges.append(DemandCharge(str(period), name, float(total_kw[k]), float(cost)))
+            if total_kw[k] > 0.0:
+                allocated += cost * power_kw[k] / total_kw[k]
+    return charges, allocated
+
+
+def compute_eps_cost(
+    eps: EPSResult,
+    tariff: Tariff | None = None,
+    eta_pct: float = ETA_DUTY_PCT,
+    efficiency: Mapping[str, EfficiencyCurve] | None = None,
+) -> EPSCostResult:
+    """Energy and demand cost of the pumps over *eps*.
+
+    Args:
+        eps: EPS results (any length; steps need not be uniform).
+        tariff: Tariff to apply. Defaults to Tariff(), a flat 0.08/kWh with
+                no demand charge (see tariff_from_inp for the INP's own).
+        eta_pct: Pump efficiency for shaft power.
+        efficiency: Per-pump efficiency curves (see
+                    energy.load_pump_efficiency); overrides eta_pct.
+    """
+    if tariff is None:
+        tariff = Tariff()
+    time_s = np.asarray(eps.time_s, dtype=np.float64)
+    if len(time_s) < 2:
+        zero = {pid: 0.0 for pid in PUMP_IDS}
+        return EPSCostResult(0.0, 0.0, 0.0, zero, dict(zero))
+
+    # Each step's power holds until the next step; the last step has no duration
+    power_kw = eps_pump_power_kw(eps, eta_pct, efficiency)[:-1]
+    dt_h = np.diff(time_s) / 3600.0
+    d_price = np.diff(_price_integral(tariff, time_s))
+
+    pump_kwh = dt_h @ power_kw
+    pump_energy_cost = d_price @ power_kw
+    charges, allocated = _demand_charges(tariff, time_s, power_kw, dt_h)
+    return EPSCostResult(
+        hours=float(time_s[-1] - time_s[0]) / 3600.0,
+        energy_kwh=float(pump_kwh.sum()),
+        energy_cost=float(pump_energy_cost.sum()),
+        pump_energy_kwh=dict(zip(PUMP_IDS, pump_kwh.tolist())),
+        pump_cost=dict(zip(PUMP_IDS, (pump_energy_cost + allocated).tolist())),
+        demand_charges=charges,
+    )
+
+
+def rank_by_cost(
+    runs: Mapping[str, EPSResult],
+    tariff: Tariff | None = None,
+    eta_pct: float = ETA_DUTY_PCT,
+    efficiency: Mapping[str, EfficiencyCurve] | None = None,
+) -> list[tuple[str, EPSCostResult]]:
+    """Cost every run under *tariff*, cheapest first."""
+    costs = [
+        (label, compute_eps_cost(eps, tariff, eta_pct, efficiency))
+        for label, eps in runs.items()
+    ]
+    return sorted(costs, key=lambda item: item[1].total_cost)
@@ -1,22 +1,41 @@
 """Validation of computed results vs hand-calculated reference points.
 
 Compares EPANET solver output against Section 5 of Project Instructions.
+Openings without a hand-calculated point are checked against a reference
+computed fresh with the same assumptions (rosarito.reference).
 Flags deviations > 5% per review standard (Section 11).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
 
 from rosarito.constants import (
+    H_PLANT,
+    H_RATED_M,
+    H_RUNOUT_M,
+    H_SEA,
+    H_SHUTOFF_M,
+    INP_FILE,
+    KV_CONSTANT,
+    PUMP_IDS,
     Q_MIN_STABLE_LPS,
+    Q_RATED_LPS,
+    Q_RUNOUT_LPS,
     VAG_QMIN_M3H,
     REFERENCE_BY_NPUMPS,
     REFERENCE_BY_PHI,
     ReferenceOperatingPoint,
+    RikoOpening,
     lps_to_m3h,
 )
+from rosarito.inp import gpv_phi_pct, load_inp
 from rosarito.model import SteadyStateResult
+from rosarito.reference import compute_reference_points
+from rosarito.valve import kv_at
 
 
 TOLERANCE_PCT = 5.0  # Flag deviations > 5%
@@ -66,21 +85,63 @@ def _check(
     )
 
 
+def _literal_reference(result: SteadyStateResult) -> ReferenceOperatingPoint | None:
+    """Hand-calculated point at the result's (n_pumps, phi), if one exists."""
+    for ref in (
+        REFERENCE_BY_NPUMPS.get(result.n_active_pumps),
+        REFERENCE_BY_PHI.get(result.riko_opening_pct),
+    ):
+        if (
+            ref is not None
+            and ref.n_pumps == result.n_active_pumps
+            and ref.phi_pct == result.riko_opening_pct
+        ):
+            return ref
+    return None
+
+
+def _result_opening(result: SteadyStateResult) -> RikoOpening:
+    """Opening (Kv interpolated from the CSV) the result was solved at."""
+    return RikoOpening(
+        phi_pct=result.riko_opening_pct,
+        kv_m3h=float(kv_at(result.riko_opening_pct)),
+        n_pumps=result.n_active_pumps,
+        gpv_link_id="",
+        curve_id="",
+    )
+
+
+def computed_reference(result: SteadyStateResult) -> ReferenceOperatingPoint | None:
+    """Reference freshly computed at the result's opening.
+
+    None if the opening lies outside the Kv table.
+    """
+    try:
+        opening = _result_opening(result)
+    except ValueError:
+        return None
+    return compute_reference_points([opening])[0]
+
+
 def validate_steady_state(
     result: SteadyStateResult,
     ref: ReferenceOperatingPoint | None = None,
 ) -> ScenarioValidation:
-    """Validate one computed scenario against a hand-calculated reference.
+    """Validate one computed scenario against a reference operating point.
 
-    If *ref* is not provided, looks up by n_active_pumps in REFERENCE_BY_NPUMPS.
+    If *ref* is not provided, the hand-calculated point at the same
+    (n_pumps, phi) is used, or else a freshly computed reference.
     """
     if ref is None:
-        ref = REFERENCE_BY_NPUMPS.get(result.n_active_pumps)
+        ref = _literal_reference(result) or computed_reference(result)
     if ref is None:
         return ScenarioValidation(
             n_pumps=result.n_active_pumps,
             phi_pct=result.riko_opening_pct,
-            warnings=[f"No reference point for {result.n_active_pumps}-pump scenario"],
+            warnings=[
+                f"No reference point for {result.n_active_pumps}-pump scenario "
+                f"at phi={result.riko_opening_pct}%"
+            ],
         )
 
     val = ScenarioValidation(
@@ -126,3 +187,45 @@ def validate_all_extended(
         validate_steady_state(r, ref=REFERENCE_BY_PHI.get(r.riko_opening_pct))
         for r in results
     ]
+
+
+def validate_against_computed(
+    results: list[SteadyStateResult],
+) -> list[ScenarioValidation]:
+    """Validate any openings against references computed in one batch.
+
+    Every result's reference comes from compute_reference_points(), even
+    where a hand-calculated literal exists.
+    """
+    refs = compute_reference_points([_result_opening(r) for r in results])
+    return [validate_steady_state(r, ref) for r, ref in zip(results, refs)]
+
+
+# ---------------------------------------------------------------------------
+# INP input data
+# ---------------------------------------------------------------------------
+
+def validate_inp_inputs(inp_path: str | Path | None = None) -> list[ParameterCheck]:
+    """Check an INP's design inputs against the datasheets, without EPANET.
+
+    Compares the pump head curve with the Ruhrpumpen points, the reservoir
+    heads with H_SEA/H_PLANT, and the Kv implied by each RIKO GPV curve
+    (at its highest flow, least affected by rounding) with the Kv CSV.
+    """
+    inp = load_inp(inp_path or INP_FILE)
+    checks = []
+    head = inp.pump_curve(PUMP_IDS[0])
+    for q, h_ref in ((0.0, H_SHUTOFF_M), (Q_RATED_LPS, H_RATED_M), (Q_RUNOUT_LPS, H_RUNOUT_M)):
+        h = float(np.interp(q, head.x, head.y))
+        checks.append(_check(f"{head.id} H@{q:g}", h, h_ref, "m"))
+    for rid, h_ref in (("SEA", H_SEA), ("PLANT", H_PLANT)):
+        if rid in inp.reservoirs:
+            checks.append(_check(f"{rid} head", inp.reservoirs[rid].head_m, h_ref, "m"))
+    for valve_id, curve in inp.gpv_curves().items():
+        phi = gpv_phi_pct(curve.id)
+        if phi is None:
+            continue
+        k = int(np.argmax(curve.x))
+        kv = float(curve.x[k] * np.sqrt(KV_CONSTANT / curve.y[k]))
+        checks.append(_check(f"{valve_id} Kv", kv, float(kv_at(phi)), "m3/h"))
+    return checks
@@ -0,0 +1,89 @@
+"""VAG RIKO DN1800 Kv characteristic and Kv-based GPV curves.
+
+Reads the exact 2%-step rows of riko_cylinder_e_dn1800.csv and builds
+EPANET GPV headloss curves from the ISO 5167 Kv equation:
+dH = Q(l/s)² × 132.15 / Kv²  [m]
+"""
+
+from __future__ import annotations
+
+import csv
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import RIKO_CSV, KV_CONSTANT, H_SHUTOFF_M
+
+GPV_CURVE_POINTS = 51  # points per generated GPV curve
+
+
+@lru_cache(maxsize=4)
+def _read_riko_csv(path: str) -> dict[str, tuple[float, ...]]:
+    """Every CSV column as floats: '%' and thousands separators stripped."""
+    columns: dict[str, list[float]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            for name, value in row.items():
+                columns.setdefault(name, []).append(
+                    float(value.rstrip("%").replace(",", ""))
+                )
+    return {name: tuple(values) for name, values in columns.items()}
+
+
+def _read_kv_table(path: str) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    table = _read_riko_csv(path)
+    return table["valve_position"], table["kv_value"]
+
+
+def load_riko_table(path: str | Path | None = None) -> dict[str, np.ndarray]:
+    """All CSV columns by header name (valve_position in %), ascending in phi."""
+    return {
+        name: np.array(values) for name, values in _read_riko_csv(str(path or RIKO_CSV)).items()
+    }
+
+
+def load_riko_kv(
+    path: str | Path | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (phi %, Kv m³/h) arrays for every CSV row, ascending in phi."""
+    phi, kv = _read_kv_table(str(path or RIKO_CSV))
+    return np.array(phi), np.array(kv)
+
+
+def kv_at(phi_pct, path: str | Path | None = None) -> np.ndarray:
+    """Kv (m³/h) at arbitrary opening(s), linear between CSV rows.
+
+    Exact CSV values are returned on the 2% grid.
+    """
+    phi_tab, kv_tab = load_riko_kv(path)
+    phi = np.asarray(phi_pct, dtype=float)
+    if np.any(phi < phi_tab[0]) or np.any(phi > phi_tab[-1]):
+        raise ValueError(
+            f"phi must lie within {phi_tab[0]:g}–{phi_tab[-1]:g}% of the Kv table"
+        )
+    return np.interp(phi, phi_tab, kv_tab)
+
+
+def headloss_m(q_lps, kv_m3h):
+    """RIKO headloss (m) for flow in l/s: dH = Q² × 132.15 / Kv²."""
+    return np.asarray(q_lps) ** 2 * KV_CONSTANT / np.asarray(kv_m3h) ** 2
+
+
+def gpv_curve_points(
+    kv_m3h: float,
+    q_max_lps: float,
+    n_points: int = GPV_CURVE_POINTS,
+) -> list[list[float]]:
+    """Build a GPV curve [[Q l/s, dH m], ...] for one Kv.
+
+    The flow range ends at whichever comes first: *q_max_lps* or the flow
+    whose headloss equals the pump shutoff head (the valve can never see
+    more). Uniform spacing then keeps the linear-interpolation error of the
+    quadratic below ~5 mm over the whole range, for any Kv.
+    """
+    q_valve_limit = kv_m3h * (H_SHUTOFF_M / KV_CONSTANT) ** 0.5
+    q_top = min(q_max_lps, q_valve_limit)
+    q = np.linspace(0.0, q_top, n_points)
+    dh = headloss_m(q, kv_m3h)
+    return [[float(a), float(b)] for a, b in zip(q, dh)]
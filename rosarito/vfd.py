@@ -0,0 +1,290 @@
+"""VFD extended period simulation: pump speed control with the RIKO fully open.
+
+The throttled EPS (scenarios.run_eps_with_trips) runs the pumps at rated
+speed and the INP rules pick a RIKO opening per pump count. Here every
+GPV curve is replaced by the fully open Kv, so whichever GPV the rules
+open no longer throttles, and the running pumps' speed setting is
+driven between hydraulic steps by either
+
+* SpeedSchedule — speed as a step function of time, or
+* FlowSetpointController — speed that tracks a total flow target:
+  feed-forward from a VFDTable at the current pump count, trimmed by
+  integral feedback on the measured flow.
+
+Trips, restores and standby starts still come from the controls and
+rules, so the results line up one-to-one with the throttled EPS.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.boundary import BoundaryConditions
+from rosarito.constants import (
+    ETA_DUTY_PCT,
+    INP_FILE,
+    N_TOTAL_PUMPS,
+    PUMP_IDS,
+    Q_RUNOUT_LPS,
+    RIKO_OPENINGS_ALL,
+)
+from rosarito.energy import EfficiencyCurve, EPSEnergyResult, integrate_eps_energy
+from rosarito.model import EPSResult
+from rosarito.optimization import VFDTable, build_vfd_table
+from rosarito.scenarios import (
+    DEFAULT_PUMP_TRIPS,
+    EPS_DTYPES,
+    EPSSession,
+    PumpTripEvent,
+    collect_eps,
+)
+from rosarito.valve import gpv_curve_points, kv_at
+
+SPEED_MIN = 0.60        # lowest continuous VFD speed (cooling/Q_min stability)
+SPEED_MAX = 1.00
+RIKO_FULL_OPEN_PCT = 100.0
+
+
+# ---------------------------------------------------------------------------
+# Speed controllers
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SpeedSchedule:
+    """Speed ratio as a step function of time: (hour, speed) breakpoints.
+
+    The first speed also applies before the first breakpoint.
+    """
+    points: tuple[tuple[float, float], ...]
+    # Breakpoint times (s) and speeds, built once for speed() lookups
+    _times_s: np.ndarray = field(init=False, repr=False, compare=False)
+    _speeds: tuple[float, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.points:
+            raise ValueError("a speed schedule needs at least one (hour, speed) point")
+        hours = [h for h, _ in self.points]
+        if hours != sorted(hours):
+            raise ValueError("speed schedule hours must be ascending")
+        if any(not 0.0 < s <= 1.5 for _, s in self.points):
+            raise ValueError("speed ratios must lie in (0, 1.5]")
+        object.__setattr__(self, "_times_s", np.array(hours, dtype=np.float64) * 3600.0)
+        object.__setattr__(self, "_speeds", tuple(float(s) for _, s in self.points))
+
+    def event_times_s(self, duration_s: int) -> list[int]:
+        return [int(round(h * 3600)) for h, _ in self.points]
+
+    def speed(self, time_s: int, n_running: int, q_total_lps: float | None) -> float:
+        k = max(int(np.searchsorted(self._times_s, time_s, side="right")) - 1, 0)
+        return self._speeds[k]
+
+
+@dataclass
+class FlowSetpointController:
+    """Track a total pump flow target by speed.
+
+    Each step starts from the table speed for the target at the current
+    pump count, multiplied by an integral trim that removes the steady
+    offset between the table and EPANET (other network, boundary
+    patterns). The trim only learns from steps solved with the same pumps
+    and target, so trips and target changes do not wind it up. Flow
+    changes 2-3× faster than speed in relative terms against the static
+    lift, hence the modest default gain.
+
+    Args:
+        target_lps: Flow target per interval (scalar = constant).
+        interval_h: Length of each target interval.
+        table: Operating-point table. Built for the fully open RIKO if None.
+        gain: Integral gain on the relative flow error.
+        speed_min, speed_max: Speed limits.
+    """
+    target_lps: float | list[float] | tuple[float, ...]
+    interval_h: float = 1.0
+    table: VFDTable | None = None
+    gain: float = 0.3
+    speed_min: float = SPEED_MIN
+    speed_max: float = SPEED_MAX
+    _trim: float = field(default=1.0, init=False, repr=False)
+    _last: tuple[int, float] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.table is None:
+            self.table = build_vfd_table(
+                kv_m3h=float(kv_at(RIKO_FULL_OPEN_PCT)),
+                speeds=np.round(np.arange(0.40, 1.0001, 0.005), 3),
+            )
+        self._targets = np.atleast_1d(np.asarray(self.target_lps, dtype=float))
+
+    def target_at(self, time_s: float) -> float:
+        k = min(int(time_s // (self.interval_h * 3600.0)), len(self._targets) - 1)
+        return float(self._targets[k])
+
+    def event_times_s(self, duration_s: int) -> list[int]:
+        step = self.interval_h * 3600.0
+        return [int(round(k * step)) for k in range(1, len(self._targets))]
+
+    def reset(self) -> None:
+        self._trim, self._last = 1.0, None
+
+    def speed(self, time_s: int, n_running: int, q_total_lps: float | None) -> float:
+        if n_running == 0:
+            return self.speed_max
+        if time_s == 0:
+            self.reset()
+        target = self.target_at(time_s)
+        # Trim on the previous step's error, only if pumps and target held
+        if q_total_lps is not None and self._last == (n_running, target):
+            error = (target - q_total_lps) / target
+            self._trim = float(np.clip(self._trim * (1.0 + self.gain * error), 0.8, 1.2))
+        s = float(self.table.speed_for_flow(n_running, target))
+        if np.isnan(s):
+            lo, _ = self.table.flow_range(n_running)
+            s = self.table.speeds[0] if target <= lo else self.table.speeds[-1]
+        s = float(np.clip(s * self._trim, self.speed_min, self.speed_max))
+        self._last = (n_running, target)
+        return s
+
+
+# ---------------------------------------------------------------------------
+# VFD EPS
+# ---------------------------------------------------------------------------
+
+@dataclass
+class VFDEPSResult:
+    """VFD EPS results plus the speed of every pump at every step."""
+    eps: EPSResult
+    speed_ratio: np.ndarray     # (n_steps, len(PUMP_IDS)), 0 when stopped
+
+    def energy(
+        self,
+        eta_pct: float = ETA_DUTY_PCT,
+        efficiency: dict[str, EfficiencyCurve] | None = None,
+    ) -> EPSEnergyResult:
+        """Shaft energy, with efficiency read at the homologous flow q/speed."""
+        return integrate_eps_energy(
+            self.eps, eta_pct, efficiency, speed_ratio=self.speed_ratio,
+        )
+
+
+def _open_riko_fully(d, link_idx: dict[str, int], phi_pct: float) -> None:
+    """Give every GPV curve in the model the Kv at *phi_pct*."""
+    points = gpv_curve_points(float(kv_at(phi_pct)), N_TOTAL_PUMPS * Q_RUNOUT_LPS * 1.1)
+    for opening in RIKO_OPENINGS_ALL:
+        if opening.gpv_link_id in link_idx:
+            d.setCurve(d.getCurveIndex(opening.curve_id), points)
+
+
+def run_vfd_eps(
+    control: SpeedSchedule | FlowSetpointController,
+    inp_path: str | Path | None = None,
+    trips: list[PumpTripEvent] | None = None,
+    duration_h: float | None = None,
+    boundary: BoundaryConditions | None = None,
+    riko_phi_pct: float = RIKO_FULL_OPEN_PCT,
+    dtype: str = "float64",
+) -> VFDEPSResult:
+    """EPS with speed-controlled pumps and the RIKO held open.
+
+    Same model, trips, rules and recorded columns as run_eps_with_trips(),
+    so results compare step for step with the throttled run. Multi-day
+    horizons stream through one loaded project; pass dtype="float32" to
+    halve memory.
+
+    Args:
+        control: SpeedSchedule or FlowSetpointController.
+        inp_path: Path to INP file. Defaults to Rev2.
+        trips: Pump trips. Defaults to DEFAULT_PUMP_TRIPS.
+        duration_h: Override the INP simulation duration (hours).
+        boundary: Time-varying reservoir heads.
+        riko_phi_pct: Fixed RIKO opening (100 = fully open).
+        dtype: Storage dtype for flows, velocities and heads.
+    """
+    if dtype not in EPS_DTYPES:
+        raise ValueError(f"dtype must be one of {EPS_DTYPES}, got {dtype!r}")
+    path = str(inp_path or INP_FILE)
+    if trips is None:
+        trips = DEFAULT_PUMP_TRIPS
+    if isinstance(control, FlowSetpointController):
+        control.reset()
+
+    speeds: list[list[float]] = []
+    with EPSSession(path, duration_h, boundary) as session:
+        d = session.model.d
+        link_idx = session.model.link_indices
+        _open_riko_fully(d, link_idx, riko_phi_pct)
+        api, c = d.api, d.ToolkitConstants
+        pump_idx = [link_idx[pid] for pid in PUMP_IDS]
+
+        def steps():
+            for step in session.stream(trips, speed_control=control):
+                speeds.append([
+                    api.ENgetlinkvalue(i, c.EN_SETTING) if api.ENgetlinkvalue(i, c.EN_STATUS) > 0
+                    else 0.0
+                    for i in pump_idx
+                ])
+                yield step
+
+        eps = collect_eps(steps(), dtype, path)
+    return VFDEPSResult(eps=eps, speed_ratio=np.asarray(speeds, dtype=np.float64))
+
+
+# ---------------------------------------------------------------------------
+# Throttled vs VFD comparison
+# ---------------------------------------------------------------------------
+
+@dataclass
+class EPSRunSummary:
+    """Flow, head and energy figures of one EPS run."""
+    label: str
+    hours: float
+    q_mean_lps: float
+    q_min_lps: float
+    q_max_lps: float
+    h_pump_mean_m: float
+    h_pump_max_m: float
+    speed_min: float
+    energy: EPSEnergyResult
+
+    @property
+    def specific_energy_kwh_m3(self) -> float:
+        """Shaft energy per m³ pumped."""
+        volume_m3 = self.q_mean_lps * self.hours * 3.6
+        return self.energy.energy_kwh / volume_m3 if volume_m3 else 0.0
+
+
+def summarize_eps(
+    label: str,
+    eps: EPSResult,
+    energy: EPSEnergyResult,
+    speed_ratio: np.ndarray | None = None,
+) -> EPSRunSummary:
+    """Time-weighted flow/head figures (steps held until the next one)."""
+    cols = [eps.link_cols[pid] for pid in PUMP_IDS]
+    q = eps.link_flow[:, cols].astype(np.float64)
+    running = (eps.link_status[:, cols] != 0) & (q > 0.0)
+    q_total = np.where(running, q, 0.0).sum(axis=1)
+    h_pump = (
+        eps.node_head[:, eps.node_cols["J_MANIFOLD"]]
+        - eps.node_head[:, eps.node_cols["J_SUCTION"]]
+    ).astype(np.float64)
+    dt = np.diff(np.asarray(eps.time_s, dtype=np.float64))
+    span = dt.sum() or 1.0
+    if speed_ratio is None:
+        speed_min = 1.0
+    else:
+        on = speed_ratio[running]
+        speed_min = float(on.min()) if on.size else 0.0
+    return EPSRunSummary(
+        label=label,
+        hours=float(dt.sum()) / 3600.0,
+        q_mean_lps=float(dt @ q_total[:-1] / span),
+        q_min_lps=float(q_total.min()),
+        q_max_lps=float(q_total.max()),
+        h_pump_mean_m=float(dt @ h_pump[:-1] / span),
+        h_pump_max_m=float(h_pump.max()),
+        speed_min=speed_min,
+        energy=energy,
+    )
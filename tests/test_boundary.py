@@ -0,0 +1,78 @@
+"""Tests for time-varying reservoir heads (tide / forebay patterns)."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.boundary import (
+    BoundaryConditions,
+    HeadPattern,
+    TidalConstituent,
+    load_head_pattern_csv,
+    tidal_pattern,
+)
+from rosarito.constants import H_PLANT
+from rosarito.scenarios import run_eps_with_trips
+
+
+class TestHeadPatterns(unittest.TestCase):
+    def test_tidal_pattern(self):
+        m2 = TidalConstituent("M2", 1.0, 12.0)
+        tide = tidal_pattern(24.0, timestep_s=1800, mean_m=0.5, constituents=(m2,))
+        self.assertEqual(len(tide.heads_m), 48)
+        self.assertEqual(tide.duration_s, 24 * 3600)
+        # Step held at its mid-time: 0.25 h into a 12 h cosine
+        self.assertAlmostEqual(tide.heads_m[0], 0.5 + np.cos(2 * np.pi * 0.25 / 12.0))
+        self.assertAlmostEqual(float(np.mean(tide.heads_m)), 0.5, places=9)
+
+    def test_step_lookup_and_common_timestep(self):
+        sea = HeadPattern((0.0, 1.0), timestep_s=3600)
+        np.testing.assert_array_equal(sea.at([0, 3599, 3600, 7200]), [0.0, 0.0, 1.0, 0.0])
+        patterns = BoundaryConditions(
+            sea=sea, plant=HeadPattern((18.0,), timestep_s=1800),
+        ).patterns
+        self.assertEqual({p.timestep_s for p in patterns.values()}, {1800})
+        self.assertEqual(patterns["SEA"].heads_m, (0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(BoundaryConditions().patterns, {})
+        with self.assertRaises(ValueError):
+            sea.resample(7000)
+
+    def test_csv_resampled_to_grid(self):
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            path = tmp / "tide.csv"
+            path.write_text("time_h,head_m\n2.0,1.0\n0.0,-1.0\n4.0,-1.0\n")
+            pattern = load_head_pattern_csv(path, timestep_s=3600)
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual(pattern.heads_m, (-1.0, 0.0, 1.0, 0.0))
+
+
+class TestEPSWithPatterns(unittest.TestCase):
+    def test_reservoir_heads_follow_patterns(self):
+        m2 = TidalConstituent("M2", 1.0, 12.4206)
+        tide = tidal_pattern(6.0, timestep_s=900, constituents=(m2,))
+        forebay = HeadPattern((H_PLANT, H_PLANT + 0.5), timestep_s=3600)
+        boundary = BoundaryConditions(sea=tide, plant=forebay)
+        eps = run_eps_with_trips(
+            trips=[], duration_h=6.0, boundary=boundary, use_cache=False,
+        )
+        np.testing.assert_allclose(eps.heads["SEA"], tide.at(eps.time_s), atol=1e-5)
+        np.testing.assert_allclose(eps.heads["PLANT"], forebay.at(eps.time_s), atol=1e-5)
+
+        static = run_eps_with_trips(trips=[], duration_h=6.0, use_cache=False)
+        np.testing.assert_array_equal(static.heads["SEA"], 0.0)
+        # Higher sea level → more flow at the same staging
+        high_tide = eps.heads["SEA"] > 0.3
+        self.assertTrue(high_tide.any())
+        idx = np.searchsorted(static.time_s, eps.time_s[high_tide])
+        self.assertTrue(np.all(eps.flows["P_DS"][high_tide] > static.flows["P_DS"][idx]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for the content-addressed result cache (no model loading required)."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from rosarito.cache import ResultCache, make_key
+from rosarito.constants import INP_FILE, RIKO_OPENINGS
+from rosarito.model import SteadyStateResult
+
+
+def _result(q: float) -> SteadyStateResult:
+    return SteadyStateResult(
+        n_active_pumps=4, riko_opening_pct=44, q_total_lps=q,
+        q_per_pump_lps=q / 4, h_pump_m=26.0, dh_riko_m=7.5,
+        h_suction=0.0, h_manifold=26.0, h_riko_in=25.9, h_riko_out=18.4,
+        pipe_velocities={"P_DS": 1.97},
+    )
+
+
+class TestMakeKey(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.inp = self.tmp / "model.inp"
+        shutil.copy2(INP_FILE, self.inp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_same_inputs_same_key(self):
+        o = RIKO_OPENINGS[0]
+        self.assertEqual(make_key("steady", self.inp, o), make_key("steady", self.inp, o))
+
+    def test_scenario_inputs_change_key(self):
+        a, b = RIKO_OPENINGS[0], RIKO_OPENINGS[1]
+        self.assertNotEqual(make_key("steady", self.inp, a), make_key("steady", self.inp, b))
+        self.assertNotEqual(make_key("steady", self.inp, a), make_key("eps", self.inp, a))
+
+    def test_inp_edit_invalidates_key(self):
+        o = RIKO_OPENINGS[0]
+        before = make_key("steady", self.inp, o)
+        with open(self.inp, "a", encoding="utf-8") as f:
+            f.write("\n; edited\n")
+        os.utime(self.inp, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        self.assertNotEqual(before, make_key("steady", self.inp, o))
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_roundtrip_memory_and_disk(self):
+        cache = ResultCache(self.tmp)
+        cache.put("ab" * 32, _result(5012.2))
+        self.assertEqual(cache.get("ab" * 32), _result(5012.2))
+        # A fresh instance only has the disk layer
+        self.assertEqual(ResultCache(self.tmp).get("ab" * 32), _result(5012.2))
+
+    def test_miss_returns_none(self):
+        self.assertIsNone(ResultCache(self.tmp).get("cd" * 32))
+
+    def test_returned_values_are_independent(self):
+        cache = ResultCache(self.tmp)
+        cache.put("ab" * 32, _result(5012.2))
+        cache.get("ab" * 32).pipe_velocities["P_DS"] = -1.0
+        self.assertEqual(cache.get("ab" * 32).pipe_velocities["P_DS"], 1.97)
+
+    def test_memory_layer_bounded(self):
+        cache = ResultCache(self.tmp, memory_entries=2)
+        for i in range(5):
+            cache.put(f"{i:02d}" * 32, _result(float(i)))
+        self.assertEqual(len(cache._memory), 2)
+
+    def test_disk_lru_eviction(self):
+        blob_size = len(__import__("pickle").dumps(_result(1.0)))
+        cache = ResultCache(self.tmp, max_bytes=int(blob_size * 2.5))
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        cache.put(keys[0], _result(0.0))
+        cache.put(keys[1], _result(1.0))
+        # Age key 1 so it becomes the least recently used entry
+        os.utime(cache._path(keys[1]), ns=(1, 1))
+        cache.put(keys[2], _result(2.0))
+        fresh = ResultCache(self.tmp)
+        self.assertIsNotNone(fresh.get(keys[0]))
+        self.assertIsNone(fresh.get(keys[1]))
+        self.assertIsNotNone(fresh.get(keys[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for N-k pump outage enumeration (loads the Rev3 INP via EPyT)."""
+
+from __future__ import annotations
+
+import unittest
+from math import comb
+
+from rosarito.constants import INP_FILE_REV3, PUMP_IDS, RIKO_OPENINGS_ALL
+from rosarito.contingency import (
+    ContingencyCase,
+    enumerate_outages,
+    run_contingencies,
+    running_pumps,
+    summarize_contingencies,
+)
+from rosarito.scenarios import StagingSession
+
+
+class TestOutageEnumeration(unittest.TestCase):
+    def test_combination_counts(self):
+        self.assertEqual(len(enumerate_outages(1)), 1 + 5)
+        self.assertEqual(len(enumerate_outages(2)), 1 + 5 + comb(5, 2))
+        self.assertEqual(len(enumerate_outages()), 2 ** len(PUMP_IDS))
+        with self.assertRaises(ValueError):
+            enumerate_outages(6)
+
+    def test_standby_replaces_tripped_duty_pump(self):
+        self.assertEqual(
+            running_pumps(("PUMP_2",), 4), ("PUMP_1", "PUMP_3", "PUMP_4", "PUMP_5"),
+        )
+        self.assertEqual(running_pumps(("PUMP_1", "PUMP_5"), 4), ("PUMP_2", "PUMP_3", "PUMP_4"))
+
+    def test_deficit_without_intact_flow(self):
+        # Static lift at or above shutoff: the intact station delivers nothing
+        case = ContingencyCase(
+            outage=tuple(PUMP_IDS), opening=RIKO_OPENINGS_ALL[0], running=(), result=None,
+            q_intact_lps=0.0,
+        )
+        self.assertEqual(case.q_deficit_pct, 0.0)
+
+
+class TestContingencies(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cases = run_contingencies(max_outage=2)
+
+    def test_case_count(self):
+        self.assertEqual(len(self.cases), (1 + 5 + 10) * len(RIKO_OPENINGS_ALL))
+
+    def test_broadcast_matches_direct_solve(self):
+        """Each pump set, solved on its own, must equal the broadcast result."""
+        with StagingSession(INP_FILE_REV3) as session:
+            for case in self.cases:
+                direct = session.run(case.opening, list(case.running))
+                self.assertEqual(direct, case.result, (case.outage, case.opening))
+
+    def test_n1_fully_covered_by_standby(self):
+        for case in self.cases:
+            if case.level <= 1:
+                self.assertEqual(case.shortfall, 0)
+                self.assertAlmostEqual(case.q_deficit_pct, 0.0, places=9)
+
+    def test_n2_loses_flow_at_four_pump_openings(self):
+        worst = {
+            (s.level, s.opening.phi_pct): s for s in summarize_contingencies(self.cases)
+        }
+        self.assertEqual(worst[(2, 44)].n_running_min, 3)
+        self.assertGreater(worst[(2, 44)].q_deficit_pct_max, 5.0)
+        self.assertEqual(worst[(2, 22)].q_deficit_pct_max, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
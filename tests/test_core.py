@@ -20,6 +20,7 @@ from rosarito.constants import (
 from rosarito.energy import compute_pump_power, compute_throttle_loss
 from rosarito.eps_utils import format_sim_time, riko_label
 from rosarito.validation import _deviation_pct
+from rosarito.valve import load_riko_kv, kv_at, headloss_m, gpv_curve_points
 
 
 class TestUnitConversions(unittest.TestCase):
@@ -231,5 +232,41 @@ class TestThrottleLoss(unittest.TestCase):
             self.assertGreater(r.p_throttle_kw, 0)
 
 
+class TestRikoKv(unittest.TestCase):
+    """Tests for the Kv CSV loader and Kv-based GPV curves."""
+
+    def test_csv_rows(self):
+        phi, kv = load_riko_kv()
+        self.assertEqual(len(phi), 50)
+        self.assertEqual(phi[0], 2.0)
+        self.assertEqual(phi[-1], 100.0)
+
+    def test_kv_at_matches_openings(self):
+        """Kv on the 2% grid must equal the exact CSV rows used in constants."""
+        for o in RIKO_OPENINGS_ALL:
+            self.assertAlmostEqual(float(kv_at(o.phi_pct)), o.kv_m3h, places=2)
+
+    def test_kv_at_interpolates(self):
+        kv = float(kv_at(43.0))
+        self.assertAlmostEqual(kv, (18712.43 + 21038.45) / 2, places=2)
+
+    def test_kv_at_out_of_range(self):
+        with self.assertRaises(ValueError):
+            kv_at(101.0)
+
+    def test_gpv_curve_matches_kv_formula(self):
+        kv = 21038.45
+        pts = gpv_curve_points(kv, q_max_lps=6000.0)
+        self.assertEqual(pts[0], [0.0, 0.0])
+        for q, dh in pts:
+            self.assertAlmostEqual(dh, q**2 * KV_CONSTANT / kv**2, places=6)
+        # Design point from the Rev3 INP: 5017 l/s -> 7.516 m
+        self.assertAlmostEqual(float(headloss_m(5017.0, kv)), 7.516, places=2)
+
+    def test_gpv_curve_capped_at_shutoff_head(self):
+        pts = gpv_curve_points(324.04, q_max_lps=10000.0)
+        self.assertLessEqual(pts[-1][1], 46.54 + 1e-9)
+
+
 if __name__ == "__main__":
     unittest.main()
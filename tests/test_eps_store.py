@@ -0,0 +1,81 @@
+"""Unit tests for the chunked memory-mapped EPS store (no EPANET needed)."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.eps_store import META_FILE, ChunkedEPSWriter, load_eps
+from rosarito.model import EPSStep
+
+LINK_COLS = {"PUMP_1": 0, "P_DS_1": 1, "P_DS": 1}
+NODE_COLS = {"J_SUCTION": 0, "J_MANIFOLD": 1}
+
+
+def _steps(n: int):
+    for i in range(n):
+        yield EPSStep(
+            time_s=300.0 * i,
+            link_flow=np.array([i + 0.5, 2.0 * i]),
+            link_velocity=np.array([0.1 * i, 0.2 * i]),
+            link_status=np.array([i % 2, 1], dtype=np.int8),
+            node_head=np.array([-1.0, 40.0 + i]),
+            link_cols=LINK_COLS,
+            node_cols=NODE_COLS,
+        )
+
+
+class TestChunkedEPSWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, n: int, chunk_steps: int, **kwargs):
+        with ChunkedEPSWriter(self.tmp, chunk_steps=chunk_steps, **kwargs) as w:
+            for step in _steps(n):
+                w.update(step)
+
+    def test_round_trip_across_chunk_boundaries(self):
+        self._write(10, chunk_steps=3)
+        eps = load_eps(self.tmp)
+        self.assertIsInstance(eps.link_flow, np.memmap)
+        self.assertEqual(eps.link_flow.shape, (10, 2))
+        np.testing.assert_array_equal(eps.time_s, 300.0 * np.arange(10))
+        np.testing.assert_array_equal(eps.flows["P_DS"], 2.0 * np.arange(10))
+        np.testing.assert_array_equal(eps.statuses["PUMP_1"], np.arange(10) % 2)
+        self.assertEqual(eps.link_status.dtype, np.int8)
+
+    def test_files_are_plain_npy(self):
+        self._write(5, chunk_steps=2, dtype="float32")
+        head = np.load(self.tmp / "node_head.npy")
+        self.assertEqual(head.dtype, np.float32)
+        self.assertEqual(head.shape, (5, 2))
+
+    def test_key_mismatch_and_incomplete_run(self):
+        self._write(4, chunk_steps=2, key="abc")
+        self.assertIsNotNone(load_eps(self.tmp, key="abc"))
+        self.assertIsNone(load_eps(self.tmp, key="other"))
+
+        with self.assertRaises(KeyError):
+            with ChunkedEPSWriter(self.tmp, key="abc") as w:
+                w.update(next(_steps(1)))
+                raise KeyError("solver died")
+        self.assertFalse((self.tmp / META_FILE).exists())
+        self.assertIsNone(load_eps(self.tmp))
+
+    def test_window_is_lazy_view(self):
+        self._write(13, chunk_steps=4)
+        eps = load_eps(self.tmp)
+        win = eps.window(0.5, 0.75)            # 1800 s … 2700 s inclusive
+        np.testing.assert_array_equal(win.time_s, [1800.0, 2100.0, 2400.0, 2700.0])
+        self.assertTrue(np.shares_memory(win.link_flow, eps.link_flow))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Tests for the native INP parser."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from rosarito.constants import INP_FILE, INP_FILE_REV3, PIPE_IDS, PUMP_IDS, RIKO_IDS_ALL
+from rosarito.energy import EfficiencyCurve, load_pump_efficiency
+from rosarito.inp import load_inp, parse_inp, parse_time_s
+from rosarito.model import RosaritoModel
+from rosarito.surrogate import SeriesNetwork
+from rosarito.tariff import tariff_from_inp
+from rosarito.validation import validate_inp_inputs
+
+
+class TestParseInp(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rev3 = parse_inp(INP_FILE_REV3)
+
+    def test_network(self):
+        m = self.rev3
+        self.assertEqual(list(m.pumps), PUMP_IDS)
+        self.assertEqual(list(m.valves), RIKO_IDS_ALL)
+        self.assertEqual(list(m.pipes), PIPE_IDS)
+        self.assertAlmostEqual(m.reservoirs["PLANT"].head_m, 18.17)
+        self.assertEqual(m.valves["RIKO_44"].setting, "RIKO_44pct")
+        self.assertEqual(m.status["PUMP_5"], "CLOSED")
+
+    def test_curves(self):
+        pc = self.rev3.pump_curve("PUMP_3")
+        np.testing.assert_array_equal(pc.x, [0.0, 1256.0, 1700.0])
+        np.testing.assert_array_equal(pc.y, [46.54, 26.07, 14.50])
+        self.assertEqual(len(self.rev3.curve("EFF_35WX").x), 13)
+        self.assertEqual(set(self.rev3.gpv_curves()), set(RIKO_IDS_ALL))
+        with self.assertRaises(KeyError):
+            self.rev3.curve("NOPE")
+
+    def test_times_energy_options(self):
+        m = self.rev3
+        self.assertEqual(m.times.duration_s, 86400)
+        self.assertEqual(m.times.hydraulic_step_s, 300)
+        self.assertEqual(m.times.report_step_s, 1800)
+        self.assertEqual(m.energy.global_efficiency_pct, 89.0)
+        self.assertEqual(m.energy.global_price, 0.08)
+        self.assertEqual(m.energy.pump_efficiency["PUMP_5"], "EFF_35WX")
+        self.assertEqual(m.options.units, "LPS")
+        self.assertEqual(m.options.headloss, "D-W")
+        self.assertAlmostEqual(m.options.specific_gravity, 1.025)
+        self.assertEqual(m.options.values["UNBALANCED"], "CONTINUE 10")
+
+    def test_rules(self):
+        rules = {r.id: r for r in self.rev3.rules}
+        with RosaritoModel(INP_FILE_REV3) as rm:
+            self.assertEqual(len(rules), rm.d.getRuleCount())
+        r = rules["R_4P_VALVE"]
+        self.assertEqual(r.priority, 4.0)
+        self.assertEqual(len(r.premises), 5)
+        self.assertEqual(r.premises[4].id, "PUMP_5")
+        self.assertEqual(r.premises[4].value, "CLOSED")
+        self.assertEqual(r.then_actions[0].keyword, "THEN")
+        self.assertEqual((r.then_actions[0].id, r.then_actions[0].value), ("RIKO_44", "OPEN"))
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time_s("24:00"), 86400)
+        self.assertEqual(parse_time_s("0:05"), 300)
+        self.assertEqual(parse_time_s("1:02:03"), 3723)
+        self.assertEqual(parse_time_s("1.5"), 5400)
+        self.assertEqual(parse_time_s("30 MIN"), 1800)
+        self.assertEqual(parse_time_s("12:00 AM"), 0)
+        self.assertEqual(parse_time_s("1:30 PM"), 48600)
+
+
+class TestInpConsumers(unittest.TestCase):
+    def test_efficiency_matches_epanet(self):
+        parsed = load_pump_efficiency(INP_FILE_REV3)
+        with RosaritoModel(INP_FILE_REV3) as m:
+            d = m.d
+            idx = int(d.getCurveIndex("EFF_35WX"))
+            points = d.getCurveValue(idx)[idx]
+        expected = EfficiencyCurve(
+            tuple(float(q) for q, _ in points), tuple(float(e) for _, e in points),
+        )
+        for pid in PUMP_IDS:
+            self.assertEqual(parsed[pid], expected)
+
+    def test_tariff_and_network(self):
+        tariff = tariff_from_inp(INP_FILE)
+        self.assertEqual(tariff.price_per_kwh, 0.08)
+        self.assertEqual(tariff.price_pattern, ())
+        self.assertEqual(SeriesNetwork.from_inp(INP_FILE_REV3), SeriesNetwork.default())
+        self.assertEqual(SeriesNetwork.from_inp(INP_FILE).ds_pipe_id, "P_DS")
+
+    def test_input_validation(self):
+        for path in (INP_FILE, INP_FILE_REV3):
+            self.assertTrue(all(c.passed for c in validate_inp_inputs(path)))
+        rev0 = validate_inp_inputs(INP_FILE.with_name("ROSARITO_EPANET_Rev0.inp"))
+        self.assertIn("RIKO_44 Kv", [c.name for c in rev0 if not c.passed])
+
+
+class TestLoadInpCache(unittest.TestCase):
+    def test_reuse_and_invalidate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.inp"
+            shutil.copy(INP_FILE_REV3, path)
+            first = load_inp(path)
+            self.assertIs(load_inp(path), first)
+            self.assertEqual(first.path, str(path))
+
+            text = path.read_text(encoding="utf-8").replace(" PLANT   18.17", " PLANT   19.5")
+            path.write_text(text, encoding="utf-8")
+            edited = load_inp(path)
+            self.assertIsNot(edited, first)
+            self.assertAlmostEqual(edited.reservoirs["PLANT"].head_m, 19.5)
+            self.assertAlmostEqual(load_inp(path, use_cache=False).reservoirs["PLANT"].head_m, 19.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the INP revision generator."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from rosarito.constants import INP_FILE, INP_FILE_REV3, PUMP_IDS
+from rosarito.inp import parse_inp, parse_inp_text
+from rosarito.inp_builder import ModelSpec, build_inp, write_inp
+from rosarito.scenarios import run_staging_scenarios_extended
+from rosarito.validation import validate_inp_inputs
+
+
+class TestBuildInp(unittest.TestCase):
+    def test_default_matches_rev3(self):
+        built = parse_inp_text(build_inp())
+        rev3 = parse_inp(INP_FILE_REV3)
+        for attr in ("junctions", "reservoirs", "pipes", "pumps", "valves", "status",
+                     "rules", "energy", "times"):
+            self.assertEqual(getattr(built, attr), getattr(rev3, attr), attr)
+        self.assertEqual(built.options.values["UNBALANCED"], "CONTINUE 10")
+        self.assertEqual(built.options.specific_gravity, rev3.options.specific_gravity)
+
+    def test_single_ds_pipe_matches_rev2(self):
+        built = parse_inp_text(build_inp(ModelSpec(n_ds_segments=1)))
+        rev2 = parse_inp(INP_FILE)
+        self.assertEqual(built.pipes, rev2.pipes)
+        self.assertEqual(built.junctions, rev2.junctions)
+
+    def test_deterministic(self):
+        self.assertEqual(build_inp(ModelSpec()), build_inp(ModelSpec()))
+
+    def test_custom_openings_and_rules(self):
+        spec = ModelSpec(standby_rules=False).with_openings(
+            [50, 37.5, 28], {4: 50, 3: 37.5, 2: 28, 1: 28},
+        )
+        built = parse_inp_text(build_inp(spec))
+        self.assertEqual(list(built.valves), ["RIKO_50", "RIKO_37.5", "RIKO_28"])
+        self.assertEqual(
+            built.status, {"PUMP_5": "CLOSED", "RIKO_37.5": "CLOSED", "RIKO_28": "CLOSED"},
+        )
+        rules = {r.id: r for r in built.rules}
+        self.assertEqual(sorted(rules), ["R_1P_VALVE", "R_2P_VALVE", "R_3P_VALVE", "R_4P_VALVE"])
+        r1 = rules["R_1P_VALVE"]
+        self.assertEqual([c.value for c in r1.premises], ["OPEN"] + ["CLOSED"] * 4)
+        self.assertEqual((r1.then_actions[0].id, r1.then_actions[0].value), ("RIKO_28", "OPEN"))
+        self.assertEqual(built.gpv_curves()["RIKO_37.5"].id, "RIKO_37.5pct")
+
+    def test_invalid_spec(self):
+        with self.assertRaises(ValueError):
+            ModelSpec(n_ds_segments=0)
+        with self.assertRaises(ValueError):
+            ModelSpec(phi_pct=(44, 38), service_phi={4: 30})
+        with self.assertRaises(ValueError):
+            ModelSpec(pump_ids=tuple(PUMP_IDS[:4]))
+
+
+class TestGeneratedModel(unittest.TestCase):
+    def test_solves_like_rev3(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_inp(ModelSpec(), Path(tmp) / "generated.inp")
+            mtime = path.stat().st_mtime_ns
+            self.assertEqual(write_inp(ModelSpec(), path).stat().st_mtime_ns, mtime)
+            self.assertTrue(all(c.passed for c in validate_inp_inputs(path)))
+            built = run_staging_scenarios_extended(path, use_cache=False)
+        rev3 = run_staging_scenarios_extended(INP_FILE_REV3)
+        for a, b in zip(built, rev3):
+            self.assertAlmostEqual(a.q_total_lps, b.q_total_lps, delta=0.002 * b.q_total_lps)
+            self.assertAlmostEqual(a.dh_riko_m, b.dh_riko_m, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
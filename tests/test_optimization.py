@@ -4,8 +4,18 @@ from __future__ import annotations
 
 import unittest
 
+import numpy as np
+
 from rosarito.constants import ReferenceOperatingPoint
-from rosarito.optimization import compute_vfd_comparison
+from rosarito.energy import EfficiencyCurve
+from rosarito.optimization import (
+    build_vfd_table,
+    compute_vfd_comparison,
+    pareto_mask,
+    search_vfd_valve_grid,
+)
+from rosarito.surrogate import SeriesNetwork, cross_check, solve_operating_points
+from rosarito.valve import kv_at
 
 
 def _make_ref(n: int, phi: int, q: float, h: float, dh: float) -> ReferenceOperatingPoint:
@@ -50,10 +60,113 @@ class TestVFDComparison(unittest.TestCase):
             )
 
     def test_affinity_law_consistency(self):
-        """Verify speed_ratio = sqrt(H_required / H_pump)."""
-        r = compute_vfd_comparison(_make_ref(4, 44, 5017, 26.12, 7.52))
-        expected = ((26.12 - 7.52) / 26.12) ** 0.5
-        self.assertAlmostEqual(r.speed_ratio, expected, places=4)
+        """The speed-scaled curve passes through (Q/pump, H_required)."""
+        pump = SeriesNetwork.default().pump
+        for n, phi, q, h, dh in _CASES:
+            r = compute_vfd_comparison(_make_ref(n, phi, q, h, dh))
+            self.assertAlmostEqual(float(pump.head(q / n, r.speed_ratio)), h - dh, places=8)
+            # Far from BEP the sqrt(H_required / H_pump) shortcut is well off
+            self.assertGreater(r.speed_ratio, ((h - dh) / h) ** 0.5)
+
+    def test_efficiency_at_homologous_flow(self):
+        curve = EfficiencyCurve((800.0, 1200.0, 1600.0), (70.0, 90.0, 70.0))
+        r = compute_vfd_comparison(_make_ref(2, 30, 2221, 29.48, 11.22), efficiency=curve)
+        self.assertAlmostEqual(r.eta_throttled_pct, float(curve.eta_at(1110.5)))
+        self.assertAlmostEqual(r.eta_vfd_pct, float(curve.eta_at(1110.5 / r.speed_ratio)))
+
+
+class TestVFDTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = build_vfd_table()
+
+    def test_flow_increases_with_speed(self):
+        self.assertTrue(np.all(np.diff(self.table.q_total_lps, axis=1) >= 0.0))
+        self.assertTrue(np.all(np.diff(self.table.q_total_lps[:, -1]) > 0.0))
+
+    def test_speed_lookup_round_trip(self):
+        n = np.array([1, 2, 3, 4, 5])
+        speeds = np.array([0.83, 0.86, 0.91, 0.95, 0.99])
+        q, h, p = self.table.at_speed(n, speeds)
+        np.testing.assert_allclose(self.table.speed_for_flow(n, q), speeds, atol=1e-4)
+        self.assertTrue(np.all(p > 0.0))
+        self.assertTrue(np.isnan(self.table.speed_for_flow(4, 1e5)))
+
+    def test_grid_matches_epanet(self):
+        r = cross_check(
+            np.array([1, 3, 5])[:, None], 21038.45, speed_ratio=np.array([0.8, 0.9])[None, :],
+        )
+        self.assertLess(r.max_dq_pct, 0.1)
+        self.assertLess(r.max_dh_pump_m, 0.05)
+
+
+def _dominated_brute_force(obj: np.ndarray) -> np.ndarray:
+    return np.array([
+        np.any(np.all(obj <= row, axis=1) & np.any(obj < row, axis=1)) for row in obj
+    ])
+
+
+class TestParetoMask(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for cols in (2, 3):
+            # Small integer grid: many ties and duplicates
+            obj = rng.integers(0, 6, size=(800, cols)).astype(float)
+            np.testing.assert_array_equal(pareto_mask(obj), ~_dominated_brute_force(obj))
+            obj = rng.random((800, cols))
+            np.testing.assert_array_equal(pareto_mask(obj), ~_dominated_brute_force(obj))
+
+    def test_duplicates_kept_together(self):
+        obj = np.array([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0], [1.0, 2.0, 4.0]])
+        np.testing.assert_array_equal(pareto_mask(obj), [True, True, False])
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            pareto_mask(np.zeros((5, 4)))
+        with self.assertRaises(ValueError):
+            pareto_mask([[np.nan, 1.0]])
+
+
+class TestGridSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.result = search_vfd_valve_grid()
+
+    def test_points_match_solver(self):
+        r = self.result
+        pick = np.flatnonzero(r.feasible)[::97]
+        ref = solve_operating_points(
+            r.n_pumps[pick], kv_at(r.phi_pct[pick]),
+            friction="swamee-jain", speed_ratio=r.speed_ratio[pick],
+        )
+        np.testing.assert_allclose(r.q_total_lps[pick], ref.q_total_lps, rtol=1e-9)
+        np.testing.assert_allclose(r.h_pump_m[pick], ref.h_pump_m, rtol=1e-9)
+
+    def test_batches_do_not_change_result(self):
+        small = search_vfd_valve_grid(batch_size=333)
+        np.testing.assert_array_equal(small.front, self.result.front)
+        np.testing.assert_allclose(small.p_shaft_kw, self.result.p_shaft_kw)
+
+    def test_front_is_non_dominated_and_complete(self):
+        r = self.result
+        idx = np.flatnonzero(r.feasible)
+        obj = np.column_stack([r.p_shaft_kw[idx], -r.q_total_lps[idx], -r.margin_pct[idx]])
+        expected = idx[~_dominated_brute_force(obj)]
+        self.assertEqual(set(r.front.tolist()), set(expected.tolist()))
+        self.assertTrue(np.all(np.diff(r.p_shaft_kw[r.front]) >= 0.0))
+
+    def test_cheapest_for_flow(self):
+        r = self.result
+        pt = r.cheapest_for_flow(4500.0)
+        self.assertGreaterEqual(pt.q_total_lps, 4500.0)
+        ok = r.feasible & (r.q_total_lps >= 4500.0)
+        self.assertAlmostEqual(pt.p_shaft_kw, float(r.p_shaft_kw[ok].min()))
+        # Holding a control margin costs power
+        held = r.cheapest_for_flow(4500.0, min_margin_pct=20.0)
+        self.assertGreaterEqual(held.margin_pct, 20.0)
+        self.assertGreaterEqual(held.p_shaft_kw, pt.p_shaft_kw)
+        with self.assertRaises(ValueError):
+            r.cheapest_for_flow(1e5)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""Tests for the memoized analysis pipeline."""
+
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import rosarito.scenarios as scenarios
+from rosarito.constants import INP_FILE
+from rosarito.energy import compute_all_scenario_energies
+from rosarito.pipeline import AnalysisPipeline, SolverArgs, _run_isolated
+from rosarito.validation import validate_all_scenarios
+
+
+class TestAnalysisPipeline(unittest.TestCase):
+    def test_each_solve_once(self):
+        with (
+            mock.patch.object(scenarios, "run_staging_scenarios",
+                              wraps=scenarios.run_staging_scenarios) as staging,
+            mock.patch.object(scenarios, "run_eps_with_trips",
+                              wraps=scenarios.run_eps_with_trips) as eps,
+        ):
+            pipeline = AnalysisPipeline(concurrent=False, use_cache=False)
+            pipeline.run()
+            pipeline.get("energy")
+            pipeline.run(("validation", "tables"))
+        self.assertEqual(staging.call_count, 1)
+        self.assertEqual(eps.call_count, 1)
+        self.assertIn("tables", pipeline)
+        self.assertNotIn("figures", pipeline)
+
+    def test_matches_direct_calls(self):
+        pipeline = AnalysisPipeline(concurrent=False, use_cache=False)
+        staging = scenarios.run_staging_scenarios(use_cache=False)
+        self.assertEqual(pipeline.get("staging"), staging)
+        self.assertEqual(pipeline.get("energy"), compute_all_scenario_energies(staging))
+        self.assertEqual(pipeline.get("validation"), validate_all_scenarios(staging))
+
+    def test_concurrent_matches_serial(self):
+        serial = AnalysisPipeline(concurrent=False, use_cache=False).run()
+        concurrent = AnalysisPipeline(use_cache=False).run()
+        self.assertEqual(concurrent["staging"], serial["staging"])
+        self.assertEqual(concurrent["energy"], serial["energy"])
+        np.testing.assert_array_equal(concurrent["eps"].link_status, serial["eps"].link_status)
+        np.testing.assert_array_equal(concurrent["eps"].link_flow, serial["eps"].link_flow)
+
+    def test_offloaded_stage_keeps_jobs(self):
+        with mock.patch.object(scenarios, "run_staging_scenarios", return_value=[]) as staging:
+            _run_isolated("staging", SolverArgs(str(INP_FILE), use_cache=False, jobs=3))
+        (inp_path,), kwargs = staging.call_args
+        self.assertEqual(kwargs, {"workers": 3, "use_cache": False})
+        self.assertNotEqual(inp_path, str(INP_FILE))
+        self.assertEqual(Path(inp_path).name, INP_FILE.name)
+
+    def test_unknown_stage(self):
+        with self.assertRaises(KeyError):
+            AnalysisPipeline().get("nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests for the Monte Carlo pump-trip reliability engine."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from rosarito.reliability import (
+    Exponential,
+    LogNormal,
+    MetricDistribution,
+    TripModel,
+    Weibull,
+    run_monte_carlo,
+    sample_trip_schedules,
+)
+
+# Frequent failures so a handful of runs exercises trips and standby starts
+STRESSED = TripModel(time_to_failure=Exponential(mean_h=36.0))
+
+
+class TestTripSampling(unittest.TestCase):
+    def test_reproducible(self):
+        a = sample_trip_schedules(50, STRESSED, seed=7)
+        b = sample_trip_schedules(50, STRESSED, seed=7)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, sample_trip_schedules(50, STRESSED, seed=8))
+
+    def test_schedules_are_consistent(self):
+        model = TripModel(
+            time_to_failure=Weibull(shape=1.5, scale_h=20.0),
+            repair_time=LogNormal(median_h=3.0, sigma=0.5),
+            duration_h=72.0,
+        )
+        for trips in sample_trip_schedules(200, model, seed=1):
+            self.assertEqual([t.trip_hour for t in trips], sorted(t.trip_hour for t in trips))
+            for pump_id in model.pump_ids:
+                own = [t for t in trips if t.pump_id == pump_id]
+                for t in own:
+                    self.assertLess(t.trip_hour, model.duration_h)
+                    self.assertGreater(t.restore_hour, t.trip_hour)
+                # A pump cannot trip again before it is restored
+                for prev, nxt in zip(own, own[1:]):
+                    self.assertGreater(nxt.trip_hour, prev.restore_hour)
+
+    def test_distribution_summary(self):
+        dist = MetricDistribution.from_samples(np.arange(101, dtype=float))
+        self.assertEqual((dist.p05, dist.p50, dist.p95), (5.0, 50.0, 95.0))
+        self.assertEqual((dist.min, dist.max, dist.mean), (0.0, 100.0, 50.0))
+
+
+class TestMonteCarloRuns(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serial = run_monte_carlo(6, STRESSED, seed=3)
+
+    def test_metrics(self):
+        for trips, run in zip(self.serial.schedules, self.serial.runs):
+            self.assertEqual(run.n_trips, len(trips))
+            self.assertGreater(run.delivered_m3, 0.0)
+            self.assertGreater(run.energy_kwh, 0.0)
+            if not trips:
+                self.assertEqual(run.standby_starts, 0)
+        self.assertGreater(self.serial.samples("standby_starts").sum(), 0)
+        self.assertEqual(set(self.serial.distributions()), {
+            "n_trips", "delivered_m3", "hours_below_qmin", "standby_starts", "energy_kwh",
+        })
+
+    def test_parallel_matches_serial(self):
+        parallel = run_monte_carlo(6, STRESSED, seed=3, workers=2)
+        self.assertEqual(self.serial.runs, parallel.runs)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            run_monte_carlo(2, workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,338 @@
+"""Integration tests for scenario runners (loads the INP models via EPyT)."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from epyt import epanet
+
+from rosarito.cache import ResultCache
+from rosarito.constants import INP_FILE_REV3, PUMP_IDS, RIKO_OPENINGS_ALL
+from rosarito.energy import (
+    EPSEnergyAccumulator,
+    eps_pump_power_kw,
+    integrate_eps_energy,
+    load_pump_efficiency,
+)
+from rosarito.eps_utils import EPSStatistics, EventDetector, feed_eps, iter_eps_events
+from rosarito.scenarios import (
+    DEFAULT_PUMP_TRIPS,
+    EPSSession,
+    StagingSession,
+    compare_warm_start,
+    run_opening_sweep,
+    run_eps_with_trips,
+    run_staging_scenarios,
+    run_staging_scenarios_extended,
+    stream_eps,
+)
+
+
+class TestStagingSession(unittest.TestCase):
+    def test_session_matches_fresh_load(self):
+        """Reusing one project must give the same results as fresh loads."""
+        fresh = run_staging_scenarios_extended(use_cache=False)
+        reused = run_staging_scenarios_extended(reuse_session=True, use_cache=False)
+        self.assertEqual(fresh, reused)
+
+    def test_session_matches_fresh_load_rev2(self):
+        fresh = run_staging_scenarios(use_cache=False)
+        reused = run_staging_scenarios(reuse_session=True, use_cache=False)
+        self.assertEqual(fresh, reused)
+
+    def test_no_leakage_between_runs(self):
+        """Running another scenario in between must not change a result."""
+        target, other = RIKO_OPENINGS_ALL[3], RIKO_OPENINGS_ALL[6]
+        with StagingSession(INP_FILE_REV3) as session:
+            first = session.run(target)
+            session.run(other)
+            second = session.run(target)
+        self.assertEqual(first, second)
+
+    def test_out_of_band_change_rejected(self):
+        with StagingSession(INP_FILE_REV3) as session:
+            session.run(RIKO_OPENINGS_ALL[0])
+            session.d.addControls("LINK PUMP_4 0 AT TIME 0")
+            with self.assertRaises(RuntimeError):
+                session.run(RIKO_OPENINGS_ALL[0])
+
+    def test_run_requires_open(self):
+        with self.assertRaises(RuntimeError):
+            StagingSession(INP_FILE_REV3).run(RIKO_OPENINGS_ALL[0])
+
+
+class TestParallelStaging(unittest.TestCase):
+    def test_parallel_matches_serial(self):
+        """Process-pool results must equal the serial path, in input order."""
+        serial = run_staging_scenarios_extended(use_cache=False)
+        parallel = run_staging_scenarios_extended(workers=3, use_cache=False)
+        self.assertEqual(serial, parallel)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            run_staging_scenarios(workers=0)
+
+
+class TestOpeningSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.points = run_opening_sweep()
+
+    def test_full_grid(self):
+        """Every 2% CSV row × 1-5 pumps."""
+        self.assertEqual(len(self.points), 50 * 5)
+
+    def test_matches_baked_in_gpvs(self):
+        """Swapped curve must reproduce the Rev3 GPV links within 0.5%."""
+        baked = run_staging_scenarios_extended(reuse_session=True, use_cache=False)
+        by_key = {(p.n_pumps, p.phi_pct): p for p in self.points}
+        for r in baked:
+            p = by_key[(r.n_active_pumps, float(r.riko_opening_pct))]
+            self.assertAlmostEqual(p.q_total_lps, r.q_total_lps, delta=r.q_total_lps * 0.005)
+            self.assertAlmostEqual(p.h_pump_m, r.h_pump_m, delta=r.h_pump_m * 0.005)
+
+    def test_standby_adds_flow(self):
+        by_key = {(p.n_pumps, p.phi_pct): p for p in self.points}
+        self.assertGreater(by_key[(5, 44.0)].q_total_lps, by_key[(4, 44.0)].q_total_lps)
+
+    def test_flow_increases_with_opening(self):
+        for n in range(1, 6):
+            flows = [p.q_total_lps for p in self.points if p.n_pumps == n]
+            self.assertEqual(flows, sorted(flows))
+
+
+class TestWarmStart(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = compare_warm_start(phi_grid=[10, 20, 30, 40, 50, 60], pump_counts=[2, 4])
+
+    def test_same_solution(self):
+        self.assertEqual(self.report.n_points, 12)
+        self.assertLess(self.report.max_dq_lps, 0.5)
+
+    def test_fewer_trials(self):
+        self.assertGreater(self.report.warm_iterations, 0)
+        self.assertLess(self.report.warm_iterations, self.report.cold_iterations)
+
+
+class TestStepEngine(unittest.TestCase):
+    def test_eps_matches_epyt_time_series(self):
+        """Step-wise recording must equal getComputedHydraulicTimeSeries()."""
+        trips = DEFAULT_PUMP_TRIPS
+        result = run_eps_with_trips(INP_FILE_REV3, trips, use_cache=False)
+
+        d = epanet(str(INP_FILE_REV3))
+        try:
+            link_idx = {n: i for i, n in enumerate(d.getLinkNameID())}
+            node_idx = {n: i for i, n in enumerate(d.getNodeNameID())}
+            for t in trips:
+                d.addControls(f"LINK {t.pump_id} 0 AT TIME {int(t.trip_hour * 3600)}")
+                d.addControls(f"LINK {t.pump_id} 1 AT TIME {int(t.restore_hour * 3600)}")
+            ts = d.getComputedHydraulicTimeSeries()
+        finally:
+            d.unload()
+
+        np.testing.assert_array_equal(result.time_s, ts.Time)
+        for lid in ("PUMP_4", "RIKO_44", "P_DS_1"):
+            np.testing.assert_array_equal(result.flows[lid], ts.Flow[:, link_idx[lid]])
+            np.testing.assert_array_equal(result.statuses[lid], ts.Status[:, link_idx[lid]])
+        np.testing.assert_array_equal(
+            result.heads["J_MANIFOLD"], ts.Head[:, node_idx["J_MANIFOLD"]]
+        )
+
+    def test_report_only_sampling(self):
+        full = run_eps_with_trips(use_cache=False)
+        sampled = run_eps_with_trips(use_cache=False, report_only=True)
+        self.assertEqual(sampled.time_s.tolist(), list(range(0, 86400 + 1, 1800)))
+        self.assertGreater(full.n_steps, sampled.n_steps)
+        at = {t: i for i, t in enumerate(full.time_s.tolist())}
+        for j, t in enumerate(sampled.time_s):
+            self.assertEqual(sampled.flows["P_DS"][j], full.flows["P_DS"][at[t]])
+
+
+class TestColumnarEPS(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.eps = run_eps_with_trips(INP_FILE_REV3, use_cache=False)
+
+    def test_layout(self):
+        eps = self.eps
+        n = eps.n_steps
+        self.assertEqual(eps.link_flow.shape, (n, len(set(eps.link_cols.values()))))
+        self.assertEqual(eps.node_head.shape, (n, len(eps.node_cols)))
+        self.assertEqual(eps.link_flow.dtype, np.float64)
+        self.assertEqual(eps.link_status.dtype, np.int8)
+        self.assertTrue(eps.link_flow.flags.c_contiguous)
+
+    def test_alias_shares_column(self):
+        """Rev3 P_DS is an alias of P_DS_1, not a copy."""
+        self.assertEqual(self.eps.link_cols["P_DS"], self.eps.link_cols["P_DS_1"])
+        self.assertTrue(np.shares_memory(self.eps.flows["P_DS"], self.eps.link_flow))
+
+    def test_float32_opt_in(self):
+        eps32 = run_eps_with_trips(INP_FILE_REV3, use_cache=False, dtype="float32")
+        self.assertEqual(eps32.link_flow.dtype, np.float32)
+        self.assertEqual(eps32.link_status.dtype, np.int8)
+        np.testing.assert_allclose(eps32.flows["P_DS"], self.eps.flows["P_DS"], rtol=1e-6)
+        with self.assertRaises(ValueError):
+            run_eps_with_trips(use_cache=False, dtype="int32")
+
+    def test_event_rows_are_python_scalars(self):
+        rows = list(iter_eps_events(self.eps))
+        self.assertGreater(len(rows), 2)
+        self.assertIs(type(rows[0].q_ds_lps), float)
+        self.assertEqual(rows[0].time_s, 0.0)
+
+
+class TestStreamingEPS(unittest.TestCase):
+    def test_stream_events_match_full_result(self):
+        full = list(iter_eps_events(run_eps_with_trips(INP_FILE_REV3, use_cache=False)))
+        streamed = list(iter_eps_events(stream_eps(INP_FILE_REV3)))
+        self.assertEqual(full, streamed)
+
+    def test_consumers_single_pass(self):
+        events, stats, energy = EventDetector(), EPSStatistics(), EPSEnergyAccumulator()
+        n = feed_eps(stream_eps(INP_FILE_REV3), events, stats, energy)
+        events.finish()
+        eps = run_eps_with_trips(INP_FILE_REV3, use_cache=False)
+
+        self.assertEqual(n, eps.n_steps)
+        self.assertEqual(len(events.events), len(list(iter_eps_events(eps))))
+        self.assertAlmostEqual(stats.duration_h, 24.0, places=6)
+        self.assertAlmostEqual(stats.q_ds_lps.mean, float(eps.flows["P_DS"].mean()), places=6)
+        self.assertAlmostEqual(stats.q_ds_lps.max, float(eps.flows["P_DS"].max()), places=6)
+        # Standby covers the three 2 h trips; PUMP_1 never trips
+        self.assertAlmostEqual(stats.pump_hours["PUMP_5"], 6.0, places=6)
+        self.assertAlmostEqual(stats.pump_hours["PUMP_1"], 24.0, places=6)
+        result = energy.result()
+        self.assertAlmostEqual(result.hours, 24.0, places=6)
+        self.assertAlmostEqual(result.energy_kwh, sum(result.pump_energy_kwh.values()))
+        self.assertGreater(result.pump_energy_kwh["PUMP_5"], 0.0)
+
+    def test_session_reuse_matches_fresh_load(self):
+        """Trip controls must not leak between runs on one loaded project."""
+        def flows(steps):
+            return [step.flow("P_DS") for step in steps]
+
+        fresh = flows(stream_eps(INP_FILE_REV3))
+        with EPSSession(INP_FILE_REV3) as session:
+            n_controls = session.model.d.getControlCount()
+            first = flows(session.stream(DEFAULT_PUMP_TRIPS))
+            baseline = flows(session.stream([]))
+            again = flows(session.stream(DEFAULT_PUMP_TRIPS))
+            self.assertEqual(session.model.d.getControlCount(), n_controls)
+        self.assertEqual(first, fresh)
+        self.assertEqual(again, fresh)
+        self.assertNotEqual(baseline, fresh)
+
+    def test_duration_override(self):
+        stats = EPSStatistics()
+        feed_eps(stream_eps(INP_FILE_REV3, trips=[], report_only=True, duration_h=48), stats)
+        self.assertEqual(stats.n_steps, 48 * 2 + 1)
+        self.assertAlmostEqual(stats.duration_h, 48.0)
+
+
+class TestEPSEnergyIntegration(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.efficiency = load_pump_efficiency(INP_FILE_REV3)
+        cls.eps = run_eps_with_trips(INP_FILE_REV3, use_cache=False)
+
+    def test_curve_from_inp(self):
+        curve = self.efficiency["PUMP_1"]
+        self.assertEqual(len(curve.q_lps), 13)
+        self.assertAlmostEqual(float(curve.eta_at(1237.0)), 89.0)
+        self.assertAlmostEqual(float(curve.eta_at(1246.5)), 88.5)
+        self.assertAlmostEqual(float(curve.eta_at(2000.0)), 58.0)     # clamped
+
+    def test_vectorized_matches_streaming(self):
+        acc = EPSEnergyAccumulator(efficiency=self.efficiency)
+        feed_eps(stream_eps(INP_FILE_REV3), acc)
+        streamed = acc.result()
+        result = integrate_eps_energy(self.eps, efficiency=self.efficiency)
+        self.assertAlmostEqual(result.energy_kwh, streamed.energy_kwh, places=6)
+        self.assertAlmostEqual(result.peak_shaft_kw, streamed.peak_shaft_kw, places=6)
+        for pid, hours in streamed.pump_run_hours.items():
+            self.assertAlmostEqual(result.pump_run_hours[pid], hours, places=6)
+        self.assertAlmostEqual(result.pump_run_hours["PUMP_5"], 6.0, places=6)
+        self.assertNotAlmostEqual(result.energy_kwh, integrate_eps_energy(self.eps).energy_kwh)
+
+    def test_power_matches_epanet_energy(self):
+        d = epanet(str(INP_FILE_REV3))
+        try:
+            d.openHydraulicAnalysis()
+            d.initializeHydraulicAnalysis()
+            d.runHydraulicAnalysis()
+            epanet_kw = {
+                d.getLinkNameID(int(i)): float(d.getLinkEnergy(int(i)))
+                for i in d.getLinkPumpIndex()
+            }
+            d.closeHydraulicAnalysis()
+        finally:
+            d.unload()
+        power = eps_pump_power_kw(self.eps, efficiency=self.efficiency)[0]
+        for pid, kw in zip(PUMP_IDS, power):
+            self.assertAlmostEqual(kw, epanet_kw[pid], delta=max(1.0, 2e-3 * kw))
+
+
+class TestLongHorizonEPS(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_memmap_matches_in_memory(self):
+        full = run_eps_with_trips(INP_FILE_REV3, use_cache=False)
+        stored = run_eps_with_trips(INP_FILE_REV3, out_dir=self.tmp, chunk_steps=50)
+        self.assertIsInstance(stored.link_flow, np.memmap)
+        self.assertEqual(full, stored)
+
+        with mock.patch("rosarito.scenarios.stream_eps") as stream:
+            reopened = run_eps_with_trips(INP_FILE_REV3, out_dir=self.tmp)
+            stream.assert_not_called()
+        self.assertEqual(full, reopened)
+
+    def test_multi_day_duration(self):
+        eps = run_eps_with_trips(
+            INP_FILE_REV3, trips=[], report_only=True, duration_h=7 * 24,
+            out_dir=self.tmp, dtype="float32",
+        )
+        self.assertEqual(eps.n_steps, 7 * 48 + 1)
+        self.assertEqual(float(eps.time_s[-1]), 7 * 86400.0)
+        self.assertEqual(eps.window(24, 48).n_steps, 49)
+
+
+class TestResultCaching(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = ResultCache(self.tmp)
+        patcher = mock.patch("rosarito.scenarios.default_cache", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_staging_cache_hit_equals_solve(self):
+        solved = run_staging_scenarios()
+        self.assertEqual(len(list(ResultCache(self.tmp).directory.glob("*/*.pkl"))), 4)
+        with mock.patch("rosarito.scenarios._solve_openings") as solve:
+            cached = run_staging_scenarios()
+            solve.assert_not_called()
+        self.assertEqual(solved, cached)
+
+    def test_eps_cache_hit_equals_solve(self):
+        solved = run_eps_with_trips()
+        with mock.patch("rosarito.scenarios._run_eps") as run:
+            cached = run_eps_with_trips()
+            run.assert_not_called()
+        self.assertEqual(solved, cached)
+
+
+if __name__ == "__main__":
+    unittest.main()
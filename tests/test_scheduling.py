@@ -0,0 +1,97 @@
+"""Tests for the demand-following staging scheduler."""
+
+from __future__ import annotations
+
+import itertools
+import unittest
+
+import numpy as np
+
+from rosarito.constants import PUMP_IDS, RIKO_OPENINGS_ALL
+from rosarito.scheduling import (
+    StagingOption,
+    _switch_cost,
+    build_option_table,
+    replay_schedule,
+    schedule_staging,
+)
+
+# Synthetic table: (phi, Q_total l/s, shaft kW) on the real openings
+SYNTHETIC = {40: (4500.0, 1500.0), 38: (3700.0, 1130.0), 34: (3200.0, 1110.0),
+             30: (2200.0, 750.0), 26: (1800.0, 720.0)}
+
+
+def _synthetic_options() -> list[StagingOption]:
+    return [
+        StagingOption(o, SYNTHETIC[o.phi_pct][0], 28.0, SYNTHETIC[o.phi_pct][1])
+        for o in RIKO_OPENINGS_ALL if o.phi_pct in SYNTHETIC
+    ]
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.options = _synthetic_options()
+
+    def test_matches_brute_force(self):
+        targets = [3000, 4000, 2000, 3600]
+        schedule = schedule_staging(targets, self.options)
+        best = np.inf
+        for path in itertools.product(self.options, repeat=len(targets)):
+            if any(o.q_total_lps < t for o, t in zip(path, targets)):
+                continue
+            cost = sum(o.power_kw for o in path) + sum(
+                _switch_cost(a, b, 50.0, 5.0) for a, b in zip(path, path[1:])
+            )
+            best = min(best, cost)
+        self.assertAlmostEqual(schedule.objective_kwh, best)
+
+    def test_penalty_avoids_short_dip(self):
+        # Dropping a pump for one hour saves 360 kWh; worth it only if
+        # the stop + restart costs less
+        dip = [3500, 2000, 3500]
+        costly = schedule_staging(dip, self.options, pump_penalty_kwh=200.0)
+        self.assertEqual([iv.option.n_pumps for iv in costly.intervals], [3, 3, 3])
+        cheap = schedule_staging(dip, self.options)
+        self.assertEqual([iv.option.n_pumps for iv in cheap.intervals], [3, 2, 3])
+        self.assertEqual(cheap.pump_switches, 2)
+
+    def test_shortfall_uses_largest_flow(self):
+        schedule = schedule_staging([5000], self.options)
+        self.assertEqual(schedule.intervals[0].option.opening.phi_pct, 40)
+        self.assertAlmostEqual(schedule.intervals[0].shortfall_lps, 500.0)
+
+    def test_controls_emit_changes_only(self):
+        schedule = schedule_staging([3000, 3000, 4400], self.options)
+        first = [c for c in schedule.controls() if c.hour == 0.0]
+        later = [c for c in schedule.controls() if c.hour > 0.0]
+        self.assertEqual(len(first), 5 + len(RIKO_OPENINGS_ALL))
+        self.assertEqual(
+            sorted((c.link_id, c.status) for c in later),
+            [("PUMP_4", 1), ("RIKO_34", 0), ("RIKO_40", 1)],
+        )
+
+    def test_empty_profile_rejected(self):
+        with self.assertRaises(ValueError):
+            schedule_staging([], self.options)
+
+
+class TestScheduleReplay(unittest.TestCase):
+    def test_option_table_feasibility(self):
+        table = {o.opening.phi_pct: o for o in build_option_table()}
+        self.assertEqual(len(table), len(RIKO_OPENINGS_ALL))
+        # 44% exceeds the VAG Qmax, 22% is below Q_MIN_STABLE per pump
+        self.assertFalse(table[44].feasible)
+        self.assertTrue(table[40].feasible)
+
+    def test_eps_replay_reproduces_schedule(self):
+        schedule = schedule_staging([3000, 3000, 4500, 2000])
+        eps = replay_schedule(schedule)
+        pumps = [eps.link_cols[pid] for pid in PUMP_IDS]
+        for iv in schedule.intervals:
+            i = int(np.searchsorted(eps.time_s, (iv.start_h + 0.5) * 3600.0))
+            q = eps.link_flow[i, pumps].sum()
+            self.assertAlmostEqual(q, iv.option.q_total_lps, delta=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
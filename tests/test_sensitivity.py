@@ -0,0 +1,79 @@
+"""Tests for the one-at-a-time sensitivity sweep."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from rosarito.constants import H_PLANT, RIKO_OPENINGS_ALL
+from rosarito.scenarios import BoundaryCase, run_boundary_cases
+from rosarito.sensitivity import (
+    DEFAULT_PARAMETERS,
+    SensitivityParameter,
+    run_sensitivity,
+)
+
+OPENINGS = RIKO_OPENINGS_ALL[:3]
+
+
+class TestSensitivity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.epanet = run_sensitivity(openings=OPENINGS)
+        cls.surrogate = run_sensitivity(openings=OPENINGS, engine="surrogate")
+
+    def test_case_count(self):
+        n_per_opening = sum(p.n_points for p in DEFAULT_PARAMETERS)
+        self.assertEqual(len(self.epanet.points), n_per_opening * len(OPENINGS))
+        self.assertEqual(len(self.epanet.baseline), len(OPENINGS))
+
+    def test_engines_agree(self):
+        q_epanet = np.array([p.q_total_lps for p in self.epanet.points])
+        q_surrogate = np.array([p.q_total_lps for p in self.surrogate.points])
+        np.testing.assert_allclose(q_surrogate, q_epanet, rtol=5e-4)
+
+    def test_spider_passes_through_baseline(self):
+        for (phi, name), (values, change) in self.epanet.spider("q_total_lps").items():
+            par = next(p for p in DEFAULT_PARAMETERS if p.name == name)
+            at_base = np.isclose(values, par.base)
+            # Symmetric default ranges put the design value on the grid
+            if name != "roughness_scale":
+                self.assertTrue(at_base.any(), (phi, name))
+            np.testing.assert_allclose(change[at_base], 0.0, atol=1e-9)
+
+    def test_tornado_directions(self):
+        bars = {
+            (b.opening.phi_pct, b.parameter): b for b in self.epanet.tornado("q_total_lps")
+        }
+        # Higher forebay head or lower sea level → less flow; larger Kv → more
+        self.assertGreater(bars[(44, "h_plant_m")].metric_low, bars[(44, "h_plant_m")].metric_high)
+        self.assertLess(bars[(44, "h_sea_m")].metric_low, bars[(44, "h_sea_m")].metric_high)
+        self.assertLess(
+            bars[(44, "kv_tolerance_pct")].metric_low, bars[(44, "kv_tolerance_pct")].metric_high,
+        )
+        swings = [b.swing for b in self.epanet.tornado("power_kw")[:len(DEFAULT_PARAMETERS)]]
+        self.assertEqual(swings, sorted(swings, reverse=True))
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            SensitivityParameter("pump_speed", 1.0, 0.9, 1.1)
+        with self.assertRaises(ValueError):
+            self.epanet.tornado("velocity")
+        with self.assertRaises(ValueError):
+            run_sensitivity(engine="scipy")
+
+
+class TestParallelBoundaryCases(unittest.TestCase):
+    def test_workers_match_serial(self):
+        cases = [
+            BoundaryCase(n_pumps=o.n_pumps, kv_m3h=o.kv_m3h, h_plant_m=H_PLANT + dh)
+            for o in RIKO_OPENINGS_ALL for dh in (-0.5, 0.5)
+        ]
+        serial = run_boundary_cases(cases)
+        parallel = run_boundary_cases(cases, workers=2)
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
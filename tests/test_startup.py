@@ -0,0 +1,68 @@
+"""Tests for lazy CLI imports and the startup profile."""
+
+from __future__ import annotations
+
+import ast
+import inspect
+import unittest
+from pathlib import Path
+
+import main
+from rosarito.startup import parse_importtime, profile_startup
+
+ROOT = Path(main.__file__).resolve().parent
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2044 |     123335 | numpy
+import time:       300 |        900 |     numpy.linalg
+some other stderr line
+"""
+
+
+def _handler_imports(func) -> set[str]:
+    tree = ast.parse(inspect.getsource(func))
+    return {
+        node.module for node in ast.walk(tree)
+        if isinstance(node, ast.ImportFrom) and node.module.startswith("rosarito")
+    }
+
+
+class TestParseImporttime(unittest.TestCase):
+    def test_parse(self):
+        records = parse_importtime(SAMPLE)
+        self.assertEqual([r.module for r in records], ["_io", "numpy", "numpy.linalg"])
+        self.assertEqual([r.depth for r in records], [1, 0, 2])
+        self.assertEqual(records[1].cumulative_us, 123335)
+        self.assertEqual(records[2].package, "numpy")
+
+
+class TestCommandImports(unittest.TestCase):
+    def test_declared_modules_cover_handlers(self):
+        handlers = {"sensitivity": main.run_sensitivity_study}
+        for name, modules in main.COMMAND_IMPORTS.items():
+            if name == "all":
+                funcs = [main.run_staging, main.run_energy, main.run_eps]
+            else:
+                funcs = [handlers.get(name) or getattr(main, "run_" + name.replace("-", "_"))]
+            used = set().union(*(_handler_imports(f) for f in funcs))
+            self.assertLessEqual(used, set(modules), name)
+
+    def test_startup_within_budget_without_epyt(self):
+        for name in ("optimize", "eps", "report"):
+            profile = profile_startup(
+                f"import main; main.import_command({name!r})", label=name, cwd=ROOT,
+            )
+            self.assertFalse(profile.loaded("epyt"), name)
+            self.assertFalse(profile.loaded("matplotlib"), name)
+            self.assertLess(profile.wall_s, main.STARTUP_BUDGETS[name], name)
+
+    def test_main_alone_is_light(self):
+        profile = profile_startup("import main", cwd=ROOT)
+        self.assertFalse(profile.loaded("numpy"))
+        self.assertGreater(profile.import_s, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
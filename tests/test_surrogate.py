@@ -0,0 +1,137 @@
+"""Tests for the vectorized NumPy surrogate solver."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from rosarito.constants import (
+    H_RATED_M,
+    H_RUNOUT_M,
+    H_SHUTOFF_M,
+    Q_RATED_LPS,
+    Q_RUNOUT_LPS,
+    REFERENCE_POINTS_ALL,
+    RIKO_OPENINGS_ALL,
+    RikoOpening,
+)
+from rosarito.model import SteadyStateResult
+from rosarito.reference import compute_reference_points, format_reference_points
+from rosarito.scenarios import BoundaryCase, run_boundary_cases, run_opening_sweep
+from rosarito.surrogate import (
+    SeriesNetwork,
+    cross_check,
+    friction_factor,
+    pipe_headloss,
+    solve_operating_points,
+)
+from rosarito.validation import validate_against_computed, validate_steady_state
+from rosarito.valve import kv_at
+
+N_PUMPS = np.array([o.n_pumps for o in RIKO_OPENINGS_ALL])
+KV = np.array([o.kv_m3h for o in RIKO_OPENINGS_ALL])
+KV_AT_36 = kv_at(36)
+
+
+class TestSurrogatePhysics(unittest.TestCase):
+    def test_pump_curve_through_datasheet_points(self):
+        pump = SeriesNetwork.default().pump
+        np.testing.assert_allclose(
+            pump.head([0.0, Q_RATED_LPS, Q_RUNOUT_LPS]),
+            [H_SHUTOFF_M, H_RATED_M, H_RUNOUT_M],
+        )
+        self.assertAlmostEqual(float(pump.flow_at(H_RATED_M)), Q_RATED_LPS)
+
+    def test_colebrook_residual(self):
+        re, rr = np.array([5e5, 3e6]), np.array([1e-5, 4e-5])
+        f = friction_factor(re, rr)
+        lhs = 1.0 / np.sqrt(f)
+        rhs = -2.0 * np.log10(rr / 3.7 + 2.51 / (re * np.sqrt(f)))
+        np.testing.assert_allclose(lhs, rhs, rtol=1e-10)
+        # Swamee-Jain stays within ~1% of Colebrook in this range
+        np.testing.assert_allclose(friction_factor(re, rr, "swamee-jain"), f, rtol=0.015)
+        with self.assertRaises(ValueError):
+            friction_factor(re, rr, "hazen")
+
+    def test_energy_balance(self):
+        net = SeriesNetwork.default()
+        r = solve_operating_points(N_PUMPS, KV, h_plant_m=17.0, roughness_scale=2.0)
+        self.assertTrue(r.converged.all())
+        hf = sum(pipe_headloss(r.q_total_lps, p, net.viscosity_m2s, 2.0) for p in net.pipes)
+        np.testing.assert_allclose(
+            r.h_sea_m + r.h_pump_m - hf - r.dh_riko_m, r.h_plant_m, atol=1e-6,
+        )
+
+    def test_broadcasting_and_no_flow(self):
+        r = solve_operating_points(
+            np.arange(1, 6)[:, None], KV[None, :], h_plant_m=[[18.17]], roughness_scale=1.0,
+        )
+        self.assertEqual(r.shape, (5, len(KV)))
+        # Flow rises with pump count at every opening
+        self.assertTrue(np.all(np.diff(r.q_total_lps, axis=0) > 0))
+
+        blocked = solve_operating_points(4, KV[0], h_plant_m=H_SHUTOFF_M + 1.0)
+        self.assertEqual(float(blocked.q_total_lps), 0.0)
+        self.assertTrue(bool(blocked.converged))
+
+
+class TestCrossCheck(unittest.TestCase):
+    def test_matches_epanet(self):
+        report = cross_check(
+            N_PUMPS[None, :], KV[None, :],
+            h_plant_m=np.array([16.0, 20.0])[:, None],
+            roughness_scale=np.array([0.5, 3.0])[:, None, None],
+        )
+        self.assertEqual(report.n_cases, 4 * len(KV))
+        self.assertLess(report.max_dq_pct, 0.05)
+        self.assertLess(report.max_dh_pump_m, 0.01)
+
+    def test_boundary_cases_match_sweep_at_design_heads(self):
+        sweep = run_opening_sweep(phi_grid=[44.0], pump_counts=[4])[0]
+        [r] = run_boundary_cases([BoundaryCase(n_pumps=4, kv_m3h=sweep.kv_m3h)])
+        self.assertAlmostEqual(r.q_total_lps, sweep.q_total_lps, places=6)
+
+
+class TestReferencePoints(unittest.TestCase):
+    def test_reproduces_hand_calculation(self):
+        computed = compute_reference_points()
+        for lit, ref in zip(REFERENCE_POINTS_ALL, computed):
+            self.assertEqual((lit.phi_pct, lit.n_pumps), (ref.phi_pct, ref.n_pumps))
+            self.assertAlmostEqual(ref.q_total_lps, lit.q_total_lps, delta=2.0)
+            self.assertAlmostEqual(ref.h_pump_m, lit.h_pump_m, delta=0.03)
+            self.assertAlmostEqual(ref.dh_riko_m, lit.dh_riko_m, delta=0.02)
+        self.assertIn("phi_pct=34, n_pumps=3", format_reference_points(computed))
+
+    def test_arbitrary_openings(self):
+        openings = [
+            RikoOpening(phi_pct=phi, kv_m3h=kv, n_pumps=n, gpv_link_id="", curve_id="")
+            for phi, kv, n in [(36, 12000.0, 3), (50, 30000.0, 5)]
+        ]
+        refs = compute_reference_points(openings)
+        self.assertEqual([r.phi_pct for r in refs], [36, 50])
+        self.assertGreater(refs[1].q_total_lps, refs[0].q_total_lps)
+
+    def _result(self, n: int, phi: int, ref) -> SteadyStateResult:
+        return SteadyStateResult(
+            n_active_pumps=n, riko_opening_pct=phi,
+            q_total_lps=ref.q_total_lps, q_per_pump_lps=ref.q_per_pump_lps,
+            h_pump_m=ref.h_pump_m, dh_riko_m=ref.dh_riko_m,
+            h_suction=0.0, h_manifold=0.0, h_riko_in=0.0, h_riko_out=0.0,
+        )
+
+    def test_validation_of_off_literal_opening(self):
+        [ref] = compute_reference_points([RikoOpening(
+            phi_pct=36, kv_m3h=float(KV_AT_36), n_pumps=3, gpv_link_id="", curve_id="",
+        )])
+        result = self._result(3, 36, ref)
+        val = validate_steady_state(result)
+        self.assertTrue(val.checks and val.all_passed)
+        [batched] = validate_against_computed([result])
+        self.assertEqual(
+            [c.reference for c in batched.checks], [c.reference for c in val.checks],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
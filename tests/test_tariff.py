@@ -0,0 +1,160 @@
+"""Tests for the time-of-use tariff cost engine."""
+
+from __future__ import annotations
+
+import time
+import unittest
+
+import numpy as np
+
+from rosarito.constants import G, PUMP_IDS, RHO_SEAWATER
+from rosarito.energy import EPSEnergyAccumulator
+from rosarito.eps_utils import feed_eps
+from rosarito.model import EPSResult
+from rosarito.scenarios import run_eps_with_trips, stream_eps
+from rosarito.tariff import (
+    PeakWindow,
+    Season,
+    Tariff,
+    compute_eps_cost,
+    rank_by_cost,
+    tariff_from_inp,
+)
+
+H_PUMP_M = 30.0
+Q_PUMP_LPS = 1000.0
+# Shaft kW of one pump at 100% efficiency
+KW_PER_PUMP = RHO_SEAWATER * G * (Q_PUMP_LPS / 1000.0) * H_PUMP_M / 1000.0
+
+
+def _eps(time_s, n_running) -> EPSResult:
+    """Synthetic run: *n_running[i]* duty pumps at Q_PUMP_LPS, H_PUMP_M."""
+    time_s = np.asarray(time_s, dtype=np.float64)
+    n_running = np.broadcast_to(n_running, time_s.shape)
+    running = np.arange(len(PUMP_IDS))[None, :] < n_running[:, None]
+    return EPSResult(
+        time_s=time_s,
+        link_flow=np.where(running, Q_PUMP_LPS, 0.0),
+        link_velocity=np.zeros(running.shape),
+        link_status=running.astype(np.int8),
+        node_head=np.tile([0.0, H_PUMP_M], (len(time_s), 1)),
+        link_cols={pid: i for i, pid in enumerate(PUMP_IDS)},
+        node_cols={"J_SUCTION": 0, "J_MANIFOLD": 1},
+    )
+
+
+class TestTariffCost(unittest.TestCase):
+    def test_flat_price(self):
+        eps = _eps(np.arange(0, 24 * 3600 + 1, 300), 2)
+        c = compute_eps_cost(eps, Tariff(price_per_kwh=0.1), eta_pct=100.0)
+        self.assertAlmostEqual(c.energy_kwh, 2 * KW_PER_PUMP * 24.0)
+        self.assertAlmostEqual(c.total_cost, 0.1 * c.energy_kwh)
+        self.assertAlmostEqual(c.pump_cost["PUMP_1"], c.pump_cost["PUMP_2"])
+        self.assertEqual(c.pump_cost["PUMP_3"], 0.0)
+
+    def test_price_changes_inside_a_step(self):
+        # 7-minute steps straddle every hourly price change
+        hourly = tuple(0.05 if h < 12 else 0.15 for h in range(24))
+        tariff = Tariff(seasons=(Season("all", tuple(range(1, 13)), hourly),))
+        eps = _eps(np.arange(0, 24 * 3600 + 1, 420), 1)
+        c = compute_eps_cost(eps, tariff, eta_pct=100.0)
+        hours = eps.time_s[-1] / 3600.0
+        expected = KW_PER_PUMP * (12.0 * 0.05 + (hours - 12.0) * 0.15)
+        self.assertAlmostEqual(c.energy_cost, expected, places=6)
+
+    def test_price_pattern_and_adder(self):
+        tariff = Tariff(
+            price_per_kwh=0.1, price_pattern=(1.0, 2.0), pattern_step_s=1800,
+            peak_windows=(PeakWindow("evening", 23.5, 0.5, price_adder_per_kwh=1.0),),
+        )
+        np.testing.assert_allclose(
+            tariff.price_at([0, 1800, 3600, 23.75 * 3600, 24.25 * 3600]),
+            [1.1, 0.2, 0.1, 1.2, 1.1],
+        )
+        self.assertEqual(tariff.grid_step_s, 1800)
+
+    def test_monthly_demand_charges(self):
+        # Jan 2026 at 2 pumps, Feb at 1 pump except one weekend evening at 3
+        t = np.arange(0, 59 * 86400 + 1, 3600)
+        n = np.where(t < 31 * 86400, 2, 1)
+        saturday_19h = (31 + 6) * 86400 + 19 * 3600     # 2026-02-07
+        n = np.where(t == saturday_19h, 3, n)
+        tariff = Tariff(
+            demand_charge_per_kw=1.0,
+            peak_windows=(PeakWindow("peak", 18.0, 22.0, 10.0, weekdays_only=True),),
+        )
+        c = compute_eps_cost(_eps(t, n), tariff, eta_pct=100.0)
+        peaks = {(d.month, d.window): d.peak_kw for d in c.demand_charges}
+        self.assertAlmostEqual(peaks[("2026-01", "all")], 2 * KW_PER_PUMP)
+        self.assertAlmostEqual(peaks[("2026-02", "all")], 3 * KW_PER_PUMP)
+        self.assertAlmostEqual(peaks[("2026-02", "peak")], 1 * KW_PER_PUMP)
+        self.assertAlmostEqual(sum(c.pump_cost.values()), c.total_cost)
+
+    def test_short_spike_does_not_set_demand(self):
+        # 4 pumps for a day with one 30 s step at 5 pumps: the billed peak is
+        # the 15-min mean, not the spike
+        t = np.concatenate((np.arange(0, 43200, 300), [43200, 43230], np.arange(43500, 86401, 300)))
+        n = np.where(t == 43200, 5, 4)
+        tariff = Tariff(demand_charge_per_kw=1.0)
+        c = compute_eps_cost(_eps(t, n), tariff, eta_pct=100.0)
+        self.assertEqual(len(c.demand_charges), 1)
+        expected = (4 + 30 / 900) * KW_PER_PUMP
+        self.assertAlmostEqual(c.demand_charges[0].peak_kw, expected, places=6)
+        self.assertAlmostEqual(c.demand_cost, expected, places=6)
+        self.assertAlmostEqual(sum(c.pump_cost.values()), c.total_cost)
+        instant = Tariff(demand_charge_per_kw=1.0, demand_interval_s=30)
+        peak = compute_eps_cost(_eps(t, n), instant, eta_pct=100.0).demand_charges[0].peak_kw
+        self.assertAlmostEqual(peak, 5 * KW_PER_PUMP)
+        with self.assertRaises(ValueError):
+            Tariff(demand_interval_s=0)
+
+    def test_off_hour_start_bills_clock_hours(self):
+        # Run 00:30-02:00: the 01:00-02:00 window is run time 1800-5400
+        tariff = Tariff(
+            start="2025-01-06T00:30:00",
+            peak_windows=(PeakWindow("p", 1.0, 2.0, price_adder_per_kwh=1.0),),
+        )
+        c = compute_eps_cost(_eps(np.arange(0, 5401, 1800), 1), tariff, eta_pct=100.0)
+        self.assertAlmostEqual(c.energy_cost, KW_PER_PUMP * (1.5 * 0.08 + 1.0), places=6)
+        # 4 pumps from 00:05 to 00:15, then 1: the meter's 00:00-00:15 interval
+        # (clipped to the run) sees 4 pumps; run-time intervals would blend in 1
+        t = np.array([0.0, 600.0, 3600.0])
+        tariff = Tariff(start="2026-01-01T00:05:00", demand_charge_per_kw=1.0)
+        c = compute_eps_cost(_eps(t, np.array([4, 1, 1])), tariff, eta_pct=100.0)
+        self.assertAlmostEqual(c.demand_charges[0].peak_kw, 4 * KW_PER_PUMP)
+
+    def test_year_of_five_minute_steps_is_fast(self):
+        t = np.arange(0, 365 * 86400 + 1, 300)
+        eps = _eps(t, np.where((t // 3600) % 24 < 6, 2, 4))
+        hourly = tuple(0.06 if h < 6 else 0.1 for h in range(24))
+        tariff = Tariff(
+            seasons=(Season("all", tuple(range(1, 13)), hourly),),
+            demand_charge_per_kw=4.0,
+            peak_windows=(PeakWindow("peak", 18.0, 22.0, 12.0, weekdays_only=True),),
+        )
+        start = time.perf_counter()
+        c = compute_eps_cost(eps, tariff)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(len(c.demand_charges), 24)
+
+    def test_invalid_season(self):
+        with self.assertRaises(ValueError):
+            Season("short", (1,), (0.1,) * 12)
+
+
+class TestTariffOnEPS(unittest.TestCase):
+    def test_matches_streaming_energy_and_inp_price(self):
+        tariff = tariff_from_inp()
+        self.assertAlmostEqual(tariff.price_per_kwh, 0.08)
+        eps = run_eps_with_trips(duration_h=6.0)
+        acc = EPSEnergyAccumulator()
+        feed_eps(stream_eps(duration_h=6.0), acc)
+        c = compute_eps_cost(eps, tariff)
+        self.assertAlmostEqual(c.energy_kwh, acc.result().energy_kwh, places=3)
+        self.assertAlmostEqual(c.total_cost, 0.08 * c.energy_kwh, places=3)
+        ranked = rank_by_cost({"full": eps, "half": eps.window(0.0, 3.0)}, tariff)
+        self.assertEqual([label for label, _ in ranked], ["half", "full"])
+
+
+if __name__ == "__main__":
+    unittest.main()
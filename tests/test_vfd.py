@@ -0,0 +1,107 @@
+"""Tests for the VFD extended period simulation."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from rosarito.constants import PUMP_IDS
+from rosarito.energy import integrate_eps_energy, load_pump_efficiency
+from rosarito.scenarios import run_eps_with_trips
+from rosarito.vfd import (
+    FlowSetpointController,
+    SpeedSchedule,
+    run_vfd_eps,
+    summarize_eps,
+)
+
+SETPOINT_LPS = 5000.0
+
+
+def _total_flow(eps) -> np.ndarray:
+    cols = [eps.link_cols[pid] for pid in PUMP_IDS]
+    q = eps.link_flow[:, cols]
+    return np.where(eps.link_status[:, cols] != 0, q, 0.0).sum(axis=1)
+
+
+class TestVFDEPS(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.efficiency = load_pump_efficiency()
+        cls.throttled = run_eps_with_trips(use_cache=False)
+        cls.vfd = run_vfd_eps(FlowSetpointController(SETPOINT_LPS))
+
+    def test_statuses_follow_throttled_run(self):
+        np.testing.assert_array_equal(self.vfd.eps.time_s, self.throttled.time_s)
+        cols = [self.vfd.eps.link_cols[pid] for pid in PUMP_IDS]
+        np.testing.assert_array_equal(
+            self.vfd.eps.link_status[:, cols] != 0,
+            self.throttled.link_status[:, cols] != 0,
+        )
+
+    def test_tracks_setpoint_away_from_switching(self):
+        q = _total_flow(self.vfd.eps)
+        running = (self.vfd.speed_ratio > 0).sum(axis=1)
+        # Steps at least half an hour after the last pump count change
+        t = np.asarray(self.vfd.eps.time_s)
+        changes = t[1:][np.diff(running) != 0]
+        settled = np.array([not np.any((ti - changes >= 0) & (ti - changes < 1800)) for ti in t])
+        settled[0] = False
+        self.assertGreater(settled.sum(), len(t) // 2)
+        np.testing.assert_allclose(q[settled], SETPOINT_LPS, rtol=0.01)
+
+    def test_speeds_reduced_and_bounded(self):
+        on = self.vfd.speed_ratio[self.vfd.speed_ratio > 0]
+        self.assertTrue(np.all(on <= 1.0 + 1e-9))
+        self.assertLess(float(np.median(on)), 0.95)
+
+    def test_saves_energy(self):
+        throttled = integrate_eps_energy(self.throttled, efficiency=self.efficiency)
+        vfd = self.vfd.energy(efficiency=self.efficiency)
+        self.assertLess(vfd.energy_kwh, 0.9 * throttled.energy_kwh)
+        a = summarize_eps("throttled", self.throttled, throttled)
+        b = summarize_eps("vfd", self.vfd.eps, vfd, self.vfd.speed_ratio)
+        self.assertAlmostEqual(a.q_mean_lps, b.q_mean_lps, delta=0.02 * a.q_mean_lps)
+        self.assertLess(b.h_pump_mean_m, a.h_pump_mean_m)
+        self.assertLess(b.specific_energy_kwh_m3, a.specific_energy_kwh_m3)
+
+
+class TestSpeedSchedule(unittest.TestCase):
+    def test_schedule_applied(self):
+        schedule = SpeedSchedule(((0.0, 0.95), (2.0, 0.85)))
+        result = run_vfd_eps(schedule, trips=[], duration_h=4.0)
+        t_h = np.asarray(result.eps.time_s) / 3600.0
+        on = result.speed_ratio > 0
+        np.testing.assert_allclose(result.speed_ratio[(t_h < 2.0)[:, None] & on], 0.95)
+        np.testing.assert_allclose(result.speed_ratio[(t_h >= 2.0)[:, None] & on], 0.85)
+        self.assertIn(7200, list(result.eps.time_s))
+        q = _total_flow(result.eps)
+        self.assertLess(q[t_h >= 2.0].max(), q[t_h < 2.0].min())
+
+    def test_invalid_schedule(self):
+        with self.assertRaises(ValueError):
+            SpeedSchedule(())
+        with self.assertRaises(ValueError):
+            SpeedSchedule(((2.0, 0.9), (1.0, 0.9)))
+        with self.assertRaises(ValueError):
+            SpeedSchedule(((0.0, 0.0),))
+
+
+class TestMultiDay(unittest.TestCase):
+    def test_target_profile_over_two_days(self):
+        targets = ([4000.0] * 12 + [5000.0] * 12) * 2
+        result = run_vfd_eps(
+            FlowSetpointController(targets), trips=[], duration_h=48.0, dtype="float32",
+        )
+        self.assertEqual(result.eps.link_flow.dtype, np.float32)
+        self.assertEqual(int(result.eps.time_s[-1]), 48 * 3600)
+        t = np.asarray(result.eps.time_s)
+        q = _total_flow(result.eps)
+        for hour, target in ((11, 4000.0), (23, 5000.0), (35, 4000.0), (47, 5000.0)):
+            k = int(np.searchsorted(t, hour * 3600))
+            self.assertAlmostEqual(float(q[k]), target, delta=0.01 * target)
+
+
+if __name__ == "__main__":
+    unittest.main()